@@ -1,5 +1,6 @@
 __version__ = '0.1dev'
 
+from gwydion.funcs.custom import Custom
 from gwydion.funcs.exponential import Exponential
 from gwydion.funcs.linear import Linear
 from gwydion.funcs.logarithm import Logarithm
@@ -12,8 +13,14 @@ import gwydion.stats
 # from gwydion.stats.hypergeometric import Hypergeometric
 # from gwydion.stats.binomial import Binomial
 
+from .backend import config
+from .composite import Composite
 from .random_array import RandomArray
+from .plotting import plot_many
+from .spec import generate_many
+from .surface import Normal2D, Polynomial2D, Sine2D
 
-__all__ = ['Cubic', 'Exponential', 'Linear', 'Logarithm', 'Polynomial',
+__all__ = ['Composite', 'Cubic', 'Custom', 'Exponential', 'Linear', 'Logarithm', 'Polynomial',
            'Quadratic', 'RandomArray', 'Sine', 'Normal',
-           'Poisson', "Hypergeometric", "Binomial"]
+           'Poisson', "Hypergeometric", "Binomial", 'config', 'generate_many', 'plot_many',
+           'Normal2D', 'Polynomial2D', 'Sine2D']
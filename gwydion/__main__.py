@@ -0,0 +1,3 @@
+from gwydion.cli import main
+
+main()
@@ -0,0 +1,177 @@
+"""
+Asyncio interface.
+
+Generating the data of a large object takes long enough to stall an event loop, so services embedding Gwydion should
+await it instead:
+
+    >>>> x, y = await sine.adata()
+    >>>> async for x, y in sine.aiter_chunks(chunk_size=2**16):
+    ....     await response.write(y.tobytes())
+
+The NumPy work runs in a bounded Executor (a thread pool by default). Each executor admits at most limit unfinished
+jobs per event loop; further requests wait for a free slot, which gives back-pressure when many requests arrive at
+once. Cancelling an awaiting task cancels its job if it has not started, and an abandoned chunk iterator cancels its
+prefetched chunks. A job already running in a worker cannot be interrupted, but its result is still cached.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from gwydion.exceptions import GwydionError
+
+
+class Executor(object):
+    """
+    Bounded executor running Gwydion work on behalf of asyncio code.
+
+    Parameters
+    ----------
+    workers : Integer or None.
+        Number of worker threads (or processes). If None, defaults to the number of CPUs.
+    limit : Integer or None.
+        Maximum number of unfinished jobs per event loop. If None, defaults to 4*workers.
+    processes : Boolean.
+        If True, jobs run in a process pool and objects are pickled to the workers. This avoids the GIL for functions
+        which hold it, at the cost of copying the data back. Defaults to False.
+
+    Examples
+    --------
+
+    >>>> executor = Executor(workers=4, limit=16)
+    >>>> x, y = await sine.adata(executor=executor)
+    >>>> y = await executor.run(np.cumsum, y, wait=False)  # Raises GwydionError if 16 jobs are unfinished.
+    """
+
+    def __init__(self, workers=None, limit=None, processes=False):
+        self.workers = workers or os.cpu_count() or 1
+        self.limit = limit or 4 * self.workers
+        self.processes = processes
+
+        if self.workers < 1 or self.limit < 1:
+            raise GwydionError('workers and limit must be positive integers.')
+
+        if processes:
+            # Forking a process with running threads (e.g. another executor's) can deadlock, so workers are spawned.
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        else:
+            self._pool = ThreadPoolExecutor(self.workers)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.limit)
+
+        return self._semaphores[loop]
+
+    @property
+    def busy(self):
+        """True if the executor is at its limit of unfinished jobs in the running event loop."""
+        return self._semaphore().locked()
+
+    async def run(self, fn, *args, wait=True):
+        """
+        Run fn(*args) in a worker and return its result.
+
+        If the executor is at its limit, waits for a free slot, or raises GwydionError if wait is False.
+        """
+        semaphore = self._semaphore()
+        if not wait and semaphore.locked():
+            raise GwydionError('The executor is at its limit of {} unfinished jobs.'.format(self.limit))
+
+        async with semaphore:
+            return await asyncio.wrap_future(self._pool.submit(fn, *args))
+
+    def shutdown(self, wait=True):
+        """Shut down the workers, cancelling any jobs which have not started."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_executor():
+    """Return the default Executor, creating it on first use."""
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = Executor()
+
+    return _default
+
+
+# Jobs are module-level functions so that they can be pickled to a process pool.
+def _y(obj):
+    return obj.data[1]
+
+
+def _noise(obj, rng, n):
+    # The RNG is returned too, as a process pool advances a copy of it.
+    return obj._stream_noise(rng, n), rng
+
+
+def _window(obj, start, stop, r=None):
+    return obj._window(start, stop, r)
+
+
+async def adata(obj, executor=None):
+    """Awaitable equivalent of obj.data."""
+    from gwydion.base import _readonly
+
+    executor = executor or default_executor()
+
+    if obj._data is None:
+        y = await executor.run(_y, obj)
+
+        # With a process pool the worker evaluated a copy of obj, so its result is cached here.
+        if obj._data is None:
+            obj._data = (obj.x, _readonly(y))
+
+    return obj.data
+
+
+async def aiter_chunks(obj, chunk_size=None, executor=None, prefetch=1):
+    """
+    Asynchronously iterate over (x, y) windows of obj of chunk_size points.
+
+    Up to prefetch chunks are computed ahead of the consumer, so a slow consumer holds at most prefetch + 1 chunks in
+    memory. The chunks are identical to the corresponding slices of obj.data.
+    """
+    executor = executor or default_executor()
+
+    if prefetch < 0:
+        raise GwydionError('prefetch must be a non-negative integer.')
+
+    # Sequential noise which has not been drawn yet is drawn chunk by chunk, in order, from a copy of the RNG (as in
+    # Base.write); the windows are then computed concurrently.
+    rng = obj._stream_rng()
+
+    pending = deque()
+    try:
+        for start, stop in obj._chunks(chunk_size):
+            r = None
+            if rng is not None:
+                r, rng = await executor.run(_noise, obj, rng, stop - start)
+
+            pending.append(asyncio.ensure_future(executor.run(_window, obj, start, stop, r)))
+
+            if len(pending) > prefetch:
+                yield await pending.popleft()
+
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
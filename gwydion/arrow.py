@@ -0,0 +1,132 @@
+"""
+Arrow and Parquet export (requires pyarrow).
+
+The x and y arrays are wrapped as Arrow arrays without copying, and the schema metadata records how the data was
+made, so that a file can be audited and regenerated:
+
+    gwydion.version   Version of Gwydion which wrote the data.
+    gwydion.spec      JSON spec which rebuilds the object (see gwydion.spec.to_spec).
+    gwydion.params    JSON dict of the resolved function parameters.
+
+A list of objects (a batch of curves) is stored in long format with columns curve, x and y, and the metadata holds
+lists of the specs and parameters, in curve order.
+"""
+import json
+
+import numpy as np
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+import gwydion
+from gwydion.base import Base
+from gwydion.exceptions import GwydionError
+from gwydion.spec import parameters, to_spec
+
+
+def _require():
+    if pa is None:
+        raise GwydionError('Arrow and Parquet export require pyarrow.')
+
+
+def _array(arr, dtype):
+    # Wrap the buffer of a contiguous NumPy array (of any backend, via DLPack) as an Arrow array without copying,
+    # unless it must be cast to the dtype of the column.
+    arr = np.ascontiguousarray(arr if isinstance(arr, np.ndarray) else np.from_dlpack(arr)).astype(dtype, copy=False)
+
+    return pa.Array.from_buffers(pa.from_numpy_dtype(arr.dtype), len(arr), [None, pa.py_buffer(arr)])
+
+
+def _objects(objs):
+    if isinstance(objs, Base):
+        return None
+
+    objs = list(objs)
+    if not objs or not all(isinstance(obj, Base) for obj in objs):
+        raise GwydionError('Expected a Gwydion object or a non-empty sequence of Gwydion objects.')
+
+    return objs
+
+
+def schema(objs):
+    """Return the Arrow schema, with metadata, of a Gwydion object or a sequence of objects."""
+    _require()
+
+    many = _objects(objs)
+
+    # Columns have the common dtype of all of the objects, e.g. float x-data if any object is continuous. The dtypes
+    # are read from the first point of each object, so that nothing is evaluated (or drawn) in full.
+    heads = [[np.from_dlpack(arr) for arr in next(obj._stream([(0, 1)]))] for obj in many or [objs]]
+    xdtype = np.result_type(*(x.dtype for x, _ in heads))
+    ydtype = np.result_type(heads[0][1].dtype, *(obj.dtype for obj in many or [] if obj.dtype is not None))
+
+    fields = [pa.field('x', pa.from_numpy_dtype(xdtype)),
+              pa.field('y', pa.from_numpy_dtype(ydtype))]
+
+    if many:
+        fields.insert(0, pa.field('curve', pa.int64()))
+        metadata = {'gwydion.spec': [to_spec(obj) for obj in many],
+                    'gwydion.params': [parameters(obj) for obj in many]}
+    else:
+        metadata = {'gwydion.spec': to_spec(objs), 'gwydion.params': parameters(objs)}
+
+    metadata = {key: json.dumps(val) for key, val in metadata.items()}
+    metadata['gwydion.version'] = gwydion.__version__
+
+    return pa.schema(fields, metadata=metadata)
+
+
+def _batches(objs, s, row_group_size):
+    many = _objects(objs)
+    dtypes = s.field('x').type.to_pandas_dtype(), s.field('y').type.to_pandas_dtype()
+
+    for i, obj in enumerate(many or [objs]):
+        # Sequential noise is drawn row group by row group, as in Base.write.
+        for x, y in obj._stream(obj._chunks(row_group_size)):
+            columns = [_array(x, dtypes[0]), _array(y, dtypes[1])]
+            if many:
+                columns.insert(0, pa.array(np.full(x.shape[0], i, dtype=np.int64)))
+
+            yield columns
+
+
+def to_arrow(objs):
+    """Return the data of a Gwydion object, or a sequence of objects, as a pyarrow Table."""
+    s = schema(objs)
+
+    # The table holds all of the data anyway, so it is cached on the objects and the columns are views of obj.data.
+    for obj in _objects(objs) or [objs]:
+        obj.data
+
+    return pa.Table.from_batches([pa.record_batch(columns, schema=s) for columns in _batches(objs, s, None)], schema=s)
+
+
+def write_parquet(objs, path, row_group_size=None, **kwargs):
+    """
+    Write the data of a Gwydion object, or a sequence of objects, to a Parquet file.
+
+    Each object is written in row groups of row_group_size points (defaults to the object's chunk_size), so only one
+    row group is held in memory at a time. Keyword arguments are passed to pyarrow.parquet.ParquetWriter.
+    """
+    s = schema(objs)
+
+    with pq.ParquetWriter(path, s, **kwargs) as writer:
+        for columns in _batches(objs, s, row_group_size):
+            writer.write_batch(pa.record_batch(columns, schema=s))
+
+    return path
+
+
+def metadata(path):
+    """Return the Gwydion metadata of a Parquet file as a dict with keys 'version', 'spec' and 'params'."""
+    _require()
+
+    meta = pq.read_schema(path).metadata or {}
+    if b'gwydion.spec' not in meta:
+        raise GwydionError('{} was not written by Gwydion.'.format(path))
+
+    return {'version': meta[b'gwydion.version'].decode(),
+            'spec': json.loads(meta[b'gwydion.spec']),
+            'params': json.loads(meta[b'gwydion.params'])}
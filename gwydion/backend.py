@@ -0,0 +1,109 @@
+"""
+Array backends and global configuration.
+
+Gwydion objects compute their x, r and y data with an array namespace, NumPy by default. Any library implementing the
+array API standard (https://data-apis.org/array-api/) can be used instead, so that data is generated directly as, say,
+PyTorch or JAX arrays without a conversion copy. The backend, dtype and number of threads are chosen with the config
+context manager and captured by each object when it is created:
+
+    >>>> with gwydion.config(backend='torch', dtype='float32'):
+    ....     sine = Sine(N=10**6)
+    >>>> x, y = sine.data  # torch.float32 tensors
+
+Functions which rely on SciPy are computed with NumPy and converted to the backend.
+"""
+import importlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+import numpy as np
+
+from gwydion.exceptions import GwydionError
+
+# Backend names which are provided by array_api_compat (if installed) or by a submodule of the library.
+_ALIASES = {'numpy': ['numpy'],
+            'torch': ['array_api_compat.torch', 'torch'],
+            'jax': ['jax.numpy'],
+            'cupy': ['array_api_compat.cupy', 'cupy'],
+            'dask': ['array_api_compat.dask.array', 'dask.array']}
+
+_DEFAULTS = {'backend': 'numpy', 'dtype': None, 'threads': 1}
+
+_current = ContextVar('gwydion_config', default=_DEFAULTS)
+
+
+@contextmanager
+def config(**settings):
+    """
+    Context manager setting the defaults for Gwydion objects created within it.
+
+    Parameters
+    ----------
+    backend : String or module.
+        Array library used for x, r and y, e.g. 'numpy' (default), 'torch', 'jax', 'array_api_strict', or an array API
+        namespace module.
+    dtype : String or None.
+        Floating point dtype of the data, e.g. 'float32'. If None (default), the backend's default is used.
+    threads : Integer.
+        Number of threads used to evaluate large objects (see Base.threads). Defaults to 1.
+
+    Examples
+    --------
+
+    >>>> with gwydion.config(dtype='float32', threads=4):
+    ....     sines = [Sine(N=10**7) for _ in range(10)]
+    """
+    for key in settings:
+        if key not in _DEFAULTS:
+            raise GwydionError('Unknown configuration option {}.'.format(key))
+
+    if 'backend' in settings:
+        namespace(settings['backend'])
+        if not isinstance(settings['backend'], str):
+            settings['backend'] = settings['backend'].__name__
+
+    token = _current.set(dict(_current.get(), **settings))
+    try:
+        yield current()
+    finally:
+        _current.reset(token)
+
+
+def current():
+    """Return a copy of the current configuration."""
+    return dict(_current.get())
+
+
+@lru_cache(maxsize=None)
+def _import(name):
+    for module in _ALIASES.get(name, [name]):
+        try:
+            return importlib.import_module(module)
+        except ImportError:
+            pass
+
+    raise GwydionError('Unable to import the array backend {!r}.'.format(name))
+
+
+def namespace(backend):
+    """Return the array namespace for a backend name (or the namespace module itself)."""
+    if isinstance(backend, str):
+        return _import(backend)
+    elif hasattr(backend, 'asarray') and hasattr(backend, 'linspace'):
+        return backend
+
+    raise GwydionError('Backend must be a name or an array namespace module.')
+
+
+def dtype(xp, name):
+    """Return the dtype object called name in the namespace xp, or None."""
+    if name is None:
+        return None
+    elif xp is np:
+        return np.dtype(name)
+
+    try:
+        return getattr(xp, np.dtype(name).name)
+    except (AttributeError, TypeError) as e:
+        raise GwydionError('The backend does not support dtype {!r}.'.format(name)) from e
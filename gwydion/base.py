@@ -1,23 +1,56 @@
+import contextvars
+import copyreg
+import threading
 from abc import ABC, abstractmethod
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from inspect import getfullargspec
+from numbers import Real
+from operator import index
 
 import numpy as np
 try:
     import scipy.integrate as si
 except ImportError:
     pass
-import matplotlib.pyplot as plt
 
 from copy import deepcopy
 
+from gwydion import grid, kernels
+from gwydion.backend import current, namespace, dtype as backend_dtype
 from gwydion.exceptions import GwydionError
 
+
+def _readonly(arr):
+    if not isinstance(arr, np.ndarray):
+        return arr
+
+    view = arr.view()
+    view.flags.writeable = False
+
+    return view
+
+
+Sweep = namedtuple('Sweep', ['axes', 'x', 'y'])
+
+# Entropy of the unseeded object being rebuilt by gwydion.spec.from_state.
+_ENTROPY = contextvars.ContextVar('gwydion_entropy', default=None)
+
+# Spawn keys of random streams derived from the seed of an object, independent of its noise and RNG.
+_SWEEP_STREAM = (0, 1)
+_ADAPTIVE_STREAM = (0, 2)
+
+
 class Base(ABC):
     """
     Base ABC object to be subclassed in making Gwydion classes.
 
     Cannot be used as a class by itself, must be subclassed.
 
+    The built-in functions are evaluated with a compiled gwydion.plan.Plan, or by the fused kernels of gwydion.kernels
+    when numba is installed. The backend, dtype and threads of an object are taken from gwydion.config when it is
+    created.
+
     Parameters
     ----------
     N : Integer
@@ -28,20 +61,79 @@ class Base(ABC):
         The amplitude of random numbers added to the y-data. If rand=False, has no use. Defaults to 0.5.
     seed : Integer or None.
         Used to seed the RNG if repeatable results are required. Defaults to None (and thus no seeding).
+
+    Attributes
+    ----------
+    noise : String.
+        'sequential' (default) draws the random data from a RandomState. 'counter' draws it from a counter-based
+        generator keyed by the seed and the point index, so that any window obj[a:b] is computed in O(b - a) and is
+        bit-identical to the same slice of obj.data.
+    grid : String or array.
+        'uniform' (default), 'random', 'jitter', 'log', or the x values themselves (see gwydion.grid). The x-data is
+        read-only and shared between objects with the same grid.
+    threads : Integer.
+        If greater than 1, func and counter-based noise are evaluated in chunks of obj.chunk_size points in a thread
+        pool. The results do not depend on the number of threads.
+    pickle_caches : Boolean.
+        If True, the RNG and any computed arrays are pickled as they are, rather than the compact state of
+        gwydion.spec.to_state.
+
+    Threads
+    -------
+
+    An object can be read from many threads at once. The random data and the y-data are computed once, under a
+    per-object lock, so every thread sees the same arrays. Setting attributes while other threads read the object is
+    not safe. Use gwydion.generate_many to build and evaluate many objects in a thread pool.
     """
 
+    # Lazily computed caches, cleared whenever any other attribute is changed.
+    _caches = ('_x', '_y', '_r', '_key', '_plan', '_data')
+
+    # Execution settings, which do not change the data and so do not clear the caches.
+    _settings = ('threads', 'chunk_size', 'pickle_caches')
+    threads = 1
+    chunk_size = 2**16
+    pickle_caches = False
+
+    allow_negative_y = True
+
+    # Whether func only uses array API operations (via self.xp) and so can be evaluated with any backend.
+    _array_api = True
+
+    def __new__(cls, *args, **kwargs):
+        obj = super().__new__(cls)
+
+        # The constructor arguments, from which gwydion.spec.to_spec can rebuild the object.
+        object.__setattr__(obj, '_init_args', (args, kwargs))
+        object.__setattr__(obj, '_lock', threading.RLock())
+
+        return obj
+
     def __init__(self, N, xlim, rand, seed):
         super().__init__()
 
+        settings = current()
+
         self.N = N
         self.seed = seed
-        self._x = None
-        self._y = None
-        self._r = None
-        self._data = None
+        self.noise = 'sequential'
+        self.grid = 'uniform'
+        self.backend = settings['backend']
+        self.dtype = settings['dtype']
+        self.threads = settings['threads']
 
         try:
-            self.random = np.random.RandomState(self.seed)
+            if seed is None:
+                # Unseeded objects keep the entropy of their RNG, so that they can be pickled without its state.
+                self._entropy = _ENTROPY.get()
+                if self._entropy is None:
+                    self._entropy = np.random.SeedSequence().entropy
+                else:
+                    _ENTROPY.set(None)
+
+                self.random = np.random.RandomState(np.random.MT19937(np.random.SeedSequence(self._entropy)))
+            else:
+                self.random = np.random.RandomState(self.seed)
         except Exception as e:
             raise GwydionError('Setting the random seed has failed.') from e
 
@@ -51,46 +143,734 @@ class Base(ABC):
     @property
     def r(self):
         if self._r is None:
-            try:
-                self._r = self.rand * (2 * self.random.rand(self.N) - 1)
-            except Exception as e:
-                raise GwydionError('Unable to create randomised data.') from e
+            with self._lock:
+                if self._r is None:
+                    try:
+                        if self.noise == 'sequential':
+                            before = self._rng_state()
+                            self._r = self._asarray(self.rand * (2 * self.random.rand(self.N) - 1))
+                            self.__dict__['_rng_drawn'] = (before, self._rng_state())
+                        else:
+                            self._r = self._noise(0, self.N)
+                    except Exception as e:
+                        raise GwydionError('Unable to create randomised data.') from e
+
+        return _readonly(self._r)
+
+    def _noise(self, start, stop):
+        """Random data for the points [start, stop)."""
+        if self.noise == 'sequential':
+            return self.r[start:stop]
+        elif self.noise != 'counter':
+            raise GwydionError("Noise must be either 'sequential' or 'counter'.")
+
+        if self._key is None:
+            seed = self.seed if self.seed is not None else self.__dict__.get('_entropy')
+            self._key = np.random.SeedSequence(seed).generate_state(2, dtype=np.uint64)
 
-        return self._r
+        # Each Philox counter step produces four 64-bit outputs, and each double consumes one of them.
+        offset = start % 4
+        bit_generator = np.random.Philox(key=self._key, counter=start // 4)
+        r = np.random.Generator(bit_generator).random(stop - start + offset)[offset:]
+
+        r *= 2
+        r -= 1
+        r *= self.rand
+
+        return self._asarray(r)
+
+    @property
+    def xp(self):
+        """The array namespace of the object's backend."""
+        return namespace(self.backend)
+
+    def _asarray(self, arr, floating=True):
+        """Convert arr to an array of the object's backend (and, if floating, its dtype)."""
+        xp = self.xp
+        dtype = backend_dtype(xp, self.dtype) if floating else None
+
+        if xp is np:
+            return arr if dtype is None or arr.dtype == dtype else arr.astype(dtype)
+        elif isinstance(arr, np.ndarray) or dtype is not None:
+            return xp.asarray(arr, dtype=dtype)
+
+        return arr
+
+    def _func(self, x):
+        """Evaluate func with the object's backend."""
+        if self.xp is not np and not self._array_api:
+            return self._asarray(self.func(np.from_dlpack(x)))
+
+        return self._asarray(self.func(x))
 
     @property
     def x(self):
         if self._x is None:
+            if not isinstance(self.grid, str):
+                self._x = self._grid_array()
+                return self._x
+
             try:
-                self._x = np.linspace(*self.xlim, num=self.N)
+                self._x = grid.make(self.grid, self.xlim, self.N, dtype=self.dtype, xp=self.xp, key=self._grid_key())
+            except GwydionError:
+                raise
             except Exception as e:
                 raise GwydionError('Unable to create x-data.') from e
 
         return self._x
 
+    def _grid_key(self):
+        """Key of the counter-based stream of random grids, independent of the noise stream."""
+        if self.grid not in ('random', 'jitter'):
+            return None
+
+        seed = self.seed if self.seed is not None else self.__dict__.get('_entropy')
+
+        return tuple(np.random.SeedSequence(seed, spawn_key=(0,)).generate_state(2, dtype=np.uint64))
+
+    def _grid_array(self):
+        x = self.grid
+        x = np.array(x if isinstance(x, np.ndarray) or not hasattr(x, '__dlpack__') else np.from_dlpack(x))
+        if x.ndim != 1 or len(x) != self.N:
+            raise GwydionError('A grid array must be one-dimensional with N values.')
+
+        if x.dtype.kind != 'f':
+            x = x.astype(float)
+        x.flags.writeable = False
+
+        return self._asarray(x)
+
     @property
     def y(self):
+        return self.data[1]
+
+    @property
+    def data(self):
+        """
+        Tuple of (x, y) arrays.
+
+        Both arrays are read-only views of the cached data, so they can be handed to other libraries without copying.
+        Use np.array(obj) for a writeable copy of y, or to_records() for a writeable copy of both.
+        """
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = (self.x, _readonly(self._evaluate()))
+
+        return self._data
+
+    def _evaluate(self):
+        native = self.xp is np
+
+        if self._y is None and self._fused_kernel(self.x) is not None:
+            return self._evaluate_kernel(self.x, self.r)
+
+        if self._y is None and native and self.threads > 1 and self.N > self.chunk_size:
+            return self._evaluate_threaded()
+
         if self._y is None:
             try:
-                self._y = self.func(self.x)
+                self._y = self._func(self.x)
             except Exception as e:
                 raise GwydionError('Unable to create y-data.') from e
 
-        return self._y + self.r
+        return self._clip(self._y + self.r)
 
     @property
-    def data(self):
-        return self.x, self.y
+    def plan(self):
+        """The gwydion.plan.Plan evaluating func for the current parameters, or None if func is not planned."""
+        if self._plan is None:
+            try:
+                self._plan = self._compile_plan()
+            except Exception as e:
+                raise GwydionError('Unable to compile the evaluation plan.') from e
+
+        return self._plan
+
+    def _compile_plan(self):
+        """Return a gwydion.plan.Plan equivalent to func, or None."""
+        return None
+
+    def _kernel(self):
+        """
+        Return (kernel, params) where kernel is the fused function from gwydion.kernels matching func, or None.
+        """
+        return None
+
+    def _fused_kernel(self, x):
+        """
+        Return (kernel, params) if func is evaluated at x by a fused kernel, or None. The kernels and NumPy may differ
+        in the last bit, so the data and every window of it must be computed the same way.
+        """
+        if not kernels.ENABLED or self.xp is not np or x.dtype != float:
+            return None
+
+        return self._kernel()
+
+    def _evaluate_kernel(self, x, r):
+        kernel, params = self._fused_kernel(x)
+
+        try:
+            return kernel(x, r, not self.allow_negative_y, np.empty(len(x)), *params)
+        except GwydionError:
+            raise
+        except Exception as e:
+            raise GwydionError('Unable to create y-data.') from e
+
+    def _evaluate_threaded(self):
+        x = self.x
+        counter = self.noise != 'sequential'
+        r = np.empty(self.N, dtype=self._noise(0, 0).dtype) if counter else self.r
+
+        try:
+            chunks = list(self._chunks())
+            first = self._func(x[:chunks[0][1]])
+
+            f = np.empty(self.N, dtype=first.dtype)
+            f[:len(first)] = first
+            y = np.empty(self.N, dtype=np.result_type(f, r))
+        except Exception as e:
+            raise GwydionError('Unable to create y-data.') from e
+
+        def work(chunk):
+            start, stop = chunk
+            if start:
+                f[start:stop] = self._func(x[start:stop])
+            if counter:
+                r[start:stop] = self._noise(start, stop)
+
+            np.add(f[start:stop], r[start:stop], out=y[start:stop])
+            self._clip(y[start:stop])
+
+        try:
+            with ThreadPoolExecutor(self.threads) as pool:
+                for _ in pool.map(work, chunks):
+                    pass
+        except GwydionError:
+            raise
+        except Exception as e:
+            raise GwydionError('Unable to create y-data.') from e
+
+        self._y = f
+        if counter:
+            self._r = r
+
+        return y
+
+    def _length(self):
+        """Number of points of the data, without computing it."""
+        return int(self.N)
+
+    def _chunks(self, chunk_size=None):
+        """Yield (start, stop) index pairs covering the data in chunks of chunk_size points."""
+        chunk_size = chunk_size or self.chunk_size
+        length = self._length()
+
+        for start in range(0, length, chunk_size):
+            yield start, min(start + chunk_size, length)
+
+    def _stream(self, bounds):
+        """
+        Yield (x, y) for consecutive windows (start, stop) of the data, in order from the first point. Unlike
+        obj[start:stop], sequential noise which has not been drawn yet is drawn window by window from a copy of the
+        RNG, so memory is O(stop - start) whatever the noise and the object's RNG is left alone.
+        """
+        rng = self._stream_rng()
+
+        for start, stop in bounds:
+            yield self._window(start, stop, None if rng is None else self._stream_noise(rng, stop - start))
+
+    def _stream_rng(self):
+        """Copy of the RNG from which sequential noise which has not been drawn yet is streamed, or None."""
+        if self._data is None and self._r is None and self.noise == 'sequential':
+            with self._lock:
+                return deepcopy(self.random)
+
+        return None
+
+    def _stream_noise(self, rng, n):
+        """The random data of the next n points, drawn from rng as self.r draws them from the RNG."""
+        return self._asarray(self.rand * (2 * rng.rand(n) - 1))
+
+    def _clip(self, y):
+        return y
+
+    def _x_window(self, start, stop):
+        if self._x is not None or self.N < 2 or not isinstance(self.grid, str):
+            return self.x[start:stop]
+        elif self.grid != 'uniform':
+            return self._asarray(grid.window(self.grid, self.xlim, self.N, start, stop, self._grid_key()))
+
+        # Same arithmetic as np.linspace, so that windows are bit-identical to slices of the full grid.
+        lo, hi = self.xlim
+        step = (hi - lo) / (self.N - 1)
+
+        x = np.arange(start, stop, dtype=float)
+        if step == 0:
+            x /= self.N - 1
+            x *= hi - lo
+        else:
+            x *= step
+        x += lo
+
+        if stop == self.N and stop > start:
+            x[-1] = hi
+
+        return self._asarray(x)
+
+    def _window(self, start, stop, r=None):
+        """
+        Compute (x, y) for the points [start, stop) without evaluating the rest of the data, with the random data r if
+        given.
+        """
+        if self._data is not None:
+            x, y = self._data
+            return x[start:stop], y[start:stop]
+
+        try:
+            x = self._x_window(start, stop)
+        except Exception as e:
+            raise GwydionError('Unable to create x-data.') from e
+
+        if not self._array_api:
+            self._rng_used()
+
+        r = self._noise(start, stop) if r is None else r
+        if self._y is None and self._fused_kernel(x) is not None:
+            return x, self._evaluate_kernel(x, r)
+
+        try:
+            y = self._func(x) if self._y is None else self._y[start:stop]
+        except Exception as e:
+            raise GwydionError('Unable to create y-data.') from e
+
+        return x, self._clip(y + r)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.N)
+            if step != 1:
+                points = range(start, stop, step)
+                if not points:
+                    return self._window(0, 0)
+
+                lo, hi = min(points), max(points) + 1
+                x, y = self._window(lo, hi)
+                return x[start-lo::step], y[start-lo::step]
+
+            return self._window(start, max(start, stop))
+
+        try:
+            i = index(key)
+        except TypeError:
+            raise GwydionError('{} indices must be integers or slices.'.format(self.__class__.__name__)) from None
+
+        if i < 0:
+            i += self.N
+        if not 0 <= i < self.N:
+            raise IndexError('Index out of range.')
+
+        x, y = self._window(i, i + 1)
+        return x[0], y[0]
+
+    async def adata(self, executor=None):
+        """
+        Awaitable equivalent of data, which evaluates the object in a gwydion.aio.Executor (the default executor if
+        None) so that the event loop is not blocked.
+        """
+        from gwydion import aio
+
+        return await aio.adata(self, executor=executor)
+
+    def aiter_chunks(self, chunk_size=None, executor=None, prefetch=1):
+        """
+        Return an async iterator over (x, y) windows of chunk_size points (defaults to obj.chunk_size), computed in a
+        gwydion.aio.Executor with up to prefetch chunks computed ahead of the consumer.
+        """
+        from gwydion import aio
+
+        return aio.aiter_chunks(self, chunk_size=chunk_size, executor=executor, prefetch=prefetch)
+
+    def to_arrow(self):
+        """
+        Return the data as a pyarrow Table with columns x and y, built without copying the arrays. The schema metadata
+        holds the spec and resolved parameters of the object (see gwydion.arrow).
+        """
+        from gwydion import arrow
+
+        return arrow.to_arrow(self)
+
+    def write_parquet(self, path, row_group_size=None, **kwargs):
+        """
+        Write the data to a Parquet file, one row group of row_group_size points (defaults to obj.chunk_size) at a
+        time. Keyword arguments are passed to pyarrow.parquet.ParquetWriter.
+        """
+        from gwydion import arrow
+
+        return arrow.write_parquet(self, path, row_group_size=row_group_size, **kwargs)
+
+    def write(self, path, fmt='npy', chunk_size=None, pyramid=False):
+        """
+        Write the data to path as records with fields x and y (see to_records), in the format fmt ('npy', 'raw' or
+        'memmap'). Chunks of chunk_size points (defaults to obj.chunk_size) are generated while the previous chunk is
+        written by a background thread (see gwydion.pipeline). Unless the data has already been computed, memory is
+        O(chunk_size) for the built-in grids and both kinds of noise, so the data need not fit in memory. If pyramid is
+        True, a min/max/mean pyramid for previews is built in the same pass and written to path + '.pyramid' (see
+        gwydion.pyramid).
+        """
+        from contextlib import nullcontext
+        from itertools import chain
+
+        from gwydion.pipeline import Writer
+        from gwydion.pyramid import PyramidWriter
+
+        chunk_size = chunk_size or self.chunk_size
+        chunks = list(self._chunks(chunk_size))
+        windows = self._stream(chunks)
+
+        first = next(windows)
+        dtype = [('x', np.from_dlpack(first[0]).dtype), ('y', np.from_dlpack(first[1]).dtype)]
+        length = self._length()
 
-    def plot(self, *args, ax=None, **kwargs):
-        x, y = self.data
+        with Writer(path, (length,), dtype, fmt=fmt, chunk=chunk_size) as writer, \
+                (PyramidWriter(path, length, dtype[1][1], dtype[0][1]) if pyramid else nullcontext()) as levels:
+            for (start, stop), (x, y) in zip(chunks, chain([first], windows)):
+                n = stop - start
 
-        if ax is None:
-            fig, ax = plt.subplots()
+                buf = writer.buffer()
+                buf['x'][:n], buf['y'][:n] = np.from_dlpack(x), np.from_dlpack(y)
+                if levels is not None:
+                    levels.append(buf['x'][:n], buf['y'][:n])
+                writer.write(start, buf[:n], buf)
 
-        ax.plot(x, y, *args, **kwargs)
+        return path
 
-        return ax
+    def to_records(self):
+        """
+        Return a writeable copy of the data as a NumPy structured array with fields 'x' and 'y'.
+        """
+        x, y = (arr if self.xp is np else np.from_dlpack(arr) for arr in self.data)
+
+        rec = np.empty(x.shape[0], dtype=[('x', x.dtype), ('y', y.dtype)])
+        rec['x'], rec['y'] = x, y
+
+        return rec
+
+    def __array__(self, dtype=None, copy=None):
+        y = self.y if self.xp is np else np.from_dlpack(self.y)
+
+        if copy or (dtype is not None and np.dtype(dtype) != y.dtype):
+            if copy is False:
+                raise ValueError('Unable to avoid a copy while converting {} to an array.'.format(self.__class__.__name__))
+            return y.astype(y.dtype if dtype is None else dtype)
+
+        return y
+
+    def __buffer__(self, flags):
+        return memoryview(self.y)
+
+    def __dlpack__(self, **kwargs):
+        # The y-data is read-only, which can only be signalled by DLPack 1.0 consumers (those passing max_version).
+        return self.y.__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return self.y.__dlpack_device__()
+
+    def sweep(self, noise=False, **params):
+        """
+        Evaluate the function over the outer product of several parameter arrays in a single broadcast call.
+
+        Parameters
+        ----------
+        noise : Boolean.
+            If True, random data with amplitude rand is added to every curve. It is drawn from a stream derived from
+            the seed, so the same sweep gives the same noise and the data of the object is unchanged. Defaults to
+            False.
+        **params : 1D sequences of floats or integers.
+            Values to sweep for each named parameter, e.g. mu=[0, 1, 2], sigma=[0.1, 0.2]. Parameters which are not
+            swept keep the value of this object.
+
+        Returns
+        -------
+        Sweep(axes, x, y) where axes is a dict mapping each parameter name to its values (in axis order), x is the
+        x-data and y has shape (len(params[0]), len(params[1]), ..., N).
+
+        Examples
+        --------
+
+        >>>> Normal(N=1000).sweep(mu=np.linspace(-1, 1, 100), sigma=np.linspace(0.1, 1, 50))
+        """
+        if not params:
+            raise GwydionError('At least one parameter must be swept.')
+
+        args = self._parameters()
+        xp, x = self.xp, self.x
+
+        new = self._clone()
+        axes = {}
+        shape = []
+        for i, (name, values) in enumerate(params.items()):
+            if name not in args or not isinstance(getattr(self, name, None), Real):
+                raise GwydionError('{} is not a scalar parameter of {}.'.format(name, self.__class__.__name__))
+
+            values = np.asarray(values)
+            if values.ndim != 1:
+                raise GwydionError('Swept parameter values must be one-dimensional.')
+
+            axes[name] = values
+            shape.append(len(values))
+            values = self._asarray(values) if xp is np else xp.asarray(values, dtype=x.dtype)
+            setattr(new, name, xp.reshape(values, tuple([-1] + [1] * (len(params) - i))))
+
+        shape = tuple(shape) + (x.shape[0],)
+
+        if not self._array_api:
+            self._rng_used()
+
+        try:
+            y = new._func(x)
+            if tuple(y.shape) != shape:
+                y = xp.asarray(xp.broadcast_to(y, shape), copy=True)
+        except Exception as e:
+            raise GwydionError('Unable to create y-data.') from e
+
+        if noise:
+            r = np.random.Generator(np.random.Philox(self._spawn(*_SWEEP_STREAM))).random(shape)
+            y = y + self._asarray(self.rand * (2 * r - 1))
+
+        return Sweep(axes, x, self._clip(y))
+
+    def refine(self, levels=1):
+        """
+        Return a copy of the object at a finer resolution, evaluating func only at the new points.
+
+        Each level inserts the midpoint between every pair of neighbouring points, so N becomes (N - 1) * 2**levels + 1
+        and the current points are every 2**levels-th point of the result. The y-data and noise of the current points
+        are kept; the new points get noise from a counter-based generator keyed by the seed and the level, so the noise
+        of a point is the same at every level and refine(2) is identical to refine().refine(). Each level costs
+        O(new points).
+
+        The refined data is cached: changing an attribute of the copy discards it, after which the copy is evaluated
+        afresh on the linspace grid of its new N.
+
+        Parameters
+        ----------
+        levels : Integer.
+            Number of times the resolution is doubled. Defaults to 1.
+
+        Examples
+        --------
+
+        >>>> levels = [Normal(N=2**4 + 1, seed=42)]
+        >>>> for k in range(5, 20):
+        ....     levels.append(levels[-1].refine())  # N = 2**k + 1, evaluating 2**(k - 1) new points each time.
+        """
+        if isinstance(levels, bool) or not isinstance(levels, int) or levels < 1:
+            raise GwydionError('levels must be a positive integer.')
+        elif self.N < 2:
+            raise GwydionError('At least two points are needed to refine.')
+
+        new = self
+        for _ in range(levels):
+            new = new._refine()
+
+        return new
+
+    def _refine(self):
+        xp = self.xp
+        (x, y), r = self.data, self.r
+        depth = self.__dict__.get('_depth', 0) + 1
+
+        def interleave(old, mid):
+            return xp.concat([xp.reshape(xp.stack([old[:-1], mid], axis=1), (-1,)), old[-1:]])
+
+        try:
+            mid = (x[:-1] + x[1:]) / 2
+            f = self._func(mid)
+        except Exception as e:
+            raise GwydionError('Unable to create y-data.') from e
+
+        # Noise of the new points, from the stream of this level.
+        seed = self.seed if self.seed is not None else self.__dict__.get('_entropy')
+        key = np.random.SeedSequence(seed, spawn_key=(depth,)).generate_state(2, dtype=np.uint64)
+        noise = np.random.Generator(np.random.Philox(key=key)).random(self.N - 1)
+        noise *= 2
+        noise -= 1
+        noise *= self.rand
+        noise = self._asarray(noise)
+
+        new = self._clone()
+        x, r = interleave(x, mid), interleave(r, noise)
+        new.__dict__.update(N=2 * self.N - 1, _depth=depth, _x=x, _r=r, _y=None,
+                            _data=(x, _readonly(interleave(y, self._clip(f + noise)))))
+
+        # The refined data cannot be rebuilt from the constructor arguments.
+        new._rng_used()
+
+        return new
+
+    def adaptive(self, tol=1e-3, initial=17, max_points=2**20):
+        """
+        Return a copy of the object sampled on a non-uniform grid, with more points where func has high curvature.
+
+        Starting from initial evenly spaced points over xlim, every interval is split at its midpoint for as long as
+        func at the midpoint differs from the straight line between the ends of the interval by more than tol times
+        the range of the y-data. Peaks and steep regions are therefore resolved with far fewer points than a uniform
+        grid, while flat regions keep only a few. Each pass evaluates func once, at the midpoints of the intervals
+        which were split in the previous pass.
+
+        The copy has N set to the number of points, and its x-data and func values are cached, with noise added as
+        usual from a random stream of its own derived from the seed. Changing an attribute of the copy discards them,
+        after which it is evaluated afresh on a uniform grid.
+
+        Parameters
+        ----------
+        tol : Float.
+            Tolerance relative to the range of y of the linear interpolation between points. Defaults to 1e-3.
+        initial : Integer.
+            Number of evenly spaced starting points, which must be enough to notice every feature of func. Defaults
+            to 17.
+        max_points : Integer.
+            Maximum number of points. Once reached, the intervals with the largest errors are split first. Defaults to
+            2**20.
+
+        Examples
+        --------
+
+        >>>> Normal(mu=0, sigma=1e-3, xlim=(-1, 1)).adaptive(tol=1e-4)  # A few hundred points rather than millions.
+        """
+        if not tol > 0:
+            raise GwydionError('tol must be positive.')
+        elif not 2 <= initial <= max_points:
+            raise GwydionError('initial must be at least 2 and at most max_points.')
+
+        def evaluate(x):
+            try:
+                f = self._func(self._asarray(x))
+            except Exception as e:
+                raise GwydionError('Unable to create y-data.') from e
+
+            return np.asarray(f if self.xp is np else np.from_dlpack(f), dtype=float)
+
+        x = np.linspace(*self.xlim, num=initial)
+        f = evaluate(x)
+        active = np.ones(initial - 1, dtype=bool)
+
+        while active.any() and len(x) < max_points:
+            left = np.flatnonzero(active)
+            mid = (x[left] + x[left + 1]) / 2
+            fm = evaluate(mid)
+
+            error = np.abs(fm - (f[left] + f[left + 1]) / 2)
+            scale = np.ptp(np.concatenate([f, fm]))
+            split = (error > tol * (scale or 1)) & (x[left] < mid) & (mid < x[left + 1])
+
+            if split.sum() > max_points - len(x):
+                split[:] = False
+                split[np.argsort(error)[::-1][:max_points - len(x)]] = True
+
+            # Both halves of each split interval are tested again in the next pass.
+            starts = np.zeros(len(x), dtype=bool)
+            starts[left[split]] = True
+
+            x = np.concatenate([x, mid[split]])
+            f = np.concatenate([f, fm[split]])
+            starts = np.concatenate([starts, np.ones(split.sum(), dtype=bool)])
+
+            order = np.argsort(x, kind='stable')
+            x, f, active = x[order], f[order], starts[order][:-1]
+
+        # The copy draws its noise from its own stream, leaving the RNG of this object alone.
+        new = self._clone(_ADAPTIVE_STREAM)
+        new.__dict__.update(N=len(x), _x=self._asarray(x), _y=self._asarray(f), _r=None, _data=None)
+
+        # The adaptive grid cannot be rebuilt from the constructor arguments.
+        new._rng_used()
+
+        return new
+
+    def _parameters(self):
+        """Names of the function parameters of the object."""
+        fixed = {'self', 'N', 'xlim', 'rand', 'seed', 'allow_negative_y'}
+
+        return [arg for arg in getfullargspec(self.__class__).args if arg not in fixed]
+
+    def _clone(self, stream=None):
+        """
+        Shallow copy of the object with independent caches. The copy shares the RNG of the object, or if stream is a
+        spawn key, has its own RNG seeded from that stream.
+        """
+        new = object.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new.__dict__['_lock'] = threading.RLock()
+
+        if stream is not None:
+            new.__dict__['random'] = np.random.RandomState(np.random.MT19937(self._spawn(*stream)))
+
+        return new
+
+    def _spawn(self, *spawn_key):
+        """SeedSequence of the random stream spawn_key derived from the seed (or the entropy of unseeded objects)."""
+        seed = self.seed if self.seed is not None else self.__dict__.get('_entropy')
+
+        return np.random.SeedSequence(seed, spawn_key=spawn_key)
+
+    def _rng_used(self):
+        # Mark the RNG as used other than by the constructor and r, so that the object is pickled in full.
+        self.__dict__['_rng_advanced'] = True
+
+    def _rng_state(self):
+        """Fingerprint of the position of the RNG."""
+        _, key, pos, has_gauss, gauss = self.random.get_state()
+
+        return hash(key.tobytes()), pos, has_gauss, gauss
+
+    def _replayable(self):
+        """Whether replaying the constructor reproduces the RNG, and so the data, of the object."""
+        from gwydion.spec import _construct, to_state
+
+        if self.__dict__.get('_rng_advanced'):
+            return False
+
+        # Functions which are not array API functions may draw from the RNG (e.g. discrete distributions).
+        if not (self._array_api or self._y is None):
+            return False
+
+        # The RNG must be where the constructor left it, apart from drawing r. Any other use (e.g. sample, or drawing
+        # from obj.random directly) moves it, and the object is then pickled in full.
+        before, after = self.__dict__.get('_rng_drawn', (None, None))
+        if after is not None and self._rng_state() != after:
+            return False
+
+        return _construct(to_state(self))._rng_state() == (before or self._rng_state())
+
+    def __reduce__(self):
+        from gwydion.spec import from_state, to_state
+
+        if self.pickle_caches or not self._replayable():
+            return copyreg.__newobj__, (self.__class__,), self.__getstate__()
+
+        return from_state, (to_state(self),)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__['_lock'] = threading.RLock()
+
+    def plot(self, *args, ax=None, points=None, method='minmax', **kwargs):
+        """
+        Plot the data on ax (a new figure if None). Large objects are downsampled chunk by chunk to points points
+        (by default twice the width of the axes in pixels) with method 'minmax' or 'lttb', or plotted in full if
+        method is None (see gwydion.plotting).
+        """
+        from gwydion import plotting
+
+        return plotting.plot(self, *args, ax=ax, points=points, method=method, **kwargs)
 
     @abstractmethod
     def set_variables(self, *args):
@@ -100,6 +880,52 @@ class Base(ABC):
     def func(self):
         pass
 
+    # Arithmetic between Gwydion objects and numbers builds a lazy gwydion.composite.Composite. NumPy is told to
+    # defer to these operators rather than converting the object with __array__.
+    __array_ufunc__ = None
+
+    def __add__(self, other):
+        return self._combine('+', self, other)
+
+    def __radd__(self, other):
+        return self._combine('+', other, self)
+
+    def __sub__(self, other):
+        return self._combine('-', self, other)
+
+    def __rsub__(self, other):
+        return self._combine('-', other, self)
+
+    def __mul__(self, other):
+        return self._combine('*', self, other)
+
+    def __rmul__(self, other):
+        return self._combine('*', other, self)
+
+    def __truediv__(self, other):
+        return self._combine('/', self, other)
+
+    def __rtruediv__(self, other):
+        return self._combine('/', other, self)
+
+    def __pow__(self, other):
+        return self._combine('**', self, other)
+
+    def __rpow__(self, other):
+        return self._combine('**', other, self)
+
+    def __neg__(self):
+        return self._combine('*', -1, self)
+
+    @staticmethod
+    def _combine(op, left, right):
+        from gwydion.composite import Composite
+
+        if not all(isinstance(o, (Base, Real)) for o in (left, right)):
+            return NotImplemented
+
+        return Composite(op, left, right)
+
     def __str__(self):
         s = '<{s.__class__.__name__} : N={s.N}, rand={s.rand}>'
         return s.format(s=self)
@@ -113,16 +939,23 @@ class Base(ABC):
         return s.format(self.__class__.__name__)
 
     def __setattr__(self, name, value):
-        if name not in {'r', 'x', 'y', '_r', '_x', '_y'}:
-            super().__setattr__('_x', None)
-            super().__setattr__('_y', None)
-            super().__setattr__('_r', None)
+        if name in {'_r', '_x', '_y'}:
+            super().__setattr__('_data', None)
+        elif name not in {'r', 'x', 'y', 'data', 'plan'} and name not in self._caches + self._settings:
+            if self.__dict__.get('_r') is not None or self.__dict__.get('_y') is not None:
+                # The RNG has moved on from the draws of the discarded data.
+                self._rng_used()
+
+            for cache in self._caches:
+                super().__setattr__(cache, None)
 
         super().__setattr__(name, value)
 
 
 class ProbDist(Base):
 
+    _array_api = False
+
     def __init__(self, N, xlim, rand, seed, allow_negative_y=True):
         self.allow_negative_y = allow_negative_y
 
@@ -131,23 +964,23 @@ class ProbDist(Base):
                          rand=rand,
                          seed=seed)
 
-    @property
-    def y(self):
-        if self._y is None:
-            try:
-                self._y = self.func(self.x)
-            except Exception as e:
-                raise GwydionError('Unable to create y-data.') from e
-
-        y = self._y + self.r
-        if not self.allow_negative_y:
-            y[y<0] = 0
+    def _clip(self, y):
+        if self.allow_negative_y:
+            return y
+        elif self.xp is not np:
+            return self.xp.where(y < 0, self.xp.zeros_like(y), y)
 
+        y[y<0] = 0
         return y
 
     def to_cum(self):
+        """Return a copy whose y-data is the cumulative integral of the y-data, on the same (possibly non-uniform) x."""
+        x, y = (arr if isinstance(arr, np.ndarray) else np.from_dlpack(arr) for arr in self.data)
+
         new = deepcopy(self)
-        new._y = si.cumtrapz(new.y, new.x, initial=0)
+        new._y = new._asarray(si.cumulative_trapezoid(y, x, initial=0))
+        new._r = new.xp.zeros_like(new._y)
+
         return new
 
     def sample(self, N):
@@ -179,9 +1012,24 @@ class DiscreteProbDist(ProbDist):
     @property
     def x(self):
         if self._x is None:
+            if not isinstance(self.grid, str) or self.grid != 'uniform':
+                raise GwydionError('Discrete distributions only support the uniform grid.')
+
             try:
-                self._x = np.unique(np.linspace(*self.xlim, num=self.N).astype('int'))
+                self._x = self._asarray(grid.support(self.xlim, self.N), floating=False)
             except Exception as e:
                 raise GwydionError('Unable to create x-data.') from e
 
         return self._x
+
+    def _length(self):
+        return int(self.x.shape[0])
+
+    def _x_window(self, start, stop):
+        return self.x[start:stop]
+
+    def refine(self, levels=1):
+        raise GwydionError('Discrete distributions are defined on integer support, and cannot be refined.')
+
+    def adaptive(self, tol=1e-3, initial=17, max_points=2**20):
+        raise GwydionError('Discrete distributions are defined on integer support, and cannot be sampled adaptively.')
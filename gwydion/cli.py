@@ -0,0 +1,254 @@
+"""
+Command-line interface, installed as the gwydion console script.
+
+    $ gwydion generate Poisson --count 10000000 -N 100 --param lam=1:10 --seed 0 -o poisson.npy --workers 8
+    $ gwydion serve --port 8000
+
+generate writes count curves to a single array of shape (count, 2, n), where [i, 0] and [i, 1] are the x and y-data of
+curve i. Each curve is built from the spec (see gwydion.spec) with its own seed derived from (seed, i), and parameters
+given as ranges are drawn uniformly for each curve from the same seed, so the output depends only on the arguments and
+not on the number of workers or the chunk size. Discrete distributions which derive xlim from their parameters (e.g.
+Poisson from lam) are given the xlim covering every value of the ranges, so that all curves have the same support.
+
+Curves are generated in chunks across worker processes and written to disk by a background thread as they complete,
+keeping at most 2*workers chunks in memory. With --pyramid, a min/max/mean pyramid of each curve is written to
+<output>.pyramid in the same pass (see gwydion.pyramid).
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+
+from gwydion.base import DiscreteProbDist
+from gwydion.exceptions import GwydionError
+from gwydion.grid import KINDS
+from gwydion.pipeline import FORMATS, Writer
+from gwydion.pyramid import PyramidWriter
+from gwydion.spec import build, classes, normalize
+
+
+def _seeds(seed, i):
+    """Return (object seed, parameter RNG) for curve i."""
+    state = np.random.SeedSequence([seed, i, 0]).generate_state(1)[0]
+
+    return int(state), np.random.default_rng(np.random.SeedSequence([seed, i, 1]))
+
+
+def _curve_spec(spec, ranges, seed, i):
+    obj_seed, rng = _seeds(seed, i)
+
+    params = dict(spec['params'])
+    for name in sorted(ranges):
+        lo, hi = ranges[name]
+        if isinstance(lo, int) and isinstance(hi, int):
+            params[name] = int(rng.integers(lo, hi + 1))
+        else:
+            params[name] = float(rng.uniform(lo, hi))
+
+    return dict(spec, seed=obj_seed, params=params)
+
+
+def _common_xlim(spec, ranges):
+    # The xlim of a discrete distribution grows monotonically with each parameter, so the curves built from the
+    # corners of the ranges span the xlim of every curve.
+    names = sorted(ranges)
+    lims = [build(dict(spec, seed=0, params=dict(spec['params'], **dict(zip(names, corner))))).xlim
+            for corner in itertools.product(*(ranges[name] for name in names))]
+
+    return [min(lim[0] for lim in lims), max(lim[1] for lim in lims)]
+
+
+def _generate_chunk(spec, ranges, seed, start, stop, n, dtype, out=None):
+    if out is None:
+        out = np.empty((stop - start, 2, n), dtype=dtype)
+
+    for row, i in enumerate(range(start, stop)):
+        x, y = build(_curve_spec(spec, ranges, seed, i)).data
+        if len(x) != n:
+            raise GwydionError('Curve {} has {} points rather than {}; fix xlim so that all curves have the same '
+                               'x-data length.'.format(i, len(x), n))
+
+        out[row, 0], out[row, 1] = x, y
+
+    return out
+
+
+def generate(spec, count, path, ranges=None, seed=0, fmt='npy', workers=1, chunk_size=None, progress=False,
+             pyramid=False):
+    """
+    Generate count curves from spec and write them to path.
+
+    Parameters
+    ----------
+    spec : Dict.
+        Spec of the curves (see gwydion.spec). Any seed is ignored in favour of per-curve seeds.
+    count : Integer.
+        Number of curves.
+    path : String.
+        Output file, or '-' for standard output (except with the memmap format).
+    ranges : Dict or None.
+        {name: (lo, hi)} parameters drawn uniformly for each curve. Integer bounds draw integers from [lo, hi].
+    seed : Integer.
+        Seed of the whole dataset. Defaults to 0.
+    fmt : String.
+        Format of the (count, 2, n) array: 'npy' (default) or 'raw' (C-ordered bytes with no header), which are
+        streamed, or 'memmap', a memory-mapped .npy file (see gwydion.pipeline.Writer).
+    workers : Integer.
+        Number of worker processes. If 1 (default), curves are generated in this process.
+    chunk_size : Integer or None.
+        Curves per chunk. If None, chunks of about 16 MB are used.
+    progress : Boolean.
+        Report progress on standard error.
+    pyramid : Boolean.
+        Also write a min/max/mean pyramid of each curve to path + '.pyramid' (see gwydion.pyramid.Pyramid).
+
+    Examples
+    --------
+
+    >>>> generate({'class': 'Sine', 'N': 100}, 10**6, 'sines.npy', ranges={'f': (0.5, 2.0)}, workers=4)
+    """
+    if count < 1 or workers < 1:
+        raise GwydionError('count and workers must be positive integers.')
+
+    spec = normalize(dict(spec, seed=None))
+    ranges = ranges or {}
+
+    if ranges and spec.get('xlim') is None and issubclass(classes()[spec['class']], DiscreteProbDist):
+        spec['xlim'] = _common_xlim(spec, ranges)
+
+    x, y = build(_curve_spec(spec, ranges, seed, 0)).data
+    n, dtype = len(x), np.result_type(x, y)
+
+    chunk_size = chunk_size or max(1, 2**24 // (2 * n * dtype.itemsize))
+    chunks = [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+    started = time.monotonic()
+
+    def report(stop):
+        if progress:
+            rate = stop / max(time.monotonic() - started, 1e-9)
+            sys.stderr.write('\rgwydion: {}/{} curves ({:.0f} curves/s)'.format(stop, count, rate))
+            sys.stderr.flush()
+
+    try:
+        # Chunks are written by a background thread while the next ones are generated.
+        with Writer(path, (count, 2, n), dtype, fmt=fmt, chunk=chunk_size) as writer, \
+                (PyramidWriter(path, n, dtype, dtype, rows=count) if pyramid else nullcontext()) as levels:
+
+            def write(start, rows, buf=None):
+                if levels is not None:
+                    levels.write_rows(start, rows[:, 0], rows[:, 1])
+                writer.write(start, rows, buf)
+
+            if workers == 1:
+                for start, stop in chunks:
+                    buf = writer.buffer()
+                    _generate_chunk(spec, ranges, seed, start, stop, n, dtype, out=buf[:stop - start])
+                    write(start, buf[:stop - start], buf)
+                    report(stop)
+            else:
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(workers, mp_context=context) as pool:
+                    pending = deque()
+                    for start, stop in chunks:
+                        pending.append((start, stop, pool.submit(_generate_chunk, spec, ranges, seed, start, stop,
+                                                                 n, dtype)))
+                        # Results are written in order, with a bounded number of chunks in flight.
+                        if len(pending) >= 2 * workers:
+                            start, stop, future = pending.popleft()
+                            write(start, future.result())
+                            report(stop)
+
+                    while pending:
+                        start, stop, future = pending.popleft()
+                        write(start, future.result())
+                        report(stop)
+    finally:
+        if progress:
+            sys.stderr.write('\n')
+
+    return path
+
+
+def _value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _params(items):
+    params, ranges = {}, {}
+
+    for item in items:
+        name, sep, value = item.partition('=')
+        if not sep:
+            raise GwydionError('Parameters must be given as NAME=VALUE or NAME=LO:HI, not {!r}.'.format(item))
+
+        lo, sep, hi = value.partition(':')
+        if sep:
+            ranges[name] = (_value(lo), _value(hi))
+        else:
+            params[name] = _value(value)
+
+    return params, ranges
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog='gwydion', description='Generate pseudo-random scientific data.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    gen = commands.add_parser('generate', help='Generate many curves to a file.')
+    gen.add_argument('cls', metavar='CLASS', help='Gwydion class, e.g. Sine or Poisson.')
+    gen.add_argument('--count', type=int, default=1, help='Number of curves.')
+    gen.add_argument('-N', type=int, default=None, help='Points per curve.')
+    gen.add_argument('--param', action='append', default=[], metavar='NAME=VALUE|NAME=LO:HI',
+                     help='Fixed parameter value, or a range drawn uniformly per curve. May be repeated.')
+    gen.add_argument('--xlim', type=_value, nargs=2, default=None, metavar=('MIN', 'MAX'))
+    gen.add_argument('--rand', type=float, default=None, help='Amplitude of the noise.')
+    gen.add_argument('--grid', choices=KINDS, default=None, help='x-grid of each curve (see Base).')
+    gen.add_argument('--dtype', default=None)
+    gen.add_argument('--seed', type=int, default=0)
+    gen.add_argument('-o', '--output', required=True, help="Output file, or '-' for standard output.")
+    gen.add_argument('--format', choices=FORMATS, default='npy')
+    gen.add_argument('--workers', type=int, default=1)
+    gen.add_argument('--chunk-size', type=int, default=None, help='Curves per chunk.')
+    gen.add_argument('--progress', action='store_true', help='Report progress on standard error.')
+    gen.add_argument('--pyramid', action='store_true', help='Also write a min/max/mean preview pyramid.')
+
+    commands.add_parser('serve', help='Serve data over HTTP (see gwydion serve --help).', add_help=False)
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    if argv[:1] == ['serve']:
+        from gwydion import serve
+        return serve.main(argv[1:])
+
+    args = _parser().parse_args(argv)
+
+    try:
+        params, ranges = _params(args.param)
+        spec = {'class': args.cls, 'params': params}
+        for key in ('N', 'xlim', 'rand', 'dtype', 'grid'):
+            if getattr(args, key) is not None:
+                spec[key] = getattr(args, key)
+
+        generate(spec, args.count, args.output, ranges=ranges, seed=args.seed, fmt=args.format,
+                 workers=args.workers, chunk_size=args.chunk_size, progress=args.progress, pyramid=args.pyramid)
+    except GwydionError as e:
+        sys.exit('gwydion: error: {}'.format(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import operator
+from numbers import Real
+
+from gwydion.base import np, Base
+from gwydion.exceptions import GwydionError
+
+_OPERATORS = {'+': (np.add, operator.add),
+              '-': (np.subtract, operator.sub),
+              '*': (np.multiply, operator.mul),
+              '/': (np.true_divide, operator.truediv),
+              '**': (np.power, operator.pow)}
+
+
+class Composite(Base):
+    """
+    Composite of two Gwydion objects (or an object and a number) combined by an arithmetic operator. Composites are
+    normally created with the usual operators, e.g.
+
+        y = Sine(...) * Exponential(...) + Linear(...)
+
+    The expression tree is evaluated lazily and in a single fused pass: x is processed in chunks of chunk_size points
+    and each operator is applied in-place to the chunk's buffer, so no full-length temporaries are allocated per
+    operation. The random data of the operands is ignored; the composite adds a single noise term of amplitude rand.
+
+    Parameters
+    ----------
+
+    op : String.
+        One of '+', '-', '*', '/' or '**'.
+    left : Gwydion object, float, or integer.
+        Left-hand operand.
+    right : Gwydion object, float, or integer.
+        Right-hand operand.
+
+    N, xlim, rand and seed are taken from the first Gwydion operand, and all Gwydion operands must share the same
+    x-data. The operands are copied when the composite is created, so later changes to them have no effect.
+
+    Examples
+    --------
+
+    >>>> Sine(xlim=(0, 10)) * Exponential(k=-0.5, xlim=(0, 10))  # Damped oscillation.
+    >>>> Linear() + Sine(xlim=(0, 10), rand=None)  # Trend plus seasonality.
+    >>>> 2 * Normal(xlim=(-3, 3))  # Scaled Gaussian.
+    """
+
+    def __init__(self, op, left, right):
+        operand = next(o for o in (left, right) if isinstance(o, Base))
+
+        super().__init__(N=operand.N,
+                         xlim=operand.xlim,
+                         rand=operand.rand,
+                         seed=operand.seed)
+
+        self.set_variables(op, left, right)
+
+    def set_variables(self, op, left, right):
+
+        if op not in _OPERATORS:
+            raise GwydionError('Operator must be one of {}.'.format(', '.join(_OPERATORS)))
+
+        for var in [left, right]:
+            if not isinstance(var, (Base, Real)):
+                raise GwydionError('Operands must be Gwydion objects, floats, or ints.')
+
+        operands = [o for o in (left, right) if isinstance(o, Base)]
+        for o in operands[1:]:
+            if o.N != operands[0].N or not np.array_equal(np.from_dlpack(o.x), np.from_dlpack(operands[0].x)):
+                raise GwydionError('Operands must have the same x-data.')
+
+        self.op = op
+        self.left = left._clone() if isinstance(left, Base) else left
+        self.right = right._clone() if isinstance(right, Base) else right
+
+        # Pickles and specs are made from the copies of the operands, which later changes to the originals do not
+        # affect.
+        object.__setattr__(self, '_init_args', ((op, self.left, self.right), {}))
+
+    @property
+    def _operand(self):
+        return self.left if isinstance(self.left, Base) else self.right
+
+    @property
+    def x(self):
+        if self._x is None:
+            self._x = self._operand.x
+
+        return self._x
+
+    def _x_window(self, start, stop):
+        if self._x is not None:
+            return self._x[start:stop]
+
+        return self._operand._x_window(start, stop)
+
+    def func(self, x):
+        if self.xp is not np:
+            return self._fused(x)
+
+        y = None
+
+        for start in range(0, len(x), self.chunk_size):
+            stop = start + self.chunk_size
+            chunk = self._fused(x[start:stop])
+
+            if y is None:
+                y = np.empty(len(x), dtype=chunk.dtype)
+            y[start:stop] = chunk
+
+        return y if y is not None else self._fused(x)
+
+    def _fused(self, x):
+        left, right = _operand(self.left, x), _operand(self.right, x)
+        ufunc, op = _OPERATORS[self.op]
+
+        if self.xp is not np:
+            return op(left, right)
+
+        for out in (left, right):
+            if _owned(out, x) and np.result_type(left, right) == out.dtype and np.shape(out) == np.shape(x):
+                return ufunc(left, right, out=out)
+
+        return ufunc(left, right)
+
+    def __str__(self):
+        s = '<{s.__class__.__name__} : {expr}, N={s.N}, rand={s.rand}>'
+        return s.format(s=self, expr=_expression(self))
+
+
+def _operand(operand, x):
+    if isinstance(operand, Composite):
+        return operand._fused(x)
+    elif isinstance(operand, Base):
+        return operand._func(x)
+
+    return operand
+
+
+def _owned(arr, x):
+    # Only buffers created while evaluating this chunk may be overwritten in-place.
+    return (isinstance(arr, np.ndarray) and arr.flags.writeable and arr.flags.owndata
+            and not np.shares_memory(arr, x))
+
+
+def _expression(operand):
+    if isinstance(operand, Composite):
+        return '({} {} {})'.format(_expression(operand.left), operand.op, _expression(operand.right))
+    elif isinstance(operand, Base):
+        return operand.__class__.__name__
+
+    return repr(operand)
@@ -2,4 +2,5 @@ from gwydion.funcs.linear import Linear
 from gwydion.funcs.sine import Sine
 from gwydion.funcs.exponential import Exponential
 from gwydion.funcs.polynomial import Polynomial, Quadratic, Cubic
-from gwydion.funcs.logarithm import Logarithm
\ No newline at end of file
+from gwydion.funcs.logarithm import Logarithm
+from gwydion.funcs.custom import Custom
\ No newline at end of file
@@ -0,0 +1,162 @@
+import ast
+from functools import lru_cache
+from numbers import Real
+
+from gwydion.base import np, Base
+from gwydion.exceptions import GwydionError
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+FUNCTIONS = {name: getattr(np, name) for name in ['sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan', 'arctan2',
+                                                    'sinh', 'cosh', 'tanh', 'arcsinh', 'arccosh', 'arctanh',
+                                                    'exp', 'expm1', 'log', 'log10', 'log1p', 'sqrt', 'abs']}
+CONSTANTS = {'pi': np.pi, 'e': np.e}
+
+# Array API names of the functions which differ from NumPy's.
+_ARRAY_API = {'arcsin': 'asin', 'arccos': 'acos', 'arctan': 'atan', 'arctan2': 'atan2',
+              'arcsinh': 'asinh', 'arccosh': 'acosh', 'arctanh': 'atanh'}
+
+_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+          ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd)
+
+# Instance attributes which cannot double as parameter names.
+_RESERVED = {'N', 'xlim', 'rand', 'seed', 'noise', 'grid', 'random', 'backend', 'dtype', 'expr', 'names'}
+
+
+class Custom(Base):
+    """
+    Custom function defined by a formula, e.g.
+
+        y = I*sin(2*pi*f*x)*exp(-k*x)
+
+    The formula is parsed and compiled once per expression string and shared by every object using it. If numexpr is
+    installed the formula is evaluated by numexpr (multithreaded, without a temporary array per operator), otherwise
+    by NumPy, or by the array API functions of the object's backend.
+
+    Parameters
+    ----------
+
+    expr : String.
+        Formula in terms of x and any number of named parameters. The functions sin, cos, tan, arcsin, arccos, arctan,
+        arctan2, sinh, cosh, tanh, arcsinh, arccosh, arctanh, exp, expm1, log, log10, log1p, sqrt and abs, and the
+        constants pi and e, may be used.
+    N : Integer.
+        Length of arrays to be returned via the data method. Defaults to 100.
+    xlim : Tuple of floats or integers.
+        (Min, Max) values for the x-data. Defaults to (-10, 10).
+    rand : Float or integer.
+        The amplitude of random numbers added to the y-data. If None, no random data added. Defaults to 0.1.
+    seed : Integer or None.
+        Used to seed the RNG if repeatable results are required. Defaults to None (and thus no seeding).
+    **params : Float, integer, tuple of (min, max), or None.
+        Values of the parameters in the formula. If a tuple, defaults to a random value within that range. If None or
+        not given, defaults to a random value between 0 and 1.
+
+    Examples
+    --------
+
+    >>>> Custom('I*sin(2*pi*f*x)*exp(-k*x)')  # Damped sine with random parameters.
+    >>>> Custom('a*x**2 + b', a=2, b=(-1, 1))  # Quadratic with b a random value between -1 and 1.
+    >>>> Custom('log(k*x)', xlim=(1, 10), rand=None)  # Turn off randomness.
+    >>>> Custom('a*x', seed=1234)  # Seeded RNG
+    """
+
+    def __init__(self, expr, N=100, xlim=(-10, 10), rand=0.1, seed=None, **params):
+        super().__init__(N=N,
+                         xlim=xlim,
+                         rand=rand,
+                         seed=seed)
+
+        self.set_variables(expr, **params)
+
+    def set_variables(self, expr, **params):
+
+        if not isinstance(expr, str):
+            raise GwydionError('Expression must be a string.')
+
+        self.expr = expr
+        self.names, _ = _compile(expr)
+
+        for key in params:
+            if key not in self.names:
+                raise GwydionError('{} is not a parameter of {!r}.'.format(key, expr))
+
+        for key in self.names:
+            val = params.get(key)
+
+            # (min, max) pairs may also be lists, as they are in JSON specs.
+            if isinstance(val, (tuple, list)) and len(val) == 2 and all(isinstance(v, Real) for v in val):
+                val = val[0] + self.random.rand() * (val[1] - val[0])
+            elif val is None:
+                val = self.random.rand()
+            elif not isinstance(val, Real):
+                raise GwydionError('Variables must be either float, int, tuple of (min, max), or None.')
+
+            setattr(self, key, val)
+
+    def func(self, x):
+        _, evaluate = _compile(self.expr)
+
+        xp = self.xp
+
+        y = evaluate(x, {key: getattr(self, key) for key in self.names}, xp)
+        if not hasattr(y, 'shape') or len(y.shape) == 0:
+            y = xp.full(x.shape, float(y), dtype=x.dtype)
+
+        return y
+
+    def _parameters(self):
+        return list(self.names)
+
+    def __repr__(self):
+        params = ', '.join('{}={}'.format(key, getattr(self, key)) for key in self.names)
+        s = super().__repr__()
+
+        return s[:-1] + ', ' + params + ')' if params else s
+
+
+@lru_cache(maxsize=None)
+def _compile(expr):
+    """
+    Parse and compile expr, returning the tuple of parameter names and an evaluator, evaluate(x, params, xp).
+    """
+    try:
+        tree = ast.parse(expr.strip(), mode='eval')
+    except SyntaxError as e:
+        raise GwydionError('Unable to parse expression {!r}.'.format(expr)) from e
+
+    names = []
+    for node in sorted(ast.walk(tree), key=lambda n: (getattr(n, 'lineno', 0), getattr(n, 'col_offset', -1))):
+        if not isinstance(node, _NODES):
+            raise GwydionError('Unsupported syntax in expression {!r}.'.format(expr))
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                raise GwydionError('Unsupported function call in expression {!r}.'.format(expr))
+        elif isinstance(node, ast.Name) and node.id not in FUNCTIONS and node.id not in CONSTANTS:
+            if node.id != 'x' and node.id not in names:
+                if hasattr(Base, node.id) or node.id.startswith('_') or node.id in _RESERVED:
+                    raise GwydionError('{} cannot be used as a parameter name.'.format(node.id))
+                names.append(node.id)
+
+    code = compile(tree, '<gwydion: {}>'.format(expr), 'eval')
+
+    def evaluate(x, params, xp=np):
+        namespace = dict(params, x=x, **CONSTANTS)
+
+        if xp is not np:
+            functions = {name: getattr(xp, _ARRAY_API.get(name, name)) for name in FUNCTIONS}
+            return eval(code, {'__builtins__': {}}, dict(namespace, **functions))
+
+        if ne is not None:
+            try:
+                return ne.evaluate(expr, local_dict=namespace, global_dict={})
+            except Exception:
+                pass
+
+        return eval(code, {'__builtins__': {}}, dict(namespace, **FUNCTIONS))
+
+    return tuple(names), evaluate
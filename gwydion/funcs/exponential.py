@@ -1,4 +1,8 @@
+from numbers import Real
+
+from gwydion import kernels
 from gwydion.base import np, Base
+from gwydion.plan import Plan, ln
 from gwydion.exceptions import GwydionError
 
 
@@ -62,6 +66,18 @@ class Exponential(Base):
                 setattr(self, key, locals()[key])
 
     def func(self, x):
+        if self.plan is None:
+            return self.I * self.base ** (self.k * x)
+
+        return self.plan(x, self.xp)
+
+    def _compile_plan(self):
+        # base**(k*x) = exp(k*ln(base)*x), which needs a positive base; other bases are raised to the power directly.
         I, k, base = self.I, self.k, self.base
+        if isinstance(base, Real) and base <= 0:
+            return None
+
+        return Plan([('mul', k * ln(base, self.xp)), ('exp',), ('mul', I)])
 
-        return I * np.power(base, self.k * x)
+    def _kernel(self):
+        return None if self.plan is None else (kernels.exponential, self.plan.constants)
@@ -1,4 +1,6 @@
+from gwydion import kernels
 from gwydion.base import Base
+from gwydion.plan import Plan
 from gwydion.exceptions import GwydionError
 
 
@@ -59,7 +61,10 @@ class Linear(Base):
             self.c = c
 
     def func(self, x):
-        m = self.m
-        c = self.c
+        return self.plan(x, self.xp)
 
-        return m * x + c
+    def _compile_plan(self):
+        return Plan([('mul', self.m), ('add', self.c)])
+
+    def _kernel(self):
+        return kernels.linear, self.plan.constants
@@ -1,4 +1,8 @@
+from numbers import Real
+
+from gwydion import kernels
 from gwydion.base import np, Base
+from gwydion.plan import Plan, ln
 from gwydion.exceptions import GwydionError
 
 
@@ -62,6 +66,18 @@ class Logarithm(Base):
                 setattr(self, key, locals()[key])
 
     def func(self, x):
+        if self.plan is None:
+            return self.I * self.xp.log(self.k * x) / float(np.log(self.base))
+
+        return self.plan(x, self.xp)
+
+    def _compile_plan(self):
+        # A base without a finite, nonzero logarithm gives inf or nan y-data, which func computes directly.
         base, I, k = self.base, self.I, self.k
+        if isinstance(base, Real) and (base <= 0 or base == 1):
+            return None
+
+        return Plan([('mul', k), ('log',), ('mul', I / ln(base, self.xp))])
 
-        return I*np.log(k*x)/np.log(base)
+    def _kernel(self):
+        return None if self.plan is None else (kernels.logarithm, self.plan.constants)
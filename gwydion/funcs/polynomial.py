@@ -1,4 +1,6 @@
+from gwydion import kernels
 from gwydion.base import np, Base
+from gwydion.plan import Plan
 from gwydion.exceptions import GwydionError
 
 
@@ -55,8 +57,24 @@ class Polynomial(Base):
         self.params = self.a
 
     def func(self, x):
-        y = sum(v * np.power(x, i) for i, v in enumerate(self.a))
-        return y
+        return self.plan(x, self.xp)
+
+    def _compile_plan(self):
+        # Horner's method, a[n]*x + a[n-1], then (...)*x + a[n-2], and so on.
+        a = [float(v) for v in self.a]
+
+        if len(a) == 1:
+            return Plan([('mul', 0.0), ('add', a[0])])
+
+        steps = [('mul', a[-1])]
+        for v in a[-2:0:-1]:
+            steps += [('add', v), ('xmul',)]
+        steps.append(('add', a[0]))
+
+        return Plan(steps)
+
+    def _kernel(self):
+        return kernels.polynomial, (np.asarray(self.a, dtype=float),)
 
 
 class Quadratic(Polynomial):
@@ -1,4 +1,6 @@
+from gwydion import kernels
 from gwydion.base import np, Base
+from gwydion.plan import Plan
 
 from gwydion.exceptions import GwydionError
 
@@ -62,6 +64,12 @@ class Sine(Base):
                 setattr(self, key, locals()[key])
 
     def func(self, x):
+        return self.plan(x, self.xp)
+
+    def _compile_plan(self):
         I, f, p = self.I, self.f, self.p
 
-        return I * np.sin(2 * np.pi * f * x + p)
+        return Plan([('mul', 2 * np.pi * f), ('add', p), ('sin',), ('mul', I)])
+
+    def _kernel(self):
+        return kernels.sine, self.plan.constants
@@ -0,0 +1,208 @@
+"""
+Shared x-grids.
+
+The x-data of an object is evenly spaced over xlim by default (obj.grid = 'uniform'). Irregularly sampled data is made
+by setting obj.grid to one of
+
+    'random'    N sorted uniform random points, generated in order in O(N) from cumulative exponential spacings.
+    'jitter'    One uniform random point in each of N equal cells of xlim.
+    'log'       N logarithmically spaced points (xlim must be positive).
+    An array    The x values themselves, of length N.
+
+The random grids are counter-based and keyed by the seed, and any window obj[a:b] is bit-identical to the same slice
+of obj.x. A 'jitter' window is computed in O(b - a), like counter-based noise. A 'random' window is normalised by the
+sum of all N + 1 spacings, so the first window of a grid makes a one-off O(N) pass (cached per key and N) and later
+windows cost O(b - a). Discrete distributions only support the uniform grid.
+
+Grids are read-only and interned: objects with the same grid share a single array, which is freed with the last of
+them.
+"""
+import threading
+import weakref
+from functools import lru_cache
+
+import numpy as np
+
+from gwydion.exceptions import GwydionError
+
+# x-grid strategies of Base.grid, besides an explicit array of x values.
+KINDS = ('uniform', 'random', 'jitter', 'log')
+
+# Random grids are generated in blocks of this many points; a window of any size costs at most one extra block.
+BLOCK = 2**16
+
+# Process-wide registry of read-only x grids. Values are held weakly so that a grid is freed as soon as the last
+# object using it is garbage collected.
+_registry = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+
+def _intern(key, factory):
+    with _lock:
+        arr = _registry.get(key)
+
+    if arr is None:
+        arr = factory()
+        if isinstance(arr, np.ndarray):
+            arr.flags.writeable = False
+
+        try:
+            with _lock:
+                arr = _registry.setdefault(key, arr)
+        except TypeError:
+            # Arrays of some backends cannot be weakly referenced, and so are not shared.
+            pass
+
+    return arr
+
+
+def _key(kind, xlim, N, dtype):
+    xlim = tuple(xlim)
+    dtype = None if dtype is None else np.dtype(dtype).str
+
+    return kind, xlim, tuple(type(v) for v in xlim), N, dtype
+
+
+def linspace(xlim, N, dtype=None, xp=np):
+    """
+    Return a shared, read-only array equivalent to np.linspace(*xlim, num=N, dtype=dtype).
+
+    Identical (xlim, N, dtype) requests return the same array object for as long as any caller holds a reference.
+    If xp is an array namespace other than NumPy, the NumPy grid is converted to an xp array (which is also shared).
+    """
+    key = _key('linspace', xlim, N, dtype)
+
+    if xp is not np:
+        grid = linspace(xlim, N)
+        dtype = None if dtype is None else getattr(xp, np.dtype(dtype).name)
+        return _intern(key + (xp.__name__,), lambda: xp.asarray(grid, dtype=dtype, copy=True))
+
+    return _intern(key, lambda: np.linspace(*xlim, num=N, dtype=dtype))
+
+
+def support(xlim, N, dtype='int'):
+    """
+    Return a shared, read-only array of the unique integer values in linspace(xlim, N), as used for the x-data of
+    discrete probability distributions.
+    """
+    key = _key('support', xlim, N, dtype)
+
+    return _intern(key, lambda: np.unique(np.linspace(*xlim, num=N).astype(dtype)))
+
+
+def _uniforms(key, start, stop):
+    # Uniform numbers [start, stop) of the counter-based stream keyed by key, as in Base._noise.
+    offset = start % 4
+    bit_generator = np.random.Philox(key=np.array(key, dtype=np.uint64), counter=start // 4)
+
+    return np.random.Generator(bit_generator).random(stop - start + offset)[offset:]
+
+
+def _spacings(key, start, stop):
+    # Standard exponential spacings E[start:stop].
+    return -np.log1p(-_uniforms(key, start, stop))
+
+
+def _sums(key, N, stop):
+    # Yield (block, S) where S are the cumulative sums of the spacings of each block up to point stop, continuing from
+    # the sums of the previous blocks. The last value of S is carried exactly, so every window adds the same offsets.
+    offset = 0.0
+    for block, start in enumerate(range(0, stop, BLOCK)):
+        s = np.cumsum(_spacings(key, start, min(start + BLOCK, N + 1)))
+        s += offset
+        offset = s[-1]
+        yield block, s
+
+
+@lru_cache(maxsize=64)
+def _offsets(key, N):
+    # Sum of the N + 1 spacings before each block, and in total (the last value).
+    return np.array([0.0] + [s[-1] for _, s in _sums(key, N, N + 1)])
+
+
+def _random(xlim, N, start, stop, key):
+    # The sorted sample of N uniform points is (S[1], ..., S[N]) / S[N + 1], where S[k] is the sum of the first k of
+    # N + 1 exponential spacings. Cumulative sums restart at each block from the block offsets, which take an O(N)
+    # pass and are cached, so after the first any window is computed in O(stop - start + BLOCK) and is bit-identical
+    # to the same slice of the full grid.
+    lo, hi = xlim
+
+    if start == 0 and stop == N:
+        # The whole grid is made in a single pass.
+        parts = [s for _, s in _sums(key, N, N + 1)]
+        total = parts[-1][-1]
+        u = np.concatenate(parts)[:N]
+    else:
+        offsets = _offsets(key, N)
+        total = offsets[-1]
+
+        parts = []
+        for block in range(start // BLOCK, -(-stop // BLOCK)):
+            a = block * BLOCK
+            s = np.cumsum(_spacings(key, a, min(a + BLOCK, stop)))
+            s += offsets[block]
+            parts.append(s[max(start - a, 0):])
+
+        u = np.concatenate(parts) if parts else np.empty(0)
+
+    u /= total
+    u *= hi - lo
+    u += lo
+
+    return u
+
+
+def window(kind, xlim, N, start, stop, key=None):
+    """
+    Return the points [start, stop) of an x-grid of N points over xlim as a float64 NumPy array, in O(stop - start)
+    after a one-off O(N) pass for the first window of a 'random' grid.
+
+    Parameters
+    ----------
+    kind : String.
+        'random' for a sorted sample of N uniform points, 'jitter' for one uniform point in each of N equal cells of
+        xlim, or 'log' for N logarithmically spaced points (xlim must be positive). The random kinds are drawn from
+        the counter-based stream keyed by key, a tuple of two 64-bit integers.
+    """
+    lo, hi = xlim
+    i = np.arange(start, stop, dtype=float)
+
+    if kind == 'random':
+        return _random(xlim, N, start, stop, key)
+    elif kind == 'jitter':
+        i += _uniforms(key, start, stop)
+        i *= (hi - lo) / N
+        return i + lo
+    elif kind == 'log':
+        if not (lo > 0 and hi > 0):
+            raise GwydionError('Logarithmic grids need positive x limits.')
+
+        x = np.exp(np.log(lo) + i * ((np.log(hi) - np.log(lo)) / max(N - 1, 1)))
+        x[i == 0], x[i == N - 1] = lo, hi
+        return x
+
+    raise GwydionError('Grid must be one of {} or an array of x values.'.format(', '.join(KINDS)))
+
+
+def make(kind, xlim, N, dtype=None, xp=np, key=None):
+    """
+    Return a shared, read-only x-grid of the given kind (see window), with the same sharing as linspace.
+    """
+    if kind == 'uniform':
+        return linspace(xlim, N, dtype=dtype, xp=xp)
+
+    key = None if key is None else tuple(int(k) for k in key)
+    name = _key(kind, xlim, N, dtype) + (key,)
+
+    if xp is not np:
+        grid = make(kind, xlim, N, key=key)
+        dtype = None if dtype is None else getattr(xp, np.dtype(dtype).name)
+        return _intern(name + (xp.__name__,), lambda: xp.asarray(grid, dtype=dtype, copy=True))
+
+    return _intern(name, lambda: window(kind, xlim, N, 0, N, key).astype(dtype or float, copy=False))
+
+
+def cached():
+    """Return the number of grids currently held in the registry."""
+    with _lock:
+        return len(_registry)
@@ -0,0 +1,82 @@
+"""
+Fused kernels for the built-in functions.
+
+Each kernel computes func(x) + r for every point in a single (parallel) loop, setting negative values to zero when
+clip is True, and writes the result into out. Their parameters are the folded constants of the matching
+gwydion.plan.Plan. When numba is installed the kernels are JIT-compiled and Gwydion uses
+them in place of the NumPy implementations; otherwise they remain plain Python and are not used.
+
+numba's exp, sin and log may differ from NumPy's in the last bit, so an object evaluates its windows and chunks with
+the same kernel as its data, and the results are bit-identical to slices of the data.
+
+Gwydion leaves numba's configuration alone. The TBB threading layer can hang at exit if it is first started from a
+worker thread (e.g. in gwydion.aio or gwydion.serve); set NUMBA_THREADING_LAYER=omp in the environment to avoid it.
+"""
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+    jit = numba.njit(parallel=True, cache=True)
+    prange = numba.prange
+else:
+    def jit(f):
+        return f
+    prange = range
+
+ENABLED = numba is not None
+
+
+@jit
+def linear(x, r, clip, out, m, c):
+    for i in prange(x.shape[0]):
+        v = m * x[i] + c + r[i]
+        out[i] = 0.0 if clip and v < 0 else v
+    return out
+
+
+@jit
+def sine(x, r, clip, out, w, p, I):
+    for i in prange(x.shape[0]):
+        v = I * np.sin(w * x[i] + p) + r[i]
+        out[i] = 0.0 if clip and v < 0 else v
+    return out
+
+
+@jit
+def exponential(x, r, clip, out, c, I):
+    for i in prange(x.shape[0]):
+        v = I * np.exp(c * x[i]) + r[i]
+        out[i] = 0.0 if clip and v < 0 else v
+    return out
+
+
+@jit
+def logarithm(x, r, clip, out, k, scale):
+    for i in prange(x.shape[0]):
+        v = scale * np.log(k * x[i]) + r[i]
+        out[i] = 0.0 if clip and v < 0 else v
+    return out
+
+
+@jit
+def normal(x, r, clip, out, m, b, scale):
+    for i in prange(x.shape[0]):
+        v = scale * np.exp(b * (x[i] + m) ** 2) + r[i]
+        out[i] = 0.0 if clip and v < 0 else v
+    return out
+
+
+@jit
+def polynomial(x, r, clip, out, a):
+    n = a.shape[0]
+    for i in prange(x.shape[0]):
+        v = a[n - 1]
+        for j in range(n - 2, -1, -1):
+            v = v * x[i] + a[j]
+        v += r[i]
+        out[i] = 0.0 if clip and v < 0 else v
+    return out
@@ -0,0 +1,165 @@
+"""
+Pipelined output for the chunked generation paths.
+
+A Writer owns a small pool of chunk buffers and a background thread which writes filled buffers to disk. The
+generating thread fills one buffer while the previous one is being written, so computation and I/O overlap and the
+throughput approaches the slower of the two rather than their sum. Buffers are reused, so memory is constant:
+
+    >>>> with Writer('out.npy', shape=(N, 2), dtype='float64', chunk=2**16) as writer:
+    ....     for start in range(0, N, 2**16):
+    ....         buf = writer.buffer()                 # Blocks while both buffers are in use.
+    ....         n = fill(buf, start)                  # Generate rows start:start+n into buf[:n].
+    ....         writer.write(start, buf[:n], buf)     # Queue the rows and return buf to the pool once written.
+"""
+import queue
+import sys
+import threading
+
+import numpy as np
+
+from gwydion.exceptions import GwydionError
+
+FORMATS = ('npy', 'raw', 'memmap')
+
+
+class Writer(object):
+    """
+    Double-buffered background writer of an array of known shape, chunk by chunk along its first axis.
+
+    Parameters
+    ----------
+    path : String.
+        Output file. '-' writes to standard output (npy and raw formats only).
+    shape : Tuple of integers.
+        Shape of the whole array.
+    dtype : Data type.
+        Data type of the array.
+    fmt : String.
+        'npy' (default) streams a .npy file, 'raw' streams the C-ordered bytes with no header, and 'memmap' writes
+        into a memory-mapped .npy file, in which case chunks may be written in any order.
+    chunk : Integer or None.
+        Rows per buffer. If None, buffers of about 16 MB are used.
+    buffers : Integer.
+        Number of buffers, which is also the number of chunks which may be queued for writing. Defaults to 2.
+    """
+
+    def __init__(self, path, shape, dtype, fmt='npy', chunk=None, buffers=2):
+        if fmt not in FORMATS:
+            raise GwydionError('Format must be one of {}.'.format(', '.join(FORMATS)))
+        elif path == '-' and fmt == 'memmap':
+            raise GwydionError('A memmap cannot be written to standard output.')
+        elif buffers < 1:
+            raise GwydionError('buffers must be a positive integer.')
+
+        self.path = path
+        self.shape = tuple(int(n) for n in shape)
+        self.dtype = np.dtype(dtype)
+        self.fmt = fmt
+
+        row = int(np.prod(self.shape[1:], dtype=np.int64)) * self.dtype.itemsize
+        self.chunk = chunk or max(1, 2**24 // max(row, 1))
+
+        if fmt == 'memmap':
+            self._file = np.lib.format.open_memmap(path, mode='w+', dtype=self.dtype, shape=self.shape)
+        else:
+            self._file = sys.stdout.buffer if path == '-' else open(path, 'wb')
+            if fmt == 'npy':
+                header = {'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False,
+                          'shape': self.shape}
+                np.lib.format.write_array_header_2_0(self._file, header)
+
+        self._written = 0
+        self._error = None
+        self._closed = False
+
+        # Buffers are allocated on first use, up to the given number.
+        self._free = queue.Queue()
+        self._allocated = 0
+        self._buffers = buffers
+
+        self._queue = queue.Queue(maxsize=buffers)
+        self._thread = threading.Thread(target=self._run, name='gwydion-writer', daemon=True)
+        self._thread.start()
+
+    def buffer(self):
+        """Return a free buffer of shape (chunk, *shape[1:]), waiting for one to be written if necessary."""
+        self._check()
+
+        if self._free.empty() and self._allocated < self._buffers:
+            self._allocated += 1
+            return np.empty((self.chunk,) + self.shape[1:], dtype=self.dtype)
+
+        return self._free.get()
+
+    def write(self, start, rows, buffer=None):
+        """
+        Queue rows to be written at row start. If rows is (a view of) a buffer from Writer.buffer, pass the buffer so
+        that it is reused once written. Waits if the queue is full.
+        """
+        self._check()
+        self._queue.put((start, rows, buffer))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            start, rows, buffer = item
+            try:
+                if self._error is None:
+                    self._write(start, rows)
+            except Exception as e:
+                self._error = e
+            finally:
+                if buffer is not None:
+                    self._free.put(buffer)
+
+    def _write(self, start, rows):
+        if self.fmt == 'memmap':
+            self._file[start:start + len(rows)] = rows
+        elif start != self._written:
+            raise GwydionError('Rows must be written in order with the {} format.'.format(self.fmt))
+        else:
+            self._file.write(np.ascontiguousarray(rows, dtype=self.dtype).data)
+
+        self._written += len(rows)
+
+    def _check(self):
+        if self._closed:
+            raise GwydionError('The writer is closed.')
+        elif self._error is not None:
+            raise GwydionError('Writing to {} failed.'.format(self.path)) from self._error
+
+    def close(self):
+        """Wait for the queued rows to be written and close the file."""
+        if self._closed:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._closed = True
+
+        if self.fmt == 'memmap':
+            self._file.flush()
+        elif self.path == '-':
+            self._file.flush()
+        else:
+            self._file.close()
+        self._file = None
+
+        if self._error is not None:
+            raise GwydionError('Writing to {} failed.'.format(self.path)) from self._error
+        elif self.fmt != 'memmap' and self._written != self.shape[0]:
+            raise GwydionError('Expected {} rows but {} were written.'.format(self.shape[0], self._written))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        except GwydionError:
+            # An exception raised by the caller takes precedence.
+            if exc_type is None:
+                raise
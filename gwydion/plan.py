@@ -0,0 +1,93 @@
+from math import log
+from numbers import Real
+
+import numpy as np
+
+# Operations a plan can apply to the working array y. Binary operations take a constant, except 'xmul' which
+# multiplies by x itself.
+_UFUNCS = {'add': np.add,
+           'mul': np.multiply,
+           'xmul': np.multiply,
+           'square': np.square,
+           'sin': np.sin,
+           'exp': np.exp,
+           'log': np.log}
+
+_BINARY = {'add', 'mul', 'xmul'}
+
+
+class Plan(object):
+    """
+    Evaluation plan for a function of x.
+
+    A plan is a sequence of (operation, constant) steps compiled from an object's parameters, with every
+    parameter-only expression folded into the constants. Evaluating the plan with NumPy allocates a single output
+    array and applies each step to it in-place, so a function costs one ufunc pass per step and no temporaries. An
+    object compiles its plan the first time it is evaluated, and reuses it for every window, chunk and sweep until a
+    parameter changes.
+
+    Parameters
+    ----------
+    steps : List of tuples.
+        Each step is (operation, constant) for 'add' and 'mul', or (operation,) for 'xmul', 'square', 'sin', 'exp' and
+        'log'. The first step is applied to x.
+
+    Examples
+    --------
+
+    >>>> Plan([('mul', 2 * pi * f), ('add', p), ('sin',), ('mul', I)])  # I*sin(2*pi*f*x + p)
+    """
+
+    def __init__(self, steps):
+        for step in steps:
+            if step[0] not in _UFUNCS or len(step) != (2 if step[0] in _BINARY - {'xmul'} else 1):
+                raise ValueError('Invalid plan step {!r}.'.format(step))
+
+        self.steps = tuple(steps)
+
+    @property
+    def constants(self):
+        """The folded constants of the plan, in order."""
+        return tuple(step[1] for step in self.steps if len(step) == 2)
+
+    def __call__(self, x, xp=np):
+        if xp is not np:
+            return self._evaluate(x, xp)
+
+        y = x
+        for op, *c in self.steps:
+            ufunc = _UFUNCS[op]
+            args = (y, x if op == 'xmul' else c[0]) if op in _BINARY else (y,)
+
+            # y may be updated in-place once it is an array owned by the plan with the shape and dtype of the result.
+            if (y is not x and isinstance(y, np.ndarray) and np.result_type(*args) == y.dtype
+                    and np.broadcast(*args).shape == y.shape):
+                y = ufunc(*args, out=y)
+            else:
+                y = ufunc(*args)
+
+        return y
+
+    def _evaluate(self, x, xp):
+        y = x
+        for op, *c in self.steps:
+            if op == 'add':
+                y = y + c[0]
+            elif op == 'mul':
+                y = y * c[0]
+            elif op == 'xmul':
+                y = y * x
+            elif op == 'square':
+                y = y * y
+            else:
+                y = getattr(xp, op)(y)
+
+        return y
+
+    def __repr__(self):
+        return 'Plan({!r})'.format(list(self.steps))
+
+
+def ln(value, xp=np):
+    """Natural logarithm of a parameter, which is an array when swept."""
+    return log(value) if isinstance(value, Real) else xp.log(value)
@@ -0,0 +1,212 @@
+"""
+Downsampled plotting of large objects and batched plotting of many curves.
+
+A line plot cannot show more points than the axes have pixels, so Base.plot reduces the data to a budget of points
+before handing it to matplotlib:
+
+    minmax    The minimum and maximum of each of points/2 equal buckets, in x order. Preserves the envelope of the
+              data, including isolated spikes, and is the default.
+    lttb      Largest-Triangle-Three-Buckets: one point per bucket, chosen to keep the visual shape of the curve.
+
+The data is read bucket by bucket in consecutive windows of about chunk_size points, so an object which has not been
+evaluated is never materialized in full and memory is O(chunk_size). Sequential noise which has not been drawn is drawn
+window by window from a copy of the RNG, as in Base.write.
+
+    >>>> Sine(N=10**8, rand=0.1).plot()                             # 2 points per pixel of the axes.
+    >>>> x, y = downsample(obj, 1000, method='lttb')
+    >>>> plot_many([Sine(f=f, N=1000) for f in np.linspace(1, 2, 10**4)], linewidths=0.2)
+"""
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+from gwydion.exceptions import GwydionError
+
+METHODS = ('minmax', 'lttb')
+
+
+def _numpy(arr):
+    return arr if isinstance(arr, np.ndarray) else np.from_dlpack(arr)
+
+
+def _windows(obj, edges, chunk_size=None):
+    """
+    Yield (x, y, bounds) for consecutive windows of obj holding whole buckets [edges[i], edges[i + 1]), where bounds
+    are the edges of the buckets in the window relative to its start.
+    """
+    chunk_size = chunk_size or obj.chunk_size
+
+    ends = [0]
+    while ends[-1] < len(edges) - 1:
+        # A window ends on the last bucket edge within chunk_size points (and holds at least one bucket).
+        i = ends[-1]
+        ends.append(max(i + 1, int(np.searchsorted(edges, edges[i] + chunk_size, side='right')) - 1))
+
+    windows = obj._stream((edges[i], edges[j]) for i, j in zip(ends[:-1], ends[1:]))
+    for i, j, (x, y) in zip(ends[:-1], ends[1:], windows):
+        yield _numpy(x), _numpy(y), edges[i:j + 1] - edges[i]
+
+
+def _buckets(obj, edges, chunk_size=None):
+    """Yield the (x, y) data of each bucket [edges[i], edges[i + 1])."""
+    for x, y, bounds in _windows(obj, edges, chunk_size):
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            yield x[a:b], y[a:b]
+
+
+def _first(mask, starts):
+    # Index of the first True value of mask in each (non-empty) bucket beginning at starts.
+    index = np.where(mask, np.arange(len(mask)), len(mask))
+    first = np.minimum.reduceat(index, starts)
+
+    # Buckets of NaN have no minimum or maximum, and are represented by their first point.
+    return np.where(first == len(mask), starts, first)
+
+
+def minmax(obj, points, chunk_size=None):
+    """Return (x, y) reduced to the minimum and maximum of each of points // 2 buckets, in x order."""
+    n = max(points // 2, 1)
+    N = obj._length()
+    edges = np.linspace(0, N, min(n, N) + 1).astype(np.int64)
+
+    xs, ys = [], []
+    for x, y, bounds in _windows(obj, edges, chunk_size):
+        starts, lengths = bounds[:-1], np.diff(bounds)
+
+        lo = _first(y == np.repeat(np.minimum.reduceat(y, starts), lengths), starts)
+        hi = _first(y == np.repeat(np.maximum.reduceat(y, starts), lengths), starts)
+
+        index = np.column_stack([np.minimum(lo, hi), np.maximum(lo, hi)])
+        index = index.ravel()[np.column_stack([np.ones(len(lo), bool), lo != hi]).ravel()]
+
+        xs.append(x[index])
+        ys.append(y[index])
+
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+def lttb(obj, points, chunk_size=None):
+    """Return (x, y) reduced to points points with the Largest-Triangle-Three-Buckets algorithm."""
+    N = obj._length()
+    if points < 3:
+        raise GwydionError('LTTB needs at least 3 points.')
+
+    # The first and last points are kept, and the rest are split into points - 2 buckets.
+    middle = 1 + np.linspace(0, N - 2, points - 1).astype(np.int64)
+    edges = np.concatenate([[0], middle, [N]])
+
+    buckets = _buckets(obj, edges, chunk_size)
+    x, y = next(buckets)
+    xs, ys = [x[0]], [y[0]]
+
+    current = next(buckets)
+    for following in buckets:
+        # The point of the current bucket forming the largest triangle with the last kept point and the mean of the
+        # following bucket.
+        x, y = current
+        cx, cy = following[0].mean(), following[1].mean()
+        area = np.abs((xs[-1] - cx) * (y - ys[-1]) - (xs[-1] - x) * (cy - ys[-1]))
+        i = int(np.argmax(area))
+
+        xs.append(x[i])
+        ys.append(y[i])
+        current = following
+
+    x, y = current
+    xs.append(x[-1])
+    ys.append(y[-1])
+
+    return np.array(xs), np.array(ys)
+
+
+def downsample(obj, points, method='minmax', chunk_size=None):
+    """
+    Return (x, y) NumPy arrays of at most points points representing the data of obj.
+
+    Parameters
+    ----------
+    obj : Gwydion object.
+        Object to downsample.
+    points : Integer.
+        Budget of points, e.g. twice the width of the axes in pixels for minmax. If obj.N <= points, all of the data is
+        returned.
+    method : String.
+        'minmax' (default) or 'lttb'.
+    chunk_size : Integer or None.
+        Points read at a time. Defaults to obj.chunk_size.
+    """
+    if method not in METHODS:
+        raise GwydionError('Downsampling method must be one of {}.'.format(', '.join(METHODS)))
+    elif points < 1:
+        raise GwydionError('points must be a positive integer.')
+
+    if obj._length() <= points:
+        return tuple(_numpy(arr) for arr in obj[:])
+    elif method == 'lttb':
+        return lttb(obj, points, chunk_size)
+
+    return minmax(obj, points, chunk_size)
+
+
+def _budget(ax, points, method):
+    if points is not None:
+        return points
+
+    # Two points per horizontal pixel, which minmax needs to draw the envelope of each pixel column.
+    width = int(np.ceil(ax.get_window_extent().width))
+
+    return max(2 * width, 2) if method == 'minmax' else max(width, 3)
+
+
+def plot(obj, *args, ax=None, points=None, method='minmax', **kwargs):
+    """Plot obj on ax (a new figure if None), downsampled to points (or the width of the axes) unless method=None."""
+    if ax is None:
+        fig, ax = plt.subplots()
+
+    if method is None:
+        x, y = (_numpy(arr) for arr in obj.data)
+    else:
+        x, y = downsample(obj, _budget(ax, points, method), method)
+
+    ax.plot(x, y, *args, **kwargs)
+
+    return ax
+
+
+def plot_many(objs, ax=None, points=None, method='minmax', **kwargs):
+    """
+    Plot many objects as a single LineCollection, which is drawn far faster than one line per object.
+
+    Parameters
+    ----------
+    objs : Iterable of Gwydion objects.
+        Objects to plot.
+    ax : Matplotlib axes or None.
+        Axes to plot on. If None, a new figure is created.
+    points : Integer or None.
+        Budget of points per curve (see downsample). Defaults to twice the width of the axes in pixels.
+    method : String or None.
+        'minmax' (default), 'lttb', or None to plot all of the data.
+    kwargs :
+        Passed to matplotlib.collections.LineCollection, e.g. colors, linewidths or alpha.
+
+    Examples
+    --------
+
+    >>>> plot_many(generate_many([{'class': 'Sine', 'seed': i} for i in range(10**4)]), alpha=0.1)
+    """
+    if ax is None:
+        fig, ax = plt.subplots()
+
+    budget = None if method is None else _budget(ax, points, method)
+
+    segments = []
+    for obj in objs:
+        x, y = (_numpy(arr) for arr in obj.data) if method is None else downsample(obj, budget, method)
+        segments.append(np.column_stack([x, y]))
+
+    lines = LineCollection(segments, **kwargs)
+    ax.add_collection(lines)
+    ax.autoscale_view()
+
+    return ax
@@ -0,0 +1,231 @@
+"""
+Multi-resolution min/max/mean pyramids of generated data, for fast previews at any zoom.
+
+A pyramid is built in the same streaming pass that writes the data (see Base.write and gwydion generate --pyramid)
+and stored in a directory next to it, <path>.pyramid, holding meta.json and one memory-mapped .npy file per level.
+Level k summarizes blocks of factor**k consecutive points with the fields x (the x of the first point of the block),
+min, max and mean of y, down to a single block. With the default factor of 4, the pyramid is about two thirds of
+the size of the data.
+
+Any window of the data can then be previewed at a fixed cost, whatever its size, by reading the coarsest level which
+still has the requested number of blocks in the window:
+
+    >>>> Sine(N=10**9).write('sine.npy', fmt='memmap', pyramid=True)
+    >>>> preview = Pyramid('sine.npy').query(2 * 10**8, 6 * 10**8, bins=1000)
+    >>>> ax.fill_between(preview['x'], preview['min'], preview['max'])
+"""
+import json
+import os
+
+import numpy as np
+
+from gwydion.exceptions import GwydionError
+
+FACTOR = 4
+
+VERSION = 1
+
+
+def _directory(path):
+    return path if path.endswith('.pyramid') else path + '.pyramid'
+
+
+def _sizes(n, factor):
+    sizes = []
+    while not sizes or sizes[-1] > 1:
+        sizes.append(-(-n // factor**(len(sizes) + 1)))
+
+    return sizes
+
+
+def _reduce(x, mn, mx, sm, count, factor):
+    # Combine blocks of factor consecutive entries along the last axis; the last block may be partial.
+    starts = np.arange(0, x.shape[-1], factor)
+
+    return (x[..., starts],
+            np.minimum.reduceat(mn, starts, axis=-1),
+            np.maximum.reduceat(mx, starts, axis=-1),
+            np.add.reduceat(sm, starts, axis=-1),
+            np.add.reduceat(count, starts))
+
+
+class PyramidWriter(object):
+    """
+    Streaming builder of the pyramid of one curve, or of rows of curves of equal length.
+
+    Parameters
+    ----------
+    path : String.
+        Path of the data. The pyramid is written to the directory path + '.pyramid'.
+    n : Integer.
+        Number of points per curve.
+    dtype : Data type.
+        Data type of y. The mean has the same type if it is a floating type, and is float64 otherwise.
+    xdtype : Data type.
+        Data type of x.
+    rows : Integer or None.
+        Number of curves, written with write_rows, or None for a single curve written with append.
+    factor : Integer.
+        Number of blocks of one level combined into a block of the next. Defaults to 4.
+    """
+
+    def __init__(self, path, n, dtype, xdtype, rows=None, factor=FACTOR):
+        if path == '-':
+            raise GwydionError('A pyramid cannot be written next to standard output.')
+        elif factor < 2 or n < 1:
+            raise GwydionError('A pyramid needs a factor of at least 2 and at least one point.')
+
+        self.path = _directory(path)
+        self.n = n
+        self.rows = rows
+        self.factor = factor
+
+        dtype = np.dtype(dtype)
+        mean = dtype if dtype.kind == 'f' else np.dtype(np.float64)
+        self.dtype = np.dtype([('x', xdtype), ('min', dtype), ('max', dtype), ('mean', mean)])
+
+        os.makedirs(self.path, exist_ok=True)
+
+        self.levels = []
+        for k, size in enumerate(_sizes(n, factor), 1):
+            shape = (size,) if rows is None else (rows, size)
+            self.levels.append(np.lib.format.open_memmap(os.path.join(self.path, 'level{}.npy'.format(k)),
+                                                         mode='w+', dtype=self.dtype, shape=shape))
+
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump({'version': VERSION, 'n': n, 'rows': rows, 'factor': factor, 'levels': len(self.levels)}, f)
+
+        # Blocks of each level waiting for enough blocks to make the next one, and the number written.
+        self._pending = [None] * len(self.levels)
+        self._written = [0] * len(self.levels)
+
+    def append(self, x, y):
+        """Add the next points of a single curve."""
+        if self.rows is not None:
+            raise GwydionError('Rows of curves must be added with write_rows.')
+
+        y = np.asarray(y)[None]
+        self._push(0, (np.asarray(x)[None], y, y, y.astype(self.dtype['mean']), np.ones(y.shape[-1], np.int64)))
+
+    def _push(self, k, blocks):
+        # Reduce the complete groups of factor blocks of level k (level 0 being the points) into level k + 1.
+        if self._pending[k] is not None:
+            blocks = [np.concatenate([old, new], axis=-1) for old, new in zip(self._pending[k], blocks)]
+
+        # The remainder is copied, as the points may be in a buffer which is about to be reused.
+        full = blocks[0].shape[-1] // self.factor * self.factor
+        self._pending[k] = [b[..., full:].copy() for b in blocks]
+
+        if full:
+            self._store(k, _reduce(*(b[..., :full] for b in blocks), self.factor))
+
+    def _store(self, k, blocks):
+        x, mn, mx, sm, count = blocks
+        stop = self._written[k] + x.shape[-1]
+
+        out = self.levels[k][self._written[k]:stop]
+        out['x'], out['min'], out['max'], out['mean'] = x[0], mn[0], mx[0], sm[0] / count
+        self._written[k] = stop
+
+        if k + 1 < len(self.levels):
+            self._push(k + 1, blocks)
+
+    def write_rows(self, start, x, y):
+        """Write the complete pyramids of the curves start:start + len(y), given x and y of shape (rows, n)."""
+        if self.rows is None:
+            raise GwydionError('A single curve must be added with append.')
+
+        y = np.asarray(y)
+        blocks = (np.asarray(x), y, y, y.astype(self.dtype['mean']), np.ones(y.shape[-1], np.int64))
+
+        for level in self.levels:
+            blocks = _reduce(*blocks, self.factor)
+            out = level[start:start + len(y)]
+            out['x'], out['min'], out['max'], out['mean'] = blocks[0], blocks[1], blocks[2], blocks[3] / blocks[4]
+
+    def close(self):
+        """Reduce the partial blocks at the end of a single curve, and flush the pyramid to disk."""
+        if self.rows is None:
+            for k in range(len(self.levels)):
+                pending = self._pending[k]
+                self._pending[k] = None
+
+                if pending is not None and pending[0].shape[-1]:
+                    self._store(k, _reduce(*pending, self.factor))
+
+            if self._written != [len(level) for level in self.levels]:
+                raise GwydionError('Expected {} points in the pyramid.'.format(self.n))
+
+        for level in self.levels:
+            level.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+class Pyramid(object):
+    """
+    Reader of a pyramid written with the data at path.
+
+    Parameters
+    ----------
+    path : String.
+        Path of the data, or of the .pyramid directory.
+
+    Attributes
+    ----------
+    n : Integer.
+        Number of points per curve.
+    rows : Integer or None.
+        Number of curves, or None for a single curve.
+    factor : Integer.
+        Blocks of level k hold factor**k points.
+    levels : List of arrays.
+        Memory-mapped structured arrays with fields x, min, max and mean, from the finest level (1) to the coarsest.
+    """
+
+    def __init__(self, path):
+        self.path = _directory(path)
+
+        try:
+            with open(os.path.join(self.path, 'meta.json')) as f:
+                meta = json.load(f)
+        except OSError as e:
+            raise GwydionError('No pyramid found at {}.'.format(self.path)) from e
+
+        if meta.get('version') != VERSION:
+            raise GwydionError('Unsupported pyramid version {!r}.'.format(meta.get('version')))
+
+        self.n, self.rows, self.factor = meta['n'], meta['rows'], meta['factor']
+        self.levels = [np.load(os.path.join(self.path, 'level{}.npy'.format(k)), mmap_mode='r')
+                       for k in range(1, meta['levels'] + 1)]
+
+    def level(self, start, stop, bins):
+        """Return the coarsest level with at least bins blocks in the points [start, stop), or else level 1."""
+        k = 1
+        while k < len(self.levels) and (stop - start) // self.factor**(k + 1) >= bins:
+            k += 1
+
+        return k
+
+    def query(self, start=0, stop=None, bins=1000, row=None):
+        """
+        Return the blocks covering the points [start, stop) of the curve (or of curve row) from the coarsest level
+        with at least bins blocks in the window, as a structured array with fields x, min, max and mean. At most
+        about factor * bins blocks are read, whatever the size of the window.
+        """
+        stop = self.n if stop is None else min(stop, self.n)
+        if not 0 <= start < stop:
+            raise GwydionError('The window must contain at least one point.')
+        elif (row is None) != (self.rows is None):
+            raise GwydionError('row must be given if, and only if, the pyramid holds many curves.')
+
+        k = self.level(start, stop, bins)
+        size = self.factor**k
+        level = self.levels[k - 1] if row is None else self.levels[k - 1][row]
+
+        return np.array(level[start // size:-(-stop // size)])
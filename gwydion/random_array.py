@@ -1,38 +1,191 @@
-from inspect import getfullargspec
+from concurrent.futures import ThreadPoolExecutor
+from math import prod
 
 import numpy as np
+try:
+    import scipy.sparse as sp
+except ImportError:
+    pass
+
+from gwydion.backend import current
+from gwydion.exceptions import GwydionError
+
+
+def _sample(rng, size, k):
+    """Sorted sample of k distinct integers from range(size), in O(k) time and memory."""
+    if 2 * k > size:
+        # The complement is the smaller sample, and size < 2 * k.
+        keep = np.ones(size, dtype=bool)
+        keep[_sample(rng, size, size - k)] = False
+        return np.flatnonzero(keep)
+
+    # Draw about enough integers with replacement to find k distinct ones, adding more until there are, then keep a
+    # random k of them. By symmetry, every subset of k integers is equally likely.
+    flat = np.empty(0, dtype=np.int64)
+    while len(flat) < k:
+        n = int(-size * np.log1p(-k / size) * 1.05) + 64
+        flat = np.sort(np.concatenate([flat, rng.integers(0, size, n, dtype=np.int64)]))
+        flat = flat[np.concatenate([[True], flat[1:] != flat[:-1]])]
+
+    if len(flat) > k:
+        flat = np.sort(flat[rng.permutation(len(flat))[:k]])
+
+    return flat
+
 
 class _RandomArray(object):
 
-    def __init__(self, shape, lims=(0, 10), seed=None):
-        super().__init__()
+    # The array is drawn in blocks of this many values, each from its own generator spawned from the seed, so that
+    # blocks can be filled in parallel and the result does not depend on the number of threads.
+    block = 2**16
 
-        if seed is not None:
-            np.random.seed(seed)
+    def __init__(self, shape, lims=(0, 10), seed=None, dtype='float64'):
+        super().__init__()
 
         if isinstance(shape, int):
             self.shape = (shape,)
         elif isinstance(shape, (list, tuple)):
-            self.shape = shape
+            self.shape = tuple(shape)
         else:
-            raise Exception('Shape parameter incorrect. Must be integer (for 1D array) or tuple or lengths (for n-dimensional).')
+            raise GwydionError('Shape parameter incorrect. Must be integer (for 1D array) or tuple or lengths (for '
+                               'n-dimensional).')
 
         self.lims = lims
 
         if self.lims[0] > self.lims[1]:
-            raise Exception('Limits incorrect. Cannot have a minimum value greater than maximum value.')
+            raise GwydionError('Limits incorrect. Cannot have a minimum value greater than maximum value.')
+
+        self.dtype = np.dtype(dtype)
+
+        if self.dtype.kind not in 'iuf':
+            raise GwydionError('dtype must be a floating point or integer type.')
+        elif self.dtype.kind in 'iu' and self.lims[0] == self.lims[1]:
+            raise GwydionError('Limits incorrect. Integer arrays need a maximum value greater than the minimum.')
+
+        # Unlike np.random.seed, this leaves the global random state untouched.
+        self.seed = np.random.SeedSequence(seed)
 
     @staticmethod
     def interpolate(x, min, max):
-        return (x * (max-min)) + min
+        # Scale x from [0, 1) to [min, max) in-place.
+        x *= (max - min)
+        x += min
+
+        return x
+
+    def _generator(self, i):
+        seed = np.random.SeedSequence(self.seed.entropy, spawn_key=self.seed.spawn_key + (i,))
+
+        return np.random.Generator(np.random.PCG64(seed))
+
+    def _fill_block(self, flat, i):
+        rng = self._generator(i)
+        chunk = flat[i * self.block:(i + 1) * self.block]
+        lo, hi = self.lims
+
+        if self.dtype.kind in 'iu':
+            chunk[...] = rng.integers(lo, hi, size=len(chunk), dtype=self.dtype)
+        elif self.dtype in (np.float32, np.float64):
+            rng.random(out=chunk, dtype=self.dtype)
+            self.interpolate(chunk, lo, hi)
+        else:
+            chunk[...] = self.interpolate(rng.random(len(chunk)), lo, hi)
+
+    def fill(self, out=None, threads=None):
+        if out is None:
+            out = np.empty(self.shape, dtype=self.dtype)
+        elif not isinstance(out, np.ndarray) or out.shape != self.shape or out.dtype != self.dtype:
+            raise GwydionError('out must be an array of shape {} and dtype {}.'.format(self.shape, self.dtype))
+        elif not out.flags.c_contiguous or not out.flags.writeable:
+            raise GwydionError('out must be a writeable, C-contiguous array.')
+
+        flat = out.reshape(-1)
+        blocks = range(-(-flat.size // self.block))
+        threads = threads or current()['threads']
+
+        if threads > 1 and len(blocks) > 1:
+            with ThreadPoolExecutor(min(threads, len(blocks))) as pool:
+                list(pool.map(lambda i: self._fill_block(flat, i), blocks))
+        else:
+            for i in blocks:
+                self._fill_block(flat, i)
+
+        return out
+
+    def sparse(self, density, format='coo', threads=None):
+        # Sample the flat indices of the nonzero values without replacement in O(nnz) (see _sample), then draw the
+        # values as a dense array of length nnz. The dense shape is never allocated.
+        if not 0 <= density <= 1:
+            raise GwydionError('density must be between 0 and 1.')
+        elif format not in ('coo', 'csr'):
+            raise GwydionError("format must be 'coo' or 'csr'.")
+        elif format == 'csr' and len(self.shape) != 2:
+            raise GwydionError('CSR arrays must be 2D.')
+
+        size = prod(self.shape)
+        nnz = int(round(density * size))
+
+        seeds = [np.random.SeedSequence(self.seed.entropy, spawn_key=self.seed.spawn_key + (i,)) for i in (0, 1)]
+
+        flat = _sample(np.random.Generator(np.random.PCG64(seeds[1])), size, nnz)
+        coords = np.unravel_index(flat, self.shape)
+
+        values = _RandomArray(nnz, lims=self.lims, dtype=self.dtype)
+        values.seed = seeds[0]
+        values = values.fill(threads=threads)
+
+        if format == 'csr':
+            rows, cols = coords
+            indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=self.shape[0]))])
+            return sp.csr_array((values, cols, indptr), shape=self.shape)
+
+        return sp.coo_array((values, coords), shape=self.shape)
 
     @property
     def arr(self):
-        arr = np.random.random(self.shape)
-        return _RandomArray.interpolate(arr, *self.lims)
+        return self.fill()
+
+
+def RandomArray(shape, lims=(0, 10), seed=None, dtype='float64', out=None, threads=None, density=None,
+                format='coo'):
+    """
+    Array of uniformly distributed random numbers in [lims[0], lims[1]), or a sparse array of them.
+
+    Parameters
+    ----------
+    shape : Integer or tuple of integers.
+        Shape of the array.
+    lims : Tuple of floats or integers.
+        (Min, Max) values of the array. Defaults to (0, 10).
+    seed : Integer or None.
+        Used to seed the RNG if repeatable results are required. Defaults to None (and thus no seeding).
+    dtype : String or dtype.
+        Floating point or integer dtype of the array, drawn directly in that type. Defaults to 'float64'.
+    out : Array or None.
+        C-contiguous array of the given shape and dtype to fill in-place. If None, a new array is returned.
+    threads : Integer or None.
+        Number of threads filling the array. If None, taken from gwydion.config. The values for a given seed are the
+        same for any number of threads.
+    density : Float or None.
+        If given, return a scipy.sparse array with round(density * size) nonzero values at uniformly random positions.
+        The positions and values are sampled directly, in O(nnz) memory. Defaults to None (a dense array).
+    format : String.
+        Format of sparse arrays, 'coo' (default) or 'csr' (2D only).
+
+    Examples
+    --------
 
+    >>>> RandomArray(10)  # 10 floats between 0 and 10.
+    >>>> RandomArray((100, 100), lims=(-1, 1), dtype='float32')  # 2D float32 array.
+    >>>> RandomArray(10, lims=(1, 7), dtype='int8')  # Dice rolls.
+    >>>> RandomArray(10**9, seed=1234, out=buf, threads=8)  # Fill a large buffer in parallel.
+    >>>> RandomArray((10**6, 10**6), density=1e-6, format='csr')  # Sparse matrix with 10**6 nonzero values.
+    """
+    arr = _RandomArray(shape, lims=lims, seed=seed, dtype=dtype)
 
-def RandomArray(shape, lims=(0, 10), seed=None):
-    arr = _RandomArray(shape, lims=lims, seed=seed)
+    if density is not None:
+        if out is not None:
+            raise GwydionError('out cannot be used with sparse arrays.')
+        return arr.sparse(density, format=format, threads=threads)
 
-    return arr.arr
+    return arr.fill(out=out, threads=threads)
@@ -0,0 +1,387 @@
+"""
+Local HTTP generation server.
+
+Run with `gwydion serve --port 8000` (or serve() from Python) and request data with a JSON spec (see
+gwydion.spec):
+
+    POST /generate?format=npy     body: {"class": "Sine", "N": 1000, "seed": 42, "params": {"f": 2.0}}
+    GET  /metrics                 request counts, throughput and latency as JSON
+    GET  /health
+
+The response to /generate is a .npy file holding a structured array with fields x and y (as returned by to_records),
+or with format=arrow an Arrow IPC stream with columns x and y (requires pyarrow).
+
+Identical concurrent requests are coalesced into a single evaluation, and seeded responses are kept in an LRU cache.
+Requests arriving within batch_window seconds of each other for the same class, N and xlim are evaluated together as
+one vectorized plan, unless the class is evaluated by a fused kernel (see gwydion.kernels). Batched or not, a spec
+gives the same payload. Specs without a seed are random by definition and so are never coalesced or cached.
+
+Invalid specs are answered with status 400 and any other failure with 500, both with a JSON body {"error": message}.
+"""
+import argparse
+import io
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from gwydion.exceptions import GwydionError
+from gwydion.plan import Plan
+from gwydion.spec import build, normalize
+
+FORMATS = {'npy': 'application/octet-stream',
+           'arrow': 'application/vnd.apache.arrow.stream'}
+
+_COUNTERS = ('requests', 'errors', 'cache_hits', 'coalesced', 'batches', 'batched', 'points')
+
+
+class Service(object):
+    """
+    Generates payloads for specs, coalescing, batching and caching requests. Used by the HTTP server, and safe to
+    call from many threads.
+
+    Parameters
+    ----------
+    cache_size : Integer.
+        Maximum number of payloads kept in the LRU cache. Defaults to 128.
+    batch_window : Float.
+        Seconds to wait for similar requests before evaluating a batch. Defaults to 0.002.
+    max_batch : Integer.
+        Maximum number of requests evaluated in one batch. Defaults to 64.
+    workers : Integer or None.
+        Number of threads evaluating batches. If None, defaults to the number of CPUs.
+
+    Examples
+    --------
+
+    >>>> service = Service()
+    >>>> payload = service.generate({'class': 'Sine', 'N': 1000, 'seed': 42})
+    >>>> np.load(io.BytesIO(payload))['y']
+    """
+
+    def __init__(self, cache_size=128, batch_window=0.002, max_batch=64, workers=None):
+        self.cache_size = cache_size
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        self._counters = dict.fromkeys(_COUNTERS, 0)
+        self._latency = deque(maxlen=1024)
+        self._started = time.monotonic()
+
+        self._queue = queue.Queue()
+        self._pool = ThreadPoolExecutor(workers or os.cpu_count() or 1)
+        self._batcher = threading.Thread(target=self._batch_loop, name='gwydion-batcher', daemon=True)
+        self._batcher.start()
+
+    def generate(self, spec, fmt='npy'):
+        """Return the payload for spec as bytes, in format fmt ('npy' or 'arrow')."""
+        start = time.perf_counter()
+        self._count('requests')
+
+        try:
+            return self._generate(spec, fmt)
+        except Exception:
+            self._count('errors')
+            raise
+        finally:
+            with self._lock:
+                self._latency.append(time.perf_counter() - start)
+
+    def _generate(self, spec, fmt):
+        if fmt not in FORMATS:
+            raise GwydionError('Format must be one of {}.'.format(', '.join(FORMATS)))
+        elif fmt == 'arrow' and pa is None:
+            raise GwydionError('Arrow payloads require pyarrow.')
+
+        spec = normalize(spec)
+        if spec.get('seed') is None:
+            return self._encode(self._evaluate(build(spec)), fmt)
+
+        key = (json.dumps(spec, sort_keys=True), fmt)
+        owner = False
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._counters['cache_hits'] += 1
+                return self._cache[key]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self._counters['coalesced'] += 1
+            else:
+                future = self._inflight[key] = Future()
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            payload = self._encode(self._evaluate(build(spec)), fmt)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._cache[key] = payload
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            del self._inflight[key]
+
+        future.set_result(payload)
+
+        return payload
+
+    def _evaluate(self, obj):
+        future = Future()
+        self._queue.put((obj, future))
+
+        return future.result()
+
+    def _batch_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            items = [item]
+            deadline = time.monotonic() + self.batch_window
+            while len(items) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    self._queue.put(None)
+                    break
+                items.append(item)
+
+            groups = defaultdict(list)
+            for obj, future in items:
+                try:
+                    groups[_group(obj)].append((obj, future))
+                except Exception as e:
+                    future.set_exception(e)
+
+            for group in groups.values():
+                self._pool.submit(self._run, group)
+
+    def _run(self, group):
+        objs = [obj for obj, _ in group]
+
+        if len(objs) > 1:
+            try:
+                _evaluate_batch(objs)
+            except Exception:
+                # Fall back to evaluating each object on its own.
+                for obj in objs:
+                    obj._y = None
+            else:
+                self._count('batches')
+                self._count('batched', len(objs))
+
+        for obj, future in group:
+            try:
+                obj.data
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                self._count('points', len(obj.x))
+                future.set_result(obj)
+
+    @staticmethod
+    def _encode(obj, fmt):
+        if fmt == 'arrow':
+            table = obj.to_arrow()
+
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+
+            return sink.getvalue().to_pybytes()
+
+        buf = io.BytesIO()
+        np.save(buf, obj.to_records())
+
+        return buf.getvalue()
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def metrics(self):
+        """Return a dict of request counts, throughput and latency percentiles (in seconds)."""
+        with self._lock:
+            counters = dict(self._counters)
+            latency = np.array(self._latency)
+
+        uptime = time.monotonic() - self._started
+
+        return dict(counters,
+                    uptime=uptime,
+                    cache_size=len(self._cache),
+                    requests_per_second=counters['requests'] / uptime,
+                    points_per_second=counters['points'] / uptime,
+                    latency={'mean': float(latency.mean()) if len(latency) else 0.0,
+                             'p50': float(np.percentile(latency, 50)) if len(latency) else 0.0,
+                             'p99': float(np.percentile(latency, 99)) if len(latency) else 0.0})
+
+    def close(self):
+        """Stop the batcher and worker threads."""
+        self._queue.put(None)
+        self._batcher.join()
+        self._pool.shutdown()
+
+
+def _group(obj):
+    # Objects which can share a vectorized evaluation: planned NumPy functions with the same x-data. Random grids are
+    # the same only for the same seed. Objects evaluated by a fused kernel are not batched, as the kernel and the plan
+    # may differ in the last bit and a spec must give the same payload whether or not it is batched.
+    random = obj.grid in ('random', 'jitter') if isinstance(obj.grid, str) else None
+    if obj.xp is not np or obj.plan is None or random is None or (random and obj.seed is None):
+        return id(obj)
+    elif obj._fused_kernel(obj.x) is not None:
+        return id(obj)
+
+    return type(obj), obj.N, tuple(obj.xlim), obj.dtype, obj.grid, obj.seed if random else None
+
+
+def _evaluate_batch(objs):
+    """
+    Evaluate the plans of objects differing only in their constants at once, storing the results as their func
+    values. Each object's plan is compiled on its own and its constants stacked, so the results are bit-identical to
+    evaluating the objects one by one.
+    """
+    plans = [obj.plan for obj in objs]
+    if len({tuple(step[0] for step in plan.steps) for plan in plans}) > 1:
+        raise GwydionError('Only plans with the same steps can be batched.')
+
+    x = objs[0].x
+    steps = []
+    for k, step in enumerate(plans[0].steps):
+        values = [plan.steps[k][1] for plan in plans] if len(step) == 2 else None
+        if values is not None and len(set(values)) > 1:
+            step = (step[0], np.array(values, dtype=x.dtype)[:, None])
+        steps.append(step)
+
+    f = Plan(steps)(x)
+
+    for i, obj in enumerate(objs):
+        obj._y = obj._asarray(f[i] if f.ndim == 2 else f)
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+
+        if path == '/metrics':
+            self._json(200, self.server.service.metrics())
+        elif path == '/health':
+            self._json(200, {'status': 'ok'})
+        else:
+            self._json(404, {'error': 'Not found.'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/generate':
+            return self._json(404, {'error': 'Not found.'})
+
+        fmt = parse_qs(url.query).get('format', ['npy'])[0]
+        if fmt == 'arrow' and pa is None:
+            return self._json(501, {'error': 'Arrow payloads require pyarrow.'})
+
+        try:
+            spec = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except ValueError:
+            return self._json(400, {'error': 'The request body must be a JSON spec.'})
+
+        try:
+            payload = self.server.service.generate(spec, fmt)
+        except GwydionError as e:
+            return self._json(400, {'error': str(e)})
+        except Exception:
+            return self._json(500, {'error': 'Internal server error.'})
+
+        self.send_response(200)
+        self.send_header('Content-Type', FORMATS[fmt])
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+
+        view = memoryview(payload)
+        for start in range(0, len(view), 2**16):
+            self.wfile.write(view[start:start + 2**16])
+
+    def _json(self, status, body):
+        data = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host='127.0.0.1', port=8000, service=None, verbose=False):
+    """
+    Return a ThreadingHTTPServer serving Gwydion data (call its serve_forever method to start it). port=0 picks a
+    free port, available as server.server_port.
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.service = service or Service()
+    server.verbose = verbose
+
+    return server
+
+
+def serve(host='127.0.0.1', port=8000, verbose=False, **kwargs):
+    """Serve Gwydion data over HTTP until interrupted. Keyword arguments are passed to Service."""
+    server = make_server(host, port, Service(**kwargs), verbose=verbose)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='gwydion serve', description='Serve Gwydion data over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-size', type=int, default=128)
+    parser.add_argument('--batch-window', type=float, default=0.002)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    serve(args.host, args.port, verbose=args.verbose, cache_size=args.cache_size, batch_window=args.batch_window,
+          workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
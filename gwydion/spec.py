@@ -0,0 +1,248 @@
+"""
+JSON-compatible specifications of Gwydion objects.
+
+A spec is a dict naming a class and its arguments, e.g.
+
+    {"class": "Sine", "N": 1000, "seed": 42, "dtype": "float32", "params": {"f": 2.0}}
+
+Only "class" is required. "N", "xlim", "rand" and "seed" are passed to the constructor with the function parameters in
+"params", "dtype" is applied with gwydion.config, and "noise" and "grid" set the noise mode and x-grid (see Base). The
+operands of a Composite are given as nested specs.
+
+Objects are pickled as a smaller, Python-only state (see to_state), which holds the class itself and the constructor
+arguments as they were given rather than JSON values, with the seed or, for unseeded objects, the entropy the RNG was
+seeded from. The receiver replays the constructor, so that the RNG is in the same position, and computes the data
+lazily. Objects whose RNG has been used other than to draw the noise (e.g. by sample, or by the draws of a discrete
+distribution) cannot be replayed, and are pickled in full.
+"""
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from inspect import Parameter, signature
+from numbers import Real
+
+import numpy as np
+
+from gwydion.backend import config
+from gwydion.exceptions import GwydionError
+from gwydion.grid import KINDS
+
+KEYS = ('class', 'N', 'xlim', 'rand', 'seed', 'dtype', 'noise', 'grid', 'params')
+
+STATE_VERSION = 1
+
+# Attributes which are restored as they are, in addition to the function parameters.
+_STATE_ATTRS = ('N', 'xlim', 'rand', 'seed', 'noise', 'grid', 'backend', 'dtype', 'threads', 'chunk_size',
+                'allow_negative_y')
+
+
+def classes():
+    """Return a dict of the Gwydion classes which can be built from a spec, by name."""
+    import gwydion
+    import gwydion.stats
+    from gwydion.base import Base
+
+    return {name: cls for module in (gwydion, gwydion.stats) for name, cls in vars(module).items()
+            if isinstance(cls, type) and issubclass(cls, Base) and not name.startswith('_')}
+
+
+def normalize(spec):
+    """
+    Return a validated copy of spec with canonical types, suitable as a cache key once serialised with sort_keys.
+    """
+    if not isinstance(spec, dict):
+        raise GwydionError('A spec must be a dict.')
+
+    for key in spec:
+        if key not in KEYS:
+            raise GwydionError('Unknown spec key {!r}.'.format(key))
+
+    if spec.get('class') not in classes():
+        raise GwydionError('Unknown class {!r}.'.format(spec.get('class')))
+
+    params = spec.get('params', {})
+    if not isinstance(params, dict):
+        raise GwydionError('Spec params must be a dict.')
+
+    spec = dict(spec, params=dict(params))
+    xlim = spec.get('xlim')
+    if xlim is not None:
+        if not (isinstance(xlim, (list, tuple)) and len(xlim) == 2 and all(isinstance(v, Real) for v in xlim)):
+            raise GwydionError('Spec xlim must be a pair of numbers.')
+        spec['xlim'] = list(xlim)
+
+    for key in ('N', 'seed'):
+        if spec.get(key) is not None and (not isinstance(spec[key], Real) or spec[key] != int(spec[key])):
+            raise GwydionError('Spec {} must be an integer.'.format(key))
+        elif spec.get(key) is not None:
+            spec[key] = int(spec[key])
+
+    grid = spec.get('grid')
+    if isinstance(grid, (list, tuple)):
+        spec['grid'] = [float(v) for v in grid]
+    elif grid is not None and grid not in KINDS:
+        raise GwydionError('Spec grid must be one of {} or a list of x values.'.format(', '.join(KINDS)))
+
+    if spec.get('dtype') is not None:
+        try:
+            spec['dtype'] = np.dtype(spec['dtype']).name
+        except TypeError as e:
+            raise GwydionError('Unknown dtype {!r}.'.format(spec['dtype'])) from e
+
+    return spec
+
+
+def build(spec):
+    """Return the Gwydion object described by spec."""
+    spec = normalize(spec)
+
+    cls = classes()[spec['class']]
+    kwargs = {key: spec[key] for key in ('N', 'xlim', 'rand', 'seed') if key in spec}
+    if kwargs.get('xlim') is not None:
+        kwargs['xlim'] = tuple(kwargs['xlim'])
+
+    params = {key: build(val) if isinstance(val, dict) and 'class' in val else val
+              for key, val in spec['params'].items()}
+
+    try:
+        with config(**({'dtype': spec['dtype']} if spec.get('dtype') is not None else {})):
+            obj = cls(**kwargs, **params)
+    except GwydionError:
+        raise
+    except Exception as e:
+        raise GwydionError('Unable to build {} from spec: {}'.format(spec['class'], e)) from e
+
+    if 'noise' in spec:
+        obj.noise = spec['noise']
+    if 'grid' in spec:
+        obj.grid = spec['grid']
+
+    return obj
+
+
+def generate_many(specs, threads=None):
+    """
+    Build and evaluate many objects concurrently in a thread pool.
+
+    Parameters
+    ----------
+    specs : Iterable of dicts or Gwydion objects.
+        Specs of the objects. Objects are evaluated as they are.
+    threads : Integer or None.
+        Number of threads. If None, defaults to the number of CPUs.
+
+    Returns
+    -------
+    List of the objects, in the order of specs, with their data computed. Each thread runs in a copy of the caller's
+    gwydion.config, and the objects share no mutable state, so the results are the same as building them in turn.
+    An object may also be read from many threads: its noise and y-data are computed once under a per-object lock,
+    the other caches (x, the plan and the counter-based noise key) are deterministic, and windows with counter-based
+    noise share no state.
+
+    Examples
+    --------
+
+    >>>> objs = generate_many([{'class': 'Sine', 'N': 10**5, 'seed': i} for i in range(1000)], threads=8)
+    """
+    from gwydion.base import Base
+
+    context = contextvars.copy_context()
+
+    def generate(spec):
+        obj = spec if isinstance(spec, Base) else build(spec)
+        obj.data
+
+        return obj
+
+    with ThreadPoolExecutor(threads or os.cpu_count() or 1) as pool:
+        return list(pool.map(lambda spec: context.copy().run(generate, spec), specs))
+
+
+def to_spec(obj):
+    """
+    Return the spec which rebuilds obj, made from the arguments it was constructed with. Parameters left as None (and
+    so drawn at random) stay None, so the seed reproduces them. Attributes changed after construction are not included;
+    see parameters for the values actually in use.
+    """
+    args, kwargs = obj._init_args
+    arguments = signature(type(obj)).bind(*args, **kwargs).arguments
+
+    for name, p in signature(type(obj)).parameters.items():
+        if p.kind == Parameter.VAR_KEYWORD:
+            arguments.update(arguments.pop(name, {}))
+
+    spec = {'class': type(obj).__name__}
+    spec.update({key: plain(arguments.pop(key)) for key in ('N', 'xlim', 'rand', 'seed') if key in arguments})
+    spec['params'] = {key: plain(val) for key, val in arguments.items()}
+
+    if obj.dtype is not None:
+        spec['dtype'] = np.dtype(obj.dtype).name
+    if obj.noise != 'sequential':
+        spec['noise'] = obj.noise
+    if not isinstance(obj.grid, str) or obj.grid != 'uniform':
+        spec['grid'] = plain(obj.grid)
+
+    return spec
+
+
+def parameters(obj):
+    """Return a dict of the resolved function parameters of obj."""
+    return {name: plain(getattr(obj, name)) for name in obj._parameters() if hasattr(obj, name)}
+
+
+def plain(value):
+    """Convert value to JSON-compatible Python types."""
+    from gwydion.base import Base
+
+    if isinstance(value, Base):
+        return to_spec(value)
+    elif isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    elif isinstance(value, (list, tuple)):
+        return [plain(v) for v in value]
+
+    return value
+
+
+def to_state(obj):
+    """
+    Return the pickled state of obj: a dict of the state version, the class, the constructor arguments, the entropy of
+    the RNG of unseeded objects, and the current values of the parameters and settings. Its size does not depend on N.
+    """
+    from gwydion.base import Base
+
+    args, kwargs = obj._init_args
+
+    names = _STATE_ATTRS + tuple(obj._parameters())
+    # Operands of a Composite are the copies it made of them, which are pickled with the constructor arguments.
+    attrs = {name: vars(obj)[name] for name in names
+             if name in vars(obj) and not isinstance(vars(obj)[name], Base)}
+
+    state = {'version': STATE_VERSION, 'class': type(obj), 'args': args, 'kwargs': kwargs, 'attrs': attrs}
+    if '_entropy' in vars(obj):
+        state['entropy'] = obj._entropy
+
+    return state
+
+
+def _construct(state):
+    """Replay the constructor of to_state(obj), with the RNG of obj as the constructor left it."""
+    from gwydion.base import _ENTROPY
+
+    token = _ENTROPY.set(state.get('entropy'))
+    try:
+        return state['class'](*state['args'], **state['kwargs'])
+    finally:
+        _ENTROPY.reset(token)
+
+
+def from_state(state):
+    """Rebuild an object from to_state(obj). The data of the object is computed when it is first used."""
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        raise GwydionError('Unsupported Gwydion state; expected version {}.'.format(STATE_VERSION))
+
+    obj = _construct(state)
+    for name, value in state['attrs'].items():
+        setattr(obj, name, value)
+
+    return obj
@@ -1,4 +1,8 @@
-from gwydion.base import np, Base, ProbDist
+from math import pi, sqrt
+
+from gwydion import kernels
+from gwydion.base import Base, ProbDist
+from gwydion.plan import Plan
 from gwydion.exceptions import GwydionError
 
 
@@ -34,6 +38,7 @@ class Normal(ProbDist):
     >>>> Normal(seed=1234)  # Seeded RNG.
     """
 
+    _array_api = True
 
     def __init__(self, N=100, mu=None, sigma=None, xlim=None, rand=0.02, seed=None, allow_negative_y=True):
         super().__init__(N=N,
@@ -64,9 +69,15 @@ class Normal(ProbDist):
             self.xlim = (self.mu - n*self.sigma, self.mu + n*self.sigma)
 
     def func(self, x):
+        return self.plan(x, self.xp)
+
+    def _compile_plan(self):
         mu, sigma = self.mu, self.sigma
 
-        return 1 / (sigma*np.sqrt(2*np.pi)) * np.exp(-(x - mu)**2/(2*sigma**2))
+        return Plan([('add', -mu), ('square',), ('mul', -1 / (2*sigma**2)), ('exp',), ('mul', 1 / (sigma*sqrt(2*pi)))])
+
+    def _kernel(self):
+        return kernels.normal, self.plan.constants
 
     @property
     def mean(self):
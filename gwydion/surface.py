@@ -0,0 +1,445 @@
+"""
+Two-dimensional surfaces z(x, y) built on the one-dimensional function classes.
+
+Each surface is a sum of a few separable terms, z = sum_k u_k(y) * v_k(x), whose factors are evaluated by the 1D
+classes on the axes alone, in O(rows + cols) time and memory. A tile of z is then the sum of the outer products of
+the slices of the factors with the tile's rows and columns, so no meshgrid of the coordinates is ever built and any
+tile can be computed on its own:
+
+    Normal2D    The product of two Normal distributions, a single term.
+    Sine2D      A plane wave I*sin(2*pi*(fx*x + fy*y) + p), split by sin(a + b) = sin(a)cos(b) + cos(a)sin(b) into two
+                terms, which costs two multiplications per point rather than a sine.
+    Polynomial2D    A polynomial in x and y, one term per power of y.
+
+The noise is counter-based (see Base): point (i, j) takes the Philox output i * cols + j of the key derived from the
+seed, so tiles, row bands and the whole array agree bit for bit. z is rows x cols, with rows along y and columns
+along x as for an image, and surfaces are NumPy arrays of the dtype set by gwydion.config.
+
+    >>>> Normal2D(shape=(8192, 8192)).write('blob.npy', fmt='memmap')      # Out-of-core, in row bands.
+    >>>> for rows, cols, z in Sine2D(shape=(10**5, 10**5)).tiles(4096, 4096):
+    ....     ...
+"""
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from math import pi
+
+import numpy as np
+
+from gwydion import grid
+from gwydion.backend import current
+from gwydion.base import _readonly
+from gwydion.exceptions import GwydionError
+from gwydion.funcs.polynomial import Polynomial
+from gwydion.funcs.sine import Sine
+from gwydion.pipeline import Writer
+from gwydion.stats.normal import Normal
+
+
+def _pair(value, name):
+    if value is None or isinstance(value, (int, float)):
+        return value, value
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        return tuple(value)
+
+    raise GwydionError('{} must be a number, a pair of numbers (x, y) or None.'.format(name))
+
+
+class Surface(ABC):
+    """
+    Base class of the 2D surfaces. Subclasses define _factors, returning the separable terms of z as a list of
+    (u, v) pairs of arrays of length rows and cols, such that z = sum(u[:, None] * v[None, :]).
+
+    Setting obj.threads > 1 computes the row bands of z (see fill) in parallel. The result does not depend on the
+    number of threads.
+    """
+
+    _caches = ('_terms', '_z', '_key')
+    _settings = ('threads', 'chunk_size')
+
+    # Points per tile when none is given; tiles are row bands of about this size.
+    chunk_size = 2**20
+
+    _terms = _z = _key = None
+
+    def __init__(self, shape, xlim, ylim, rand, seed):
+        super().__init__()
+
+        if isinstance(shape, int):
+            shape = (shape, shape)
+
+        if not (isinstance(shape, (list, tuple)) and len(shape) == 2 and all(isinstance(n, int) for n in shape)):
+            raise GwydionError('Shape must be an integer or a pair of integers (rows, cols).')
+        elif min(shape) < 1:
+            raise GwydionError('Surfaces must have at least one row and one column.')
+
+        settings = current()
+
+        self.shape = tuple(shape)
+        self.seed = seed
+        self.dtype = np.dtype(settings['dtype'] or np.float64)
+        self.threads = settings['threads']
+
+        try:
+            # As for Base, unseeded surfaces keep the entropy of their RNG, from which the noise is keyed.
+            self._entropy = np.random.SeedSequence(seed).entropy if seed is None else None
+            self.random = np.random.RandomState(seed if seed is not None else
+                                                np.random.MT19937(np.random.SeedSequence(self._entropy)))
+        except Exception as e:
+            raise GwydionError('Setting the random seed has failed.') from e
+
+        self.xlim = xlim
+        self.ylim = ylim
+        self.rand = rand if rand is not None else 0
+
+    def _component(self, cls, **kwargs):
+        # A noiseless 1D object, seeded from the surface's RNG so that its default parameters are reproducible.
+        return cls(rand=None, seed=int(self.random.randint(2**31)), **kwargs)
+
+    @abstractmethod
+    def _factors(self):
+        pass
+
+    @property
+    def terms(self):
+        """The separable terms of z, as (u, v) pairs of the y and x factors."""
+        if self._terms is None:
+            self._terms = [(np.asarray(u, dtype=self.dtype), np.asarray(v, dtype=self.dtype))
+                           for u, v in self._factors()]
+
+        return [(_readonly(u), _readonly(v)) for u, v in self._terms]
+
+    @property
+    def x(self):
+        return grid.linspace(self.xlim, self.shape[1], self.dtype)
+
+    @property
+    def y(self):
+        return grid.linspace(self.ylim, self.shape[0], self.dtype)
+
+    @property
+    def z(self):
+        if self._z is None:
+            self._z = self.fill()
+
+        return _readonly(self._z)
+
+    @property
+    def data(self):
+        return self.x, self.y, self.z
+
+    def _noise(self, rows, cols):
+        """Random data of the points in rows [r0, r1) and columns [c0, c1)."""
+        (r0, r1), (c0, c1) = rows, cols
+        width = self.shape[1]
+
+        if self._key is None:
+            seed = self.seed if self.seed is not None else self._entropy
+            self._key = np.random.SeedSequence(seed).generate_state(2, dtype=np.uint64)
+
+        if 4 * (c1 - c0) >= width:
+            # Draw whole rows at once and drop the columns outside the tile.
+            r = grid._uniforms(self._key, r0 * width, r1 * width).reshape(r1 - r0, width)[:, c0:c1]
+        else:
+            r = np.stack([grid._uniforms(self._key, i * width + c0, i * width + c1) for i in range(r0, r1)])
+
+        r *= 2
+        r -= 1
+        r *= self.rand
+
+        return r
+
+    def _tile(self, rows, cols, out=None):
+        (r0, r1), (c0, c1) = rows, cols
+        if not (0 <= r0 < r1 <= self.shape[0] and 0 <= c0 < c1 <= self.shape[1]):
+            raise GwydionError('Tiles must hold at least one point within the shape {}.'.format(self.shape))
+
+        if out is None:
+            out = np.empty((r1 - r0, c1 - c0), dtype=self.dtype)
+
+        terms = self.terms
+        u, v = terms[0]
+        np.multiply.outer(u[r0:r1], v[c0:c1], out=out)
+
+        if len(terms) > 1:
+            tmp = np.empty_like(out)
+            for u, v in terms[1:]:
+                np.multiply.outer(u[r0:r1], v[c0:c1], out=tmp)
+                out += tmp
+
+        if self.rand:
+            out += self._noise(rows, cols)
+
+        return out
+
+    def __getitem__(self, key):
+        """obj[rows, cols] returns (x, y, z) of the window, computed on its own. Slices must have a step of 1."""
+        if not isinstance(key, tuple) or len(key) != 2 or not all(isinstance(k, slice) for k in key):
+            raise GwydionError('Surfaces are indexed by a pair of slices, obj[rows, cols].')
+
+        bounds = []
+        for k, n in zip(key, self.shape):
+            start, stop, step = k.indices(n)
+            if step != 1:
+                raise GwydionError('Windows of surfaces must have a step of 1.')
+            bounds.append((start, stop))
+
+        (r0, r1), (c0, c1) = bounds
+
+        return self.x[c0:c1], self.y[r0:r1], self._tile((r0, r1), (c0, c1))
+
+    def _band(self, cols=None):
+        return max(1, self.chunk_size // (cols or self.shape[1]))
+
+    def tiles(self, rows=None, cols=None):
+        """
+        Yield (rows, cols, z) for tiles of at most rows x cols points covering z in C order, where rows and cols are
+        the slices of the tile. Only one tile is held at a time. Defaults to row bands of about chunk_size points.
+        """
+        cols = cols or self.shape[1]
+        rows = rows or self._band(cols)
+
+        for r0 in range(0, self.shape[0], rows):
+            r1 = min(r0 + rows, self.shape[0])
+            for c0 in range(0, self.shape[1], cols):
+                c1 = min(c0 + cols, self.shape[1])
+                yield slice(r0, r1), slice(c0, c1), self._tile((r0, r1), (c0, c1))
+
+    def fill(self, out=None, threads=None):
+        """Compute z into out (a new array if None) in row bands, in parallel if threads > 1."""
+        if out is None:
+            out = np.empty(self.shape, dtype=self.dtype)
+        elif not isinstance(out, np.ndarray) or out.shape != self.shape or out.dtype != self.dtype:
+            raise GwydionError('out must be an array of shape {} and dtype {}.'.format(self.shape, self.dtype))
+
+        band = self._band()
+        bands = [(r0, min(r0 + band, self.shape[0])) for r0 in range(0, self.shape[0], band)]
+        threads = threads or self.threads
+
+        def compute(rows):
+            self._tile(rows, (0, self.shape[1]), out=out[rows[0]:rows[1]])
+
+        # The terms and the noise key are computed once, before the bands share them.
+        self.terms
+        if self.rand:
+            self._noise((0, 1), (0, 1))
+
+        if threads > 1 and len(bands) > 1:
+            with ThreadPoolExecutor(min(threads, len(bands))) as pool:
+                list(pool.map(compute, bands))
+        else:
+            for rows in bands:
+                compute(rows)
+
+        return out
+
+    def write(self, path, fmt='npy', rows=None):
+        """
+        Write z to path in row bands, without holding more than two bands in memory.
+
+        Parameters
+        ----------
+        path : String.
+            Output file, or '-' for standard output (npy and raw formats only).
+        fmt : String.
+            'npy' (default), 'raw' or 'memmap' (see gwydion.pipeline.Writer).
+        rows : Integer or None.
+            Rows per band. Defaults to bands of about chunk_size points.
+        """
+        rows = rows or self._band()
+
+        with Writer(path, self.shape, self.dtype, fmt=fmt, chunk=rows) as writer:
+            for r0 in range(0, self.shape[0], rows):
+                r1 = min(r0 + rows, self.shape[0])
+                buf = writer.buffer()
+                self._tile((r0, r1), (0, self.shape[1]), out=buf[:r1 - r0])
+                writer.write(r0, buf[:r1 - r0], buf)
+
+        return path
+
+    def __str__(self):
+        s = '<{s.__class__.__name__} : shape={s.shape}, rand={s.rand}>'
+        return s.format(s=self)
+
+    def __setattr__(self, name, value):
+        if name not in self._caches + self._settings:
+            for cache in self._caches:
+                super().__setattr__(cache, None)
+
+        super().__setattr__(name, value)
+
+
+class Normal2D(Surface):
+    """
+    Gaussian blob, the product of two Normal distributions along x and y. Returned function is
+
+        z = Normal(mu[0], sigma[0])(x) * Normal(mu[1], sigma[1])(y)
+
+    Parameters
+    ----------
+
+    shape : Integer or tuple of integers.
+        (rows, cols) of z, the lengths of y and x. An integer gives a square. Defaults to 100.
+    mu : Pair of floats or integers, float, integer, or None.
+        (x, y) position of the peak. Either may be None for a random value around 0.0, as for Normal.
+    sigma : Pair of floats or integers, float, integer, or None.
+        (x, y) standard deviations. Either may be None for a random value, as for Normal.
+    xlim, ylim : Tuples of floats or integers, or None.
+        (Min, Max) values of the axes. If None, defaults to mu -/+ 5*sigma along the axis.
+    rand : Float or integer.
+        The amplitude of random numbers added to z. If None, no random data added. Defaults to 0.02.
+    seed : Integer or None.
+        Used to seed the RNG if repeatable results are required. Defaults to None (and thus no seeding).
+
+    Examples
+    --------
+
+    >>>> Normal2D()  # Default params.
+    >>>> Normal2D(shape=(8192, 8192), mu=0, sigma=(1, 0.5))  # Elliptical blob at the origin.
+    >>>> Normal2D(rand=None)  # Turn off randomness.
+    """
+
+    def __init__(self, shape=100, mu=None, sigma=None, xlim=None, ylim=None, rand=0.02, seed=None):
+        super().__init__(shape=shape,
+                         xlim=xlim,
+                         ylim=ylim,
+                         rand=rand,
+                         seed=seed)
+
+        self.set_variables(mu, sigma)
+
+    def set_variables(self, mu, sigma):
+        (mx, my), (sx, sy) = _pair(mu, 'mu'), _pair(sigma, 'sigma')
+
+        fx = self._component(Normal, N=self.shape[1], mu=mx, sigma=sx, xlim=self.xlim)
+        fy = self._component(Normal, N=self.shape[0], mu=my, sigma=sy, xlim=self.ylim)
+
+        self.mu = (fx.mu, fy.mu)
+        self.sigma = (fx.sigma, fy.sigma)
+        self.xlim, self.ylim = fx.xlim, fy.xlim
+
+    def _factors(self):
+        fx = Normal(N=self.shape[1], mu=self.mu[0], sigma=self.sigma[0], xlim=self.xlim, rand=None)
+        fy = Normal(N=self.shape[0], mu=self.mu[1], sigma=self.sigma[1], xlim=self.ylim, rand=None)
+
+        return [(fy.func(self.y), fx.func(self.x))]
+
+
+class Sine2D(Surface):
+    """
+    Sine grating, a plane wave travelling along (f[0], f[1]). Returned function is
+
+        z = I*sin(2*pi*(f[0]*x + f[1]*y) + p)
+
+    Parameters
+    ----------
+
+    shape : Integer or tuple of integers.
+        (rows, cols) of z, the lengths of y and x. An integer gives a square. Defaults to 100.
+    I : Float, integer, or None.
+        Intensity of the wave. If None, defaults to a random value around 1.0.
+    f : Pair of floats or integers, float, integer, or None.
+        (x, y) spatial frequencies. Either may be None for a random value around 1.0, as for Sine.
+    p : Float, integer, or None.
+        Phase of the wave. If None, defaults to a random value around 0.0.
+    xlim, ylim : Tuples of floats or integers.
+        (Min, Max) values of the axes. Default to (-10, 10).
+    rand : Float or integer.
+        The amplitude of random numbers added to z. If None, no random data added. Defaults to 0.1.
+    seed : Integer or None.
+        Used to seed the RNG if repeatable results are required. Defaults to None (and thus no seeding).
+
+    Examples
+    --------
+
+    >>>> Sine2D()  # Default params.
+    >>>> Sine2D(f=(1, 0))  # Vertical stripes.
+    >>>> Sine2D(shape=(10**5, 10**5), f=0.5).write('grating.npy', fmt='memmap')  # Diagonal grating, out-of-core.
+    """
+
+    def __init__(self, shape=100, I=None, f=None, p=None, xlim=(-10, 10), ylim=(-10, 10), rand=0.1, seed=None):
+        super().__init__(shape=shape,
+                         xlim=xlim,
+                         ylim=ylim,
+                         rand=rand,
+                         seed=seed)
+
+        self.set_variables(I, f, p)
+
+    def set_variables(self, I, f, p):
+        fx, fy = _pair(f, 'f')
+
+        wx = self._component(Sine, N=self.shape[1], I=I, f=fx, p=p, xlim=self.xlim)
+        wy = self._component(Sine, N=self.shape[0], I=1, f=fy, p=0, xlim=self.ylim)
+
+        self.I, self.p = wx.I, wx.p
+        self.f = (wx.f, wy.f)
+
+    def _factors(self):
+        # sin(a + b) = sin(a)*cos(b) + cos(a)*sin(b), with a = 2*pi*fx*x + p along x and b = 2*pi*fy*y along y.
+        fx, fy = self.f
+        x, y = self.x, self.y
+        sin_x = Sine(N=self.shape[1], I=self.I, f=fx, p=self.p, xlim=self.xlim, rand=None)
+        cos_x = Sine(N=self.shape[1], I=self.I, f=fx, p=self.p + pi / 2, xlim=self.xlim, rand=None)
+        sin_y = Sine(N=self.shape[0], I=1, f=fy, p=0, xlim=self.ylim, rand=None)
+        cos_y = Sine(N=self.shape[0], I=1, f=fy, p=pi / 2, xlim=self.ylim, rand=None)
+
+        return [(cos_y.func(y), sin_x.func(x)), (sin_y.func(y), cos_x.func(x))]
+
+
+class Polynomial2D(Surface):
+    """
+    Polynomial surface. Returned function is
+
+        z = sum(a[j][i] * x**i * y**j)
+
+    that is, row j of a holds the coefficients of the polynomial in x multiplying y**j, lowest power first.
+
+    Parameters
+    ----------
+
+    shape : Integer or tuple of integers.
+        (rows, cols) of z, the lengths of y and x. An integer gives a square. Defaults to 100.
+    a : 2D sequence of floats or integers, or None.
+        Coefficients of the polynomial. If None, defaults to a random quadratic or cubic in each of x and y.
+    xlim, ylim : Tuples of floats or integers.
+        (Min, Max) values of the axes. Default to (-10, 10).
+    rand : Float or integer.
+        The amplitude of random numbers added to z. If None, no random data added. Defaults to 1.0.
+    seed : Integer or None.
+        Used to seed the RNG if repeatable results are required. Defaults to None (and thus no seeding).
+
+    Examples
+    --------
+
+    >>>> Polynomial2D()  # Default params.
+    >>>> Polynomial2D(a=[[0, 0, 1], [0], [1]])  # Paraboloid x**2 + y**2.
+    >>>> Polynomial2D(a=[[0, 1], [1]])  # Plane x + y.
+    """
+
+    def __init__(self, shape=100, a=None, xlim=(-10, 10), ylim=(-10, 10), rand=1.0, seed=None):
+        super().__init__(shape=shape,
+                         xlim=xlim,
+                         ylim=ylim,
+                         rand=rand,
+                         seed=seed)
+
+        self.set_variables(a)
+
+    def set_variables(self, a):
+        if a is None:
+            n, m = self.random.randint(2, 4, size=2)
+            a = self.random.rand(m + 1, n + 1) - 0.5
+        elif not (len(a) and all(len(row) for row in a)):
+            raise GwydionError('Polynomial2D parameters must be a non-empty sequence of non-empty rows.')
+
+        try:
+            self.a = [[float(v) for v in row] for row in a]
+        except (TypeError, ValueError) as e:
+            raise GwydionError('Polynomial2D parameters must be sequences of ints or floats.') from e
+
+    def _factors(self):
+        # One term per power of y, y**j times the polynomial in x with the coefficients of row j.
+        x, y = self.x.astype(float), self.y.astype(float)
+
+        return [(y**j, Polynomial(N=self.shape[1], a=row, xlim=self.xlim, rand=None).func(x))
+                for j, row in enumerate(self.a)]
@@ -44,6 +44,7 @@ setup(
       author_email='kjpizzey@gmail.com',
       description='Gwydion allows users to generate pseudo-random scientific data easily.',
       install_requirements=requirements,
+      entry_points={'console_scripts': ['gwydion = gwydion.cli:main']},
       classifiers=classifiers,
       version=version
 )
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+
+import pytest
+import numpy as np
+
+from gwydion import Composite, Linear, Sine
+from gwydion.aio import Executor, default_executor
+from gwydion.exceptions import GwydionError
+
+
+SEED = 31415927
+
+
+def test_adata():
+    sine = Sine(N=1001, seed=SEED)
+    expected = Sine(N=1001, seed=SEED).data
+
+    x, y = asyncio.run(sine.adata())
+
+    assert np.array_equal(x, expected[0])
+    assert np.array_equal(y, expected[1])
+    assert sine.data[1] is y
+
+
+@pytest.mark.parametrize('noise', ['sequential', 'counter'])
+def test_aiter_chunks(noise):
+    sine = Sine(N=1001, seed=SEED)
+    sine.noise = noise
+    expected = Sine(N=1001, seed=SEED)
+    expected.noise = noise
+
+    async def collect():
+        return [chunk async for chunk in sine.aiter_chunks(chunk_size=100, prefetch=2)]
+
+    chunks = asyncio.run(collect())
+
+    # Sequential noise is drawn chunk by chunk rather than cached in full.
+    assert sine._r is None and sine._data is None
+    assert len(chunks) == 11
+    assert np.array_equal(np.concatenate([x for x, _ in chunks]), expected.x)
+    assert np.array_equal(np.concatenate([y for _, y in chunks]), expected.y)
+
+
+def test_aiter_chunks_cancel():
+    linear = Linear(N=1000, seed=SEED)
+
+    async def first():
+        chunks = linear.aiter_chunks(chunk_size=10, prefetch=5)
+        async for chunk in chunks:
+            break
+        await chunks.aclose()
+
+        return chunk
+
+    x, y = asyncio.run(first())
+
+    assert np.array_equal(y, Linear(N=1000, seed=SEED).y[:10])
+
+
+def test_executor_limit():
+    event = threading.Event()
+
+    async def main():
+        with Executor(workers=1, limit=1) as executor:
+            job = asyncio.ensure_future(executor.run(event.wait))
+            await asyncio.sleep(0)
+
+            assert executor.busy
+            with pytest.raises(GwydionError):
+                await executor.run(sum, [1, 2], wait=False)
+
+            event.set()
+            await job
+
+            assert not executor.busy
+            assert await executor.run(sum, [1, 2], wait=False) == 3
+
+    asyncio.run(main())
+
+
+def test_executor_processes():
+    composite = Sine(N=101, seed=SEED) + 1
+
+    async def main():
+        with Executor(workers=1, processes=True) as executor:
+            return await composite.adata(executor=executor)
+
+    x, y = asyncio.run(main())
+
+    assert isinstance(composite, Composite)
+    assert np.allclose(y, (Sine(N=101, seed=SEED) + 1).y)
+
+
+def test_aiter_chunks_processes():
+    sine = Sine(N=1001, seed=SEED)
+
+    async def collect():
+        with Executor(workers=2, processes=True) as executor:
+            return [y async for _, y in sine.aiter_chunks(chunk_size=100, prefetch=2, executor=executor)]
+
+    assert np.array_equal(np.concatenate(asyncio.run(collect())), Sine(N=1001, seed=SEED).y)
+
+
+def test_executor_exceptions():
+    with pytest.raises(GwydionError):
+        Executor(workers=1, limit=-1)
+
+    assert default_executor() is default_executor()
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+
+from gwydion import Custom, Linear, Sine
+from gwydion.arrow import metadata, to_arrow, write_parquet
+from gwydion.exceptions import GwydionError
+from gwydion.spec import build
+from gwydion.stats import Poisson
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def test_to_arrow():
+    sine = Sine(N=1001, seed=42)
+    table = sine.to_arrow()
+
+    assert table.column_names == ['x', 'y']
+    assert np.array_equal(table.column('y').to_numpy(), sine.y)
+    assert np.shares_memory(table.column('y').chunk(0).to_numpy(), sine.y)
+    assert table.schema.metadata[b'gwydion.version']
+
+
+def test_write_parquet(tmp_path):
+    path = str(tmp_path / 'sine.parquet')
+    sine = Sine(N=1001, seed=42, f=2.0)
+    sine.write_parquet(path, row_group_size=300)
+
+    # Only one row group of noise is drawn at a time, and the object is not evaluated.
+    assert sine._r is None and sine._data is None
+    assert pq.ParquetFile(path).num_row_groups == 4
+    assert np.array_equal(pq.read_table(path).column('y').to_numpy(), sine.y)
+
+    meta = metadata(path)
+    assert meta['params']['f'] == 2.0
+    assert np.array_equal(build(meta['spec']).y, sine.y)
+
+
+def test_write_parquet_batch(tmp_path):
+    path = str(tmp_path / 'batch.parquet')
+    objs = [Poisson(seed=i, lam=3) for i in range(3)] + [Custom('a*x', N=10, a=(0, 1), seed=3)]
+    write_parquet(objs, path)
+
+    table = pq.read_table(path)
+    meta = metadata(path)
+
+    assert table.column_names == ['curve', 'x', 'y']
+    assert np.array_equal(np.bincount(table.column('curve').to_numpy()), [10, 10, 10, 10])
+    for i, spec in enumerate(meta['spec']):
+        assert np.array_equal(build(spec).y, objs[i].y)
+
+
+def test_to_arrow_batch():
+    table = to_arrow([Linear(N=5, seed=1), Linear(N=5, seed=2)])
+
+    assert table.num_rows == 10
+    assert table.column('curve').to_pylist() == [0] * 5 + [1] * 5
+
+
+def test_arrow_exceptions(tmp_path):
+    with pytest.raises(GwydionError):
+        to_arrow([])
+
+    with pytest.raises(GwydionError):
+        to_arrow([Sine(), 1])
+
+    path = str(tmp_path / 'plain.parquet')
+    pq.write_table(pa.table({'y': [1.0]}), path)
+    with pytest.raises(GwydionError):
+        metadata(path)
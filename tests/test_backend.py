@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+
+import gwydion
+from gwydion import backend, Sine
+from gwydion.stats import Normal, Poisson
+from gwydion.exceptions import GwydionError
+
+
+SEED = 31415927
+
+
+def test_config_context():
+    assert backend.current() == {'backend': 'numpy', 'dtype': None, 'threads': 1}
+
+    with gwydion.config(dtype='float32', threads=4):
+        with gwydion.config(threads=2) as settings:
+            assert settings == {'backend': 'numpy', 'dtype': 'float32', 'threads': 2}
+        assert backend.current()['threads'] == 4
+
+    assert backend.current() == {'backend': 'numpy', 'dtype': None, 'threads': 1}
+
+
+def test_config_captured():
+    with gwydion.config(dtype='float32', threads=3):
+        sine = Sine(seed=SEED)
+
+    assert sine.threads == 3
+    x, y = sine.data
+    assert x.dtype == np.float32
+    assert y.dtype == np.float32
+    assert np.allclose(y, Sine(seed=SEED).y, atol=1e-5)
+
+
+def test_config_module():
+    with gwydion.config(backend=np):
+        sine = Sine()
+
+    assert sine.backend == 'numpy'
+    assert sine.xp is np
+
+
+def test_config_exceptions():
+    with pytest.raises(GwydionError):
+        with gwydion.config(colour='red'):
+            pass
+    with pytest.raises(GwydionError):
+        with gwydion.config(backend='no_such_array_library'):
+            pass
+
+
+def test_backend_array_api():
+    xp = pytest.importorskip('array_api_strict')
+
+    makes = [lambda: Sine(seed=SEED),
+             lambda: Normal(seed=SEED, allow_negative_y=False),
+             lambda: Poisson(seed=SEED)]
+
+    for make in makes:
+        with gwydion.config(backend='array_api_strict', dtype='float32'):
+            x, y = make().data
+        with gwydion.config(dtype='float32'):
+            x_np, y_np = make().data
+
+        assert isinstance(y, type(xp.asarray(0)))
+        assert y.dtype == xp.float32
+        assert np.allclose(np.from_dlpack(y), y_np, atol=1e-5)
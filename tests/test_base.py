@@ -1,4 +1,9 @@
+import copy
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+import numpy as np
 
 from gwydion.base import Base
 from gwydion.exceptions import GwydionError
@@ -40,4 +45,251 @@ def test_base_exceptions():
         x, y = z.data
     with pytest.raises(GwydionError):
         z = MockBaseClass(N=(100,100))
-        x, y = z.data
\ No newline at end of file
+        x, y = z.data
+
+def test_base_data_read_only():
+    z = MockBaseClass(a=1, b=2, seed=1234)
+    x, y = z.data
+
+    with pytest.raises(ValueError):
+        y[0] = 100
+    with pytest.raises(ValueError):
+        z.r[0] = 100
+
+    assert z.data[1] is y
+    assert np.shares_memory(z.y, y)
+
+
+def test_base_array_protocols():
+    z = MockBaseClass(a=1, b=2, seed=1234)
+
+    arr = np.asarray(z)
+    assert np.shares_memory(arr, z.y)
+
+    arr = np.array(z)
+    assert arr.flags.writeable
+    assert np.array_equal(arr, z.y)
+
+    assert np.asarray(z, dtype='float32').dtype == np.float32
+    assert np.array_equal(np.from_dlpack(z), z.y)
+    assert np.array_equal(memoryview(z.y), z.y)
+
+
+def test_base_records():
+    z = MockBaseClass(a=1, b=2, N=5, rand=None)
+    rec = z.to_records()
+
+    assert rec.dtype.names == ('x', 'y')
+    assert np.array_equal(rec['x'], z.x)
+    assert np.array_equal(rec['y'], z.y)
+
+    # The records are a copy, and changing them leaves the data alone.
+    rec['y'] = 0
+    assert np.array_equal(z.y, 2 * z.x)
+
+
+def test_base_cache_reset():
+    z = MockBaseClass(a=1, b=2, N=5, rand=None)
+    x, y = z.data
+
+    z.a = 3
+    assert np.array_equal(z.y, 3 * y)
+
+
+def test_base_counter_noise():
+    z1 = MockBaseClass(a=1, b=2, N=1001, seed=1234)
+    z2 = MockBaseClass(a=1, b=2, N=1001, seed=1234)
+    z1.noise = z2.noise = 'counter'
+
+    assert np.array_equal(z1.y, z2.y)
+    assert np.all(np.abs(z1.r) <= z1.rand)
+
+    z2.noise = 'sequential'
+    assert not np.array_equal(z1.y, z2.y)
+
+    with pytest.raises(GwydionError):
+        z2.noise = 'other'
+        z2.data
+
+
+def test_base_slicing():
+    z = MockBaseClass(a=1, b=2, N=1001, seed=1234)
+    z.noise = 'counter'
+
+    full = MockBaseClass(a=1, b=2, N=1001, seed=1234)
+    full.noise = 'counter'
+    x, y = full.data
+
+    for key in [slice(0, 1001), slice(13, 17), slice(998, None), slice(None, None, -7), slice(5, 5)]:
+        xs, ys = z[key]
+        assert np.array_equal(xs, x[key])
+        assert np.array_equal(ys, y[key])
+
+    assert z[-1] == (x[-1], y[-1])
+    assert z._data is None
+
+    with pytest.raises(IndexError):
+        z[1001]
+    with pytest.raises(GwydionError):
+        z['a']
+
+
+def test_base_sweep():
+    z = MockBaseClass(a=1, b=2, N=11, rand=None)
+    sweep = z.sweep(a=[1, 2, 3], b=[0.5, 1.0])
+
+    assert list(sweep.axes) == ['a', 'b']
+    assert sweep.y.shape == (3, 2, 11)
+    assert np.array_equal(sweep.x, z.x)
+
+    for i, a in enumerate(sweep.axes['a']):
+        for j, b in enumerate(sweep.axes['b']):
+            assert np.allclose(sweep.y[i, j], MockBaseClass(a=a, b=b, N=11, rand=None).y)
+
+    assert z.a == 1 and z.b == 2
+
+    noisy = z.sweep(noise=True, a=[1, 2, 3])
+    assert noisy.y.shape == (3, 11)
+
+
+def test_base_sweep_noise():
+    z = MockBaseClass(a=1, b=2, N=11, seed=1234)
+    noisy = z.sweep(noise=True, a=[1, 2, 3])
+
+    # The noise comes from its own stream, leaving the data of the object unchanged.
+    assert np.array_equal(z.y, MockBaseClass(a=1, b=2, N=11, seed=1234).y)
+    assert np.array_equal(z.sweep(noise=True, a=[1, 2, 3]).y, noisy.y)
+    assert np.all(np.abs(noisy.y - z.sweep(a=[1, 2, 3]).y) <= z.rand)
+
+
+def test_base_sweep_exceptions():
+    z = MockBaseClass(a=1, b=2)
+
+    with pytest.raises(GwydionError):
+        z.sweep()
+    with pytest.raises(GwydionError):
+        z.sweep(N=[10, 20])
+    with pytest.raises(GwydionError):
+        z.sweep(c=[1, 2])
+    with pytest.raises(GwydionError):
+        z.sweep(a=[[1, 2], [3, 4]])
+
+
+def test_base_threaded():
+    for noise in ['sequential', 'counter']:
+        z1 = MockBaseClass(a=1, b=2, N=10001, seed=1234)
+        z2 = MockBaseClass(a=1, b=2, N=10001, seed=1234)
+        z1.noise = z2.noise = noise
+        z2.threads, z2.chunk_size = 4, 1000
+
+        assert np.array_equal(z1.y, z2.y)
+        assert np.array_equal(z1.r, z2.r)
+
+
+def test_base_settings_keep_cache():
+    z = MockBaseClass(a=1, b=2, seed=1234)
+    y = z.y
+
+    z.threads = 2
+    z.chunk_size = 10
+    assert z.y is y
+
+
+def test_base_concurrent_data():
+    z = MockBaseClass(a=1, b=2, N=10001, seed=1234)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: z.data, range(32)))
+
+    # The noise is drawn once, and is the same as that of an object read from one thread.
+    assert all(r is results[0] for r in results)
+    assert np.array_equal(results[0][1], MockBaseClass(a=1, b=2, N=10001, seed=1234).y)
+
+
+def test_base_pickle():
+    z = MockBaseClass(a=1, b=2, seed=1234)
+    y = z.y
+
+    for new in (pickle.loads(pickle.dumps(z)), copy.deepcopy(z)):
+        assert new._lock is not z._lock
+        assert np.array_equal(new.y, y)
+
+
+def test_base_pickle_compact():
+    for seed in [1234, None]:
+        z = MockBaseClass(a=1, b=2, N=10**5, seed=seed)
+        z.noise = 'counter' if seed is None else 'sequential'
+        y = z.y
+
+        data = pickle.dumps(z)
+        assert len(data) < 1000
+        assert np.array_equal(pickle.loads(data).y, y)
+
+    z.pickle_caches = True
+    assert z._y is not None
+    assert len(pickle.dumps(z)) > z.N * 8
+    assert np.array_equal(pickle.loads(pickle.dumps(z)).y, y)
+
+
+def test_base_pickle_rng_used():
+    z = MockBaseClass(a=1, b=2, seed=1234)
+    z.y
+    z.a = 2
+    y = z.y
+
+    # The RNG has moved on, so its state is pickled.
+    new = pickle.loads(pickle.dumps(z))
+    assert np.array_equal(new.y, y)
+    assert np.array_equal(new.random.rand(3), z.random.rand(3))
+
+
+@pytest.mark.parametrize('drawn', [False, True])
+def test_base_pickle_rng_moved(drawn):
+    z = MockBaseClass(a=1, b=2, seed=1234)
+    if drawn:
+        z.r
+    z.random.rand(3)
+    y = z.y
+
+    # Drawing from the RNG other than for r cannot be replayed, so the object is pickled in full.
+    for new in (pickle.loads(pickle.dumps(z)), copy.deepcopy(z)):
+        assert np.array_equal(new.y, y)
+        assert np.array_equal(new.random.rand(3), copy.deepcopy(z.random).rand(3))
+
+
+def test_base_refine():
+    z = MockBaseClass(a=1, b=2, N=17, seed=1234)
+    fine = z.refine(2)
+
+    # The coarse points and their noise are kept, and the new points lie on the finer grid.
+    assert fine.N == 65
+    assert np.array_equal(fine.y[::4], z.y) and np.array_equal(fine.r[::4], z.r)
+    assert np.allclose(fine.x, np.linspace(0, 10, 65))
+    assert np.allclose(fine.y - fine.r, 2 * fine.x)
+    assert np.all(np.abs(fine.r) <= z.rand)
+    assert np.array_equal(z.refine().refine().y, fine.y)
+
+    fine.a = 2
+    assert np.array_equal(fine.x, np.linspace(0, 10, 65)) and len(fine.y) == 65
+
+    with pytest.raises(GwydionError):
+        z.refine(0)
+
+
+def test_base_adaptive():
+    z = MockBaseClass(a=1, b=2, seed=1234)
+    adaptive = z.adaptive(initial=5)
+
+    # A straight line needs no more points, and noise is added as usual.
+    assert adaptive.N == 5 and np.array_equal(adaptive.x, np.linspace(0, 10, 5))
+    assert np.all(np.abs(adaptive.y - 2 * adaptive.x) <= z.rand)
+
+    # The noise of the copy comes from its own stream, so drawing it leaves the object alone.
+    assert np.array_equal(z.data, MockBaseClass(a=1, b=2, seed=1234).data)
+    assert np.array_equal(pickle.loads(pickle.dumps(z)).data, z.data)
+    assert np.array_equal(adaptive.y, z.adaptive(initial=5).y)
+
+    with pytest.raises(GwydionError):
+        z.adaptive(tol=0)
+    with pytest.raises(GwydionError):
+        z.adaptive(initial=10, max_points=5)
@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+
+from gwydion import serve
+from gwydion.cli import generate, main
+from gwydion.exceptions import GwydionError
+from gwydion.spec import build
+
+
+def test_generate(tmp_path):
+    path = str(tmp_path / 'sines.npy')
+    main(['generate', 'Sine', '--count', '5', '-N', '11', '--param', 'p=0', '--param', 'f=0.5:2.0', '-o', path])
+
+    data = np.load(path)
+    assert data.shape == (5, 2, 11)
+    assert np.array_equal(data[:, 0], np.tile(build({'class': 'Sine', 'N': 11}).x, (5, 1)))
+    assert len(np.unique(data[:, 1, 0])) == 5
+
+
+def test_generate_discrete_ranges(tmp_path):
+    path = str(tmp_path / 'poisson.npy')
+    main(['generate', 'Poisson', '--count', '20', '-N', '100', '--param', 'lam=1:10', '--seed', '0', '-o', path])
+
+    # lam=10 has the widest support, (0, 30), which every curve shares.
+    data = np.load(path)
+    assert data.shape == (20, 2, 31)
+    assert np.array_equal(data[:, 0], np.tile(np.arange(31), (20, 1)))
+
+
+@pytest.mark.parametrize('workers, chunk_size', [(1, 1), (1, 3), (2, 2)])
+def test_generate_deterministic(tmp_path, workers, chunk_size):
+    spec = {'class': 'Poisson', 'N': 21, 'xlim': [0, 20]}
+
+    expected = generate(spec, 7, str(tmp_path / 'a.npy'), ranges={'lam': (1, 10)}, seed=3)
+    path = generate(spec, 7, str(tmp_path / 'b.npy'), ranges={'lam': (1, 10)}, seed=3, workers=workers,
+                    chunk_size=chunk_size)
+
+    assert np.array_equal(np.load(path), np.load(expected))
+
+
+def test_generate_raw(tmp_path):
+    spec = {'class': 'Linear', 'N': 10, 'dtype': 'float32'}
+
+    npy = np.load(generate(spec, 3, str(tmp_path / 'a.npy'), ranges={'m': (0, 1.0)}))
+    raw = np.fromfile(generate(spec, 3, str(tmp_path / 'a.raw'), ranges={'m': (0, 1.0)}, fmt='raw'), np.float32)
+
+    mmap = np.load(generate(spec, 3, str(tmp_path / 'b.npy'), ranges={'m': (0, 1.0)}, fmt='memmap', chunk_size=2))
+
+    assert np.array_equal(raw.reshape(3, 2, 10), npy)
+    assert np.array_equal(mmap, npy)
+
+
+def test_generate_grid(tmp_path):
+    path = str(tmp_path / 'sines.npy')
+    main(['generate', 'Sine', '--count', '3', '-N', '50', '--grid', 'random', '-o', path])
+
+    x = np.load(path)[:, 0]
+    assert np.all(np.diff(x, axis=1) >= 0)
+    assert not np.array_equal(x[0], x[1])
+
+
+def test_generate_exceptions(tmp_path):
+    with pytest.raises(GwydionError):
+        generate({'class': 'Sine'}, 1, '-', fmt='memmap')
+
+    with pytest.raises(GwydionError):
+        generate({'class': 'Sine'}, 0, str(tmp_path / 'a.npy'))
+
+    with pytest.raises(SystemExit):
+        main(['generate', 'Sine', '--param', 'f', '-o', str(tmp_path / 'a.npy')])
+
+
+def test_serve_command(monkeypatch):
+    calls = []
+    monkeypatch.setattr(serve, 'main', calls.append)
+
+    main(['serve', '--port', '0'])
+
+    assert calls == [['--port', '0']]
@@ -0,0 +1,88 @@
+import copy
+import pickle
+
+import pytest
+import numpy as np
+
+from gwydion import Composite, Exponential, Linear, Sine
+from gwydion.stats import Poisson
+from gwydion.exceptions import GwydionError
+from gwydion.spec import build, to_spec
+
+
+SEED = 31415927
+
+
+def test_composite_creation():
+    composite = Sine(xlim=(0, 10)) * Exponential(xlim=(0, 10)) + Linear()
+
+    assert isinstance(composite, Composite)
+    assert str(composite) == '<Composite : ((Sine * Exponential) + Linear), N=100, rand=0.1>'
+
+
+def test_composite_non_random():
+    sine = Sine(rand=None, xlim=(0, 10), N=1001, seed=SEED)
+    exp = Exponential(k=-0.5, xlim=(0, 10), N=1001, seed=SEED)
+    lin = Linear(N=1001, seed=SEED)
+
+    composite = sine * exp + lin
+    composite.chunk_size = 100
+    x, y = composite.data
+
+    assert np.array_equal(x, sine.x)
+    assert np.allclose(y, sine.func(x) * exp.func(x) + lin.func(x))
+
+
+def test_composite_scalars():
+    sine = Sine(rand=None, xlim=(0, 10), seed=SEED)
+
+    assert np.allclose((2 * sine).y, 2 * sine.y)
+    assert np.allclose((1 - sine / 4).y, 1 - sine.y / 4)
+    assert np.allclose((-sine).y, -sine.y)
+    assert np.allclose((sine ** 2).y, sine.y ** 2)
+    assert np.allclose((np.float64(3) + sine).y, 3 + sine.y)
+
+
+def test_composite_single_noise():
+    sine = Sine(rand=1.0, xlim=(0, 10), seed=SEED)
+    composite = sine + sine
+
+    composite.rand = 0.5
+    assert np.all(np.abs(composite.y - 2 * sine.func(sine.x)) <= 0.5)
+
+
+def test_composite_snapshot():
+    sine = Sine(rand=None, I=1.0, xlim=(0, 10))
+    composite = sine * 2
+
+    sine.I = 5.0
+    assert np.max(composite.y) <= 2
+
+
+def test_composite_snapshot_copies():
+    sine = Sine(seed=SEED)
+    composite = sine * 2
+    y = composite.y
+
+    # Copies, pickles and specs are made from the operands as they were when the composite was created.
+    sine.f = 5.0
+    assert np.array_equal(pickle.loads(pickle.dumps(composite)).y, y)
+    assert np.array_equal(copy.deepcopy(composite).y, y)
+    assert np.array_equal(build(to_spec(composite)).y, y)
+
+
+def test_composite_discrete():
+    poisson = Poisson(lam=3, xlim=(0, 10), N=7, rand=None)
+    composite = poisson * 2
+
+    assert np.array_equal(composite.x, poisson.x)
+    assert np.allclose(composite.y, 2 * poisson.y)
+
+
+def test_composite_exceptions():
+    with pytest.raises(GwydionError):
+        Sine() + Sine(N=5)
+    with pytest.raises(GwydionError):
+        Composite('%', Sine(), 2)
+    with pytest.raises(TypeError):
+        Sine() + 'a'
@@ -0,0 +1,78 @@
+import pytest
+import numpy as np
+
+import gwydion.funcs.custom
+from gwydion import Custom
+from gwydion.exceptions import GwydionError
+
+
+SEED = 31415927
+TOLERANCE = 0.00001
+
+def test_custom_creation():
+    custom = Custom('I*sin(2*pi*f*x)*exp(-k*x)')
+    assert custom
+    assert custom.names == ('I', 'f', 'k')
+
+
+def test_custom_non_random():
+    custom = Custom('a*x**2 + b', a=2, b=1, xlim=(0, 4), N=5, rand=None)
+    x, y = custom.data
+
+    for i, j in zip(y, [1, 3, 9, 19, 33]):
+        assert abs(i - j) < TOLERANCE
+
+
+def test_custom_numpy_fallback(monkeypatch):
+    custom = Custom('I*sin(2*pi*f*x)*exp(-k*x)', I=2, f=0.5, k=0.1, xlim=(0, 10), rand=None)
+    y = custom.func(custom.x)
+
+    monkeypatch.setattr(gwydion.funcs.custom, 'ne', None)
+    assert np.allclose(custom.func(custom.x), y)
+    assert np.allclose(y, 2 * np.sin(np.pi * custom.x) * np.exp(-0.1 * custom.x))
+
+
+def test_custom_ranges():
+    custom = Custom('a*x + b', b=(-5, -4), seed=SEED)
+
+    assert 0 <= custom.a <= 1
+    assert -5 <= custom.b <= -4
+
+
+def test_custom_seeding():
+    custom1 = Custom('a*x + b', seed=SEED)
+    custom2 = Custom('a*x + b', seed=SEED)
+
+    assert custom1.a == custom2.a
+    assert custom1.b == custom2.b
+    assert all(np.array_equal(i, j) for i, j in zip(custom1.data, custom2.data))
+
+
+def test_custom_printing():
+    custom = Custom('a*x', a=2, N=11)
+
+    assert 'N=11' in str(custom)
+    for s in ['N=11', "expr=a*x", 'a=2']:
+        assert s in repr(custom)
+
+
+def test_custom_sweep():
+    custom = Custom('a*x + b', a=1, b=0, N=5, rand=None)
+    sweep = custom.sweep(a=[1, 2], b=[0, 1, 2])
+
+    assert sweep.y.shape == (2, 3, 5)
+    assert np.allclose(sweep.y[1, 2], 2 * custom.x + 2)
+
+
+def test_custom_exceptions():
+    for expr in ['__import__("os")', 'x.real', 'foo(x)', 'x[0]', 'a +', 'N*x', 'sin(x=x)', 'backend*x', 'dtype*x',
+                 'grid*x']:
+        with pytest.raises(GwydionError):
+            Custom(expr)
+
+    with pytest.raises(GwydionError):
+        Custom('a*x', b=1)
+    with pytest.raises(GwydionError):
+        Custom('a*x', a='1')
+    with pytest.raises(GwydionError):
+        Custom(1234)
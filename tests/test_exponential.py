@@ -67,3 +67,12 @@ def test_exponential_exceptions():
     with pytest.raises(GwydionError):
         Exponential(I='1234')
 
+    with pytest.raises(GwydionError):
+        Exponential(base='e').y
+
+
+@pytest.mark.parametrize('base', [-2, 0])
+def test_exponential_non_positive_base(base):
+    exp = Exponential(base=base, I=1, k=1, xlim=(0, 4), N=5, rand=None)
+
+    assert np.array_equal(exp.y, np.power(float(base), exp.x))
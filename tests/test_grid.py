@@ -0,0 +1,113 @@
+import gc
+
+import pytest
+import numpy as np
+
+from gwydion import grid, Sine
+from gwydion.exceptions import GwydionError
+from gwydion.spec import build, to_spec
+from gwydion.stats import Poisson
+
+
+def test_grid_shared():
+    sine1 = Sine(N=1000, xlim=(-10, 10))
+    sine2 = Sine(N=1000, xlim=(-10, 10))
+
+    assert sine1.x is sine2.x
+    assert np.array_equal(sine1.x, np.linspace(-10, 10, num=1000))
+
+
+def test_grid_distinct():
+    assert grid.linspace((0, 10), 11) is not grid.linspace((0, 10), 12)
+    assert grid.linspace((0, 10), 11) is not grid.linspace((0, 11), 11)
+    assert grid.linspace((0, 10), 11) is not grid.linspace((0, 10), 11, dtype='float32')
+    assert grid.linspace((0, 10), 11, dtype='float32').dtype == np.float32
+
+
+def test_grid_read_only():
+    sine = Sine(N=10)
+
+    with pytest.raises(ValueError):
+        sine.x[0] = 1
+
+
+def test_grid_support_shared():
+    poisson1 = Poisson(lam=2, xlim=(0, 10), N=7)
+    poisson2 = Poisson(lam=3, xlim=(0, 10), N=7)
+
+    assert poisson1.x is poisson2.x
+    assert list(poisson1.x) == [0, 1, 3, 5, 6, 8, 10]
+
+
+def test_grid_released():
+    before = grid.cached()
+    x = grid.linspace((0, 1234.5), 321)
+    assert grid.cached() == before + 1
+
+    del x
+    gc.collect()
+    assert grid.cached() == before
+
+
+@pytest.mark.parametrize('kind', ['random', 'jitter', 'log'])
+@pytest.mark.parametrize('N', [1, 7, grid.BLOCK + 3])
+def test_grid_kinds(kind, N):
+    sine = Sine(N=N, xlim=(1, 10), seed=42)
+    sine.grid, sine.noise = kind, 'counter'
+    x, y = sine.data
+
+    assert len(x) == N and np.all(np.diff(x) >= 0) and 1 <= x.min() and x.max() <= 10
+    assert x is sine.x and not x.flags.writeable
+
+    # Windows are computed without the full grid, and are bit-identical to slices of it.
+    for start, stop in [(0, N), (N // 3, N // 2 + 1), (N - 1, N)]:
+        window = Sine(N=N, xlim=(1, 10), seed=42)
+        window.grid, window.noise = kind, 'counter'
+        assert np.array_equal(window[start:stop][0], x[start:stop])
+        assert np.array_equal(window[start:stop][1], y[start:stop])
+
+
+def test_grid_random():
+    sine = Sine(N=10**5, xlim=(0, 1), seed=42)
+    sine.grid = 'random'
+
+    counts, _ = np.histogram(sine.x, bins=10, range=(0, 1))
+    assert np.all(np.abs(counts - 10**4) < 500)
+    other = Sine(N=10**5, xlim=(0, 1), seed=43)
+    other.grid = 'random'
+    assert not np.array_equal(sine.x, other.x)
+
+    jitter = Sine(N=100, xlim=(0, 1), seed=42)
+    jitter.grid = 'jitter'
+    assert np.all(np.floor(jitter.x * 100) == np.arange(100))
+
+    log = Sine(N=3, xlim=(1, 100))
+    log.grid = 'log'
+    assert np.allclose(log.x, [1, 10, 100])
+
+
+def test_grid_array():
+    sine = Sine(N=4, seed=42)
+    sine.grid = [0, 1, 4, 9]
+
+    assert sine.x.dtype == float and np.array_equal(sine.x, [0, 1, 4, 9])
+    assert np.array_equal(sine[1:3][0], [1, 4])
+    assert np.array_equal(build(to_spec(sine)).y, sine.y)
+
+    sine.grid = [0, 1]
+    with pytest.raises(GwydionError):
+        sine.x
+
+
+def test_grid_exceptions():
+    sine = Sine(N=10, xlim=(-1, 1))
+
+    for kind in ['log', 'spiral']:
+        sine.grid = kind
+        with pytest.raises(GwydionError):
+            sine.x
+
+    poisson = Poisson(N=10)
+    poisson.grid = 'random'
+    with pytest.raises(GwydionError):
+        poisson.x
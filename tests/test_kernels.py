@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+
+from gwydion import kernels, Cubic, Custom, Exponential, Linear, Logarithm, Polynomial, Quadratic, Sine
+from gwydion.stats import Binomial, Gamma, Geometric, Hypergeometric, NegativeBinomial, Normal, Poisson
+
+
+SEED = 31415927
+
+OBJECTS = [lambda: Linear(N=1001, seed=SEED),
+           lambda: Sine(N=1001, seed=SEED),
+           lambda: Exponential(N=1001, seed=SEED),
+           lambda: Logarithm(N=1001, xlim=(0.1, 10), seed=SEED),
+           lambda: Normal(N=1001, seed=SEED),
+           lambda: Normal(N=1001, seed=SEED, rand=0.2, allow_negative_y=False),
+           lambda: Polynomial(N=1001, seed=SEED),
+           lambda: Quadratic(N=1001, a=1, b=-2, c=3, seed=SEED),
+           lambda: Cubic(N=1001, seed=SEED)]
+
+
+@pytest.mark.parametrize('make', OBJECTS)
+def test_kernel_parity(make):
+    obj = make()
+    kernel, params = obj._kernel()
+
+    x, r, clip = obj.x, obj.r, not obj.allow_negative_y
+    y = kernel(x, r, clip, np.empty(len(x)), *params)
+
+    # Each point is computed on its own, so any window gives the same bits as the whole of x.
+    assert np.array_equal(kernel(x[300:700], r[300:700], clip, np.empty(400), *params), y[300:700])
+
+    # NumPy's exp, sin and log may differ from numba's in the last bit.
+    assert np.allclose(y, obj._clip(obj.func(x) + r), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize('enabled', [True, False])
+@pytest.mark.parametrize('make', OBJECTS + [lambda: Custom('a*x**2', a=2, N=1001, seed=SEED),
+                                            lambda: Gamma(N=1001, seed=SEED),
+                                            lambda: Poisson(N=50, seed=SEED),
+                                            lambda: Binomial(N=50, seed=SEED),
+                                            lambda: Hypergeometric(N=50, seed=SEED),
+                                            lambda: NegativeBinomial(N=50, seed=SEED),
+                                            lambda: Geometric(N=50, seed=SEED)])
+def test_kernel_windows(make, enabled, monkeypatch, tmp_path):
+    monkeypatch.setattr(kernels, 'ENABLED', enabled)
+
+    for noise in ('sequential', 'counter'):
+        obj = make()
+        obj.noise = noise
+        x, y = obj.data
+
+        # Windows, chunked writes and threaded evaluation give the same bits as the data.
+        obj = make()
+        obj.noise = noise
+        assert np.array_equal(obj[7:40][1], y[7:40])
+
+        rec = np.load(obj.write(str(tmp_path / 'data.npy'), chunk_size=16))
+        assert np.array_equal(rec['y'], y)
+
+        obj = make()
+        obj.noise, obj.threads, obj.chunk_size = noise, 4, 16
+        assert np.array_equal(obj.y, y)
+
+
+def test_kernel_clip():
+    normal = Normal(N=1001, seed=SEED, rand=0.2, allow_negative_y=False)
+    kernel, params = normal._kernel()
+
+    y = kernel(normal.x, normal.r, True, np.empty(1001), *params)
+    assert y.min() == 0
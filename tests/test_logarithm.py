@@ -67,3 +67,13 @@ def test_logarithm_exceptions():
     with pytest.raises(GwydionError):
         Logarithm(I='1234')
 
+    with pytest.raises(GwydionError):
+        Logarithm(base='e').y
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+@pytest.mark.parametrize('base', [-2, 0, 1])
+def test_logarithm_degenerate_base(base):
+    log = Logarithm(base=base, I=1, k=1, xlim=(2, 5), N=4, rand=None)
+
+    assert np.array_equal(log.y, np.log(log.x) / np.log(float(base)), equal_nan=True)
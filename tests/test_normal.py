@@ -79,3 +79,33 @@ def test_normal_exceptions():
     with pytest.raises(GwydionError):
         Normal(sigma='1234')
 
+
+def test_normal_sweep():
+    normal = Normal(rand=None, mu=0.0, sigma=1.0, xlim=(-3, 3), N=7)
+    sweep = normal.sweep(mu=[-1, 0, 1], sigma=[1, 2])
+
+    assert sweep.y.shape == (3, 2, 7)
+
+    for i, j in zip(sweep.y[1, 1], [0.0647588, 0.12098536, 0.17603266, 0.19947114, 0.17603266, 0.12098536, 0.0647588]):
+        assert abs(i - j) < TOLERANCE
+
+
+def test_normal_adaptive():
+    normal = Normal(mu=0, sigma=1e-2, xlim=(-1, 1), rand=None, seed=SEED)
+    adaptive = normal.adaptive(tol=1e-4)
+
+    # Far fewer points than a uniform grid of the same accuracy, concentrated around the peak.
+    x = np.linspace(-1, 1, 10**6 + 1)
+    assert adaptive.N < 500 and np.all(np.diff(adaptive.x) > 0)
+    assert np.max(np.abs(np.interp(x, adaptive.x, adaptive.y) - normal.func(x))) < 2e-4 * normal.func(x).max()
+    assert np.sum(np.abs(adaptive.x) < 0.05) > adaptive.N / 2
+
+    cum = adaptive.to_cum()
+    assert np.array_equal(cum.x, adaptive.x)
+    assert np.isclose(cum.y[-1], 1, atol=1e-3) and np.all(np.diff(cum.y) >= 0)
+
+
+def test_normal_to_cum():
+    normal = Normal(mu=0, sigma=1, xlim=(-5, 5), N=1001, rand=None, seed=SEED)
+
+    assert np.isclose(normal.to_cum().y[500], 0.5, atol=1e-3)
@@ -0,0 +1,101 @@
+import tracemalloc
+
+import pytest
+import numpy as np
+
+import gwydion
+from gwydion import Sine
+from gwydion.exceptions import GwydionError
+from gwydion.pipeline import Writer
+from gwydion.stats import Binomial, Poisson
+
+
+@pytest.mark.parametrize('fmt', ['npy', 'memmap'])
+def test_write(tmp_path, fmt):
+    sine = Sine(N=1001, seed=42)
+    path = sine.write(str(tmp_path / 'sine.npy'), fmt=fmt, chunk_size=100)
+
+    assert np.array_equal(np.load(path), sine.to_records())
+
+
+@pytest.mark.parametrize('noise', ['sequential', 'counter'])
+def test_write_memory(tmp_path, noise):
+    Sine(N=10, seed=42).write(str(tmp_path / 'warm.npy'))
+
+    sine = Sine(N=2 * 10**6, seed=42)
+    sine.noise = noise
+
+    tracemalloc.start()
+    try:
+        path = sine.write(str(tmp_path / 'sine.npy'))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # Neither x nor the noise is built in full, and the RNG is left for the data.
+    assert peak < 8 * sine.N / 2
+    assert sine._x is None and sine._r is None
+    assert np.array_equal(np.load(path), sine.to_records())
+
+
+@pytest.mark.parametrize('make', [lambda: Sine(N=np.int64(100), seed=42), lambda: Binomial(N=100, seed=3) * 2])
+def test_write_numpy_length(tmp_path, make):
+    obj = make()
+    path = obj.write(str(tmp_path / 'obj.npy'))
+
+    assert np.array_equal(np.load(path), obj.to_records())
+
+
+def test_write_array_api(tmp_path):
+    pytest.importorskip('array_api_strict')
+
+    with gwydion.config(backend='array_api_strict'):
+        sine = Sine(N=1001, seed=42)
+    path = sine.write(str(tmp_path / 'sine.npy'), chunk_size=100)
+
+    assert np.array_equal(np.load(path), sine.to_records())
+
+
+def test_write_raw(tmp_path):
+    poisson = Poisson(seed=42, lam=3)
+    path = poisson.write(str(tmp_path / 'poisson.raw'), fmt='raw', chunk_size=3)
+
+    expected = poisson.to_records()
+    assert np.array_equal(np.fromfile(path, dtype=expected.dtype), expected)
+
+
+def test_writer_buffers(tmp_path):
+    with Writer(str(tmp_path / 'a.npy'), (10, 3), 'int32', chunk=4, buffers=2) as writer:
+        buffers = set()
+        for start in range(0, 10, 4):
+            buf = writer.buffer()
+            buffers.add(id(buf))
+
+            n = min(4, 10 - start)
+            buf[:n] = np.arange(start, start + n)[:, None]
+            writer.write(start, buf[:n], buf)
+
+    assert len(buffers) <= 2
+    assert np.array_equal(np.load(str(tmp_path / 'a.npy')), np.repeat(np.arange(10), 3).reshape(10, 3))
+
+
+def test_writer_exceptions(tmp_path):
+    with pytest.raises(GwydionError):
+        Writer(str(tmp_path / 'a.npy'), (10,), 'f8', fmt='csv')
+
+    with pytest.raises(GwydionError):
+        Writer('-', (10,), 'f8', fmt='memmap')
+
+    with pytest.raises(GwydionError):
+        with Writer(str(tmp_path / 'a.npy'), (10,), 'f8') as writer:
+            writer.write(5, np.zeros(5))
+
+    with pytest.raises(GwydionError):
+        with Writer(str(tmp_path / 'a.npy'), (10,), 'f8') as writer:
+            writer.write(0, np.zeros(5))
+
+    writer = Writer(str(tmp_path / 'a.npy'), (1,), 'f8')
+    writer.write(0, np.zeros(1))
+    writer.close()
+    with pytest.raises(GwydionError):
+        writer.write(1, np.zeros(1))
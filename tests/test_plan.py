@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+
+from gwydion import Cubic, Exponential, Linear, Logarithm, Polynomial, Sine, config
+from gwydion.plan import Plan
+from gwydion.stats import Normal
+
+
+SEED = 31415927
+
+# Each object with the unplanned NumPy expression of its function.
+OBJECTS = [(lambda: Linear(N=1001, seed=SEED),
+            lambda o, x: o.m * x + o.c),
+           (lambda: Sine(N=1001, seed=SEED),
+            lambda o, x: o.I * np.sin(2 * np.pi * o.f * x + o.p)),
+           (lambda: Exponential(N=1001, base=2, seed=SEED),
+            lambda o, x: o.I * np.power(o.base, o.k * x)),
+           (lambda: Logarithm(N=1001, base=10, xlim=(0.1, 10), seed=SEED),
+            lambda o, x: o.I * np.log(o.k * x) / np.log(o.base)),
+           (lambda: Normal(N=1001, seed=SEED),
+            lambda o, x: 1 / (o.sigma * np.sqrt(2 * np.pi)) * np.exp(-(x - o.mu)**2 / (2 * o.sigma**2))),
+           (lambda: Polynomial(N=1001, a=[3], seed=SEED),
+            lambda o, x: np.polynomial.polynomial.polyval(x, o.a)),
+           (lambda: Cubic(N=1001, seed=SEED),
+            lambda o, x: np.polynomial.polynomial.polyval(x, o.a))]
+
+
+@pytest.mark.parametrize('make, expr', OBJECTS)
+def test_plan_func(make, expr):
+    obj = make()
+    x = obj.x
+
+    assert isinstance(obj.plan, Plan)
+    assert np.allclose(obj.func(x), expr(obj, x), rtol=1e-12, atol=1e-12)
+
+
+def test_plan_cached():
+    sine = Sine(seed=SEED)
+    plan = sine.plan
+
+    assert sine.plan is plan
+
+    sine.threads = 4
+    assert sine.plan is plan
+
+    sine.f = 2.0
+    assert sine.plan is not plan
+    assert sine.plan.constants[0] == 4 * np.pi
+
+
+def test_plan_in_place():
+    plan = Plan([('mul', 2.0), ('add', 1.0), ('sin',), ('mul', 3.0)])
+    x = np.linspace(0, 1, 11)
+    x.flags.writeable = False
+
+    y = plan(x)
+
+    assert not np.shares_memory(x, y)
+    assert np.allclose(y, 3 * np.sin(2 * x + 1))
+
+
+def test_plan_dtype():
+    with config(dtype='float32'):
+        normal = Normal(seed=SEED)
+
+    assert normal.func(normal.x).dtype == np.float32
+
+
+def test_plan_broadcast():
+    plan = Plan([('mul', np.array([[1.0], [2.0]])), ('xmul',)])
+    x = np.linspace(0, 1, 5)
+
+    assert np.allclose(plan(x), np.array([[1.0], [2.0]]) * x**2)
+
+
+def test_plan_exceptions():
+    with pytest.raises(ValueError):
+        Plan([('tan',)])
+
+    with pytest.raises(ValueError):
+        Plan([('mul',)])
@@ -0,0 +1,80 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import tracemalloc
+
+import pytest
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from gwydion import Sine, plot_many
+from gwydion.exceptions import GwydionError
+from gwydion.plotting import downsample
+from gwydion.stats import Poisson
+
+
+def test_minmax():
+    sine = Sine(N=100001, rand=0.5, seed=42)
+    sine.noise = 'counter'
+    x, y = downsample(sine, 1000, chunk_size=1234)
+
+    # The envelope is kept exactly, without evaluating the whole object.
+    assert sine._data is None
+    assert len(x) <= 1000 and np.all(np.diff(x) > 0)
+    assert y.max() == sine.y.max() and y.min() == sine.y.min()
+    assert np.array_equal(downsample(sine, 1000), (x, y))
+
+
+@pytest.mark.parametrize('method', ['minmax', 'lttb'])
+def test_downsample_sequential(method):
+    N = 10**6
+    sine = Sine(N=N, rand=0.5, seed=42)
+    downsample(sine, 1000, method=method, chunk_size=1000)
+
+    tracemalloc.start()
+    x, y = downsample(sine, 1000, method=method, chunk_size=1000)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # Sequential noise is streamed from a copy of the RNG rather than drawn in full.
+    assert peak < 8 * N / 4
+    assert sine._r is None and sine._data is None
+    assert np.all(np.isin(y, sine.y))
+    if method == 'minmax':
+        assert y.max() == sine.y.max() and y.min() == sine.y.min()
+
+
+def test_lttb():
+    sine = Sine(N=100000, seed=42)
+    x, y = downsample(sine, 500, method='lttb', chunk_size=999)
+
+    assert len(x) == 500 and np.all(np.diff(x) > 0)
+    assert (x[0], x[-1]) == (sine.x[0], sine.x[-1])
+    assert np.all(np.isin(y, sine.y))
+    assert np.array_equal(downsample(sine, 500, method='lttb'), (x, y))
+
+
+def test_downsample_small():
+    poisson = Poisson(N=10, seed=42)
+    x, y = downsample(poisson, 100)
+
+    assert np.array_equal(x, poisson.x) and np.array_equal(y, poisson.y)
+
+    with pytest.raises(GwydionError):
+        downsample(poisson, 100, method='mean')
+
+
+def test_plot():
+    sine = Sine(N=10**5, seed=42)
+
+    assert len(sine.plot(points=200).lines[0].get_xdata()) <= 200
+    assert len(sine.plot(method=None).lines[0].get_xdata()) == sine.N
+
+
+def test_plot_many():
+    ax = plot_many([Sine(N=1000, f=f, seed=1) for f in np.linspace(1, 2, 10)], points=100, linewidths=0.5)
+
+    lines, = ax.collections
+    assert isinstance(lines, LineCollection)
+    assert len(lines.get_segments()) == 10
+    assert all(len(segment) <= 100 for segment in lines.get_segments())
@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 import pytest
 import numpy as np
 
@@ -63,6 +66,11 @@ def test_poisson_sampling():
     for i, j in zip(sample, test):
         assert abs(i - j) < TOLERANCE
 
+    # Sampling moves the RNG on, so copies keep its position rather than replaying the constructor.
+    y = poisson.y
+    for new in (pickle.loads(pickle.dumps(poisson)), copy.deepcopy(poisson)):
+        assert np.array_equal(new.y, y)
+
 
 def test_poisson_printing():
     poisson = Poisson(seed=SEED, N=11)
@@ -89,3 +97,8 @@ def test_poisson_exceptions():
     with pytest.raises(GwydionError):
         Poisson(lam='1234')
 
+
+
+def test_poisson_refine():
+    with pytest.raises(GwydionError):
+        Poisson(seed=1234).refine()
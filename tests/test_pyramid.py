@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+
+from gwydion import Sine
+from gwydion.cli import generate
+from gwydion.exceptions import GwydionError
+from gwydion.pyramid import Pyramid
+from gwydion.stats import Poisson
+
+
+def blocks(y, size):
+    starts = np.arange(0, y.shape[-1], size)
+    count = np.diff(np.append(starts, y.shape[-1]))
+
+    return (np.minimum.reduceat(y, starts, axis=-1), np.maximum.reduceat(y, starts, axis=-1),
+            np.add.reduceat(y, starts, axis=-1) / count)
+
+
+@pytest.mark.parametrize('obj, chunk_size', [(Sine(N=10007, seed=42), 1000), (Poisson(N=50, seed=42), 7)])
+def test_pyramid(tmp_path, obj, chunk_size):
+    path = obj.write(str(tmp_path / 'data.npy'), fmt='memmap', chunk_size=chunk_size, pyramid=True)
+    pyramid = Pyramid(path)
+
+    assert pyramid.rows is None and len(pyramid.levels[-1]) == 1
+    for k, level in enumerate(pyramid.levels, 1):
+        mn, mx, mean = blocks(obj.y, 4**k)
+
+        assert np.array_equal(level['x'], obj.x[::4**k])
+        assert np.array_equal(level['min'], mn) and np.array_equal(level['max'], mx)
+        assert np.allclose(level['mean'], mean)
+
+
+def test_pyramid_query(tmp_path):
+    sine = Sine(N=10**5, seed=42)
+    pyramid = Pyramid(sine.write(str(tmp_path / 'sine.npy'), pyramid=True))
+
+    preview = pyramid.query(1000, 90000, bins=100)
+    assert 100 <= len(preview) <= 4 * 100 + 1
+    assert preview['x'][0] <= sine.x[1000] and preview['max'].max() == sine.y[1000:90000].max()
+
+    assert pyramid.level(0, 10, bins=100) == 1
+    with pytest.raises(GwydionError):
+        pyramid.query(10, 10)
+    with pytest.raises(GwydionError):
+        pyramid.query(row=0)
+
+
+def test_pyramid_generate(tmp_path):
+    path = generate({'class': 'Sine', 'N': 101}, 10, str(tmp_path / 'sines.npy'), ranges={'f': (1, 2)},
+                    chunk_size=3, pyramid=True)
+    data, pyramid = np.load(path), Pyramid(path)
+
+    assert pyramid.rows == 10 and pyramid.levels[0].shape == (10, 26)
+    for k, level in enumerate(pyramid.levels, 1):
+        mn, mx, mean = blocks(data[:, 1], 4**k)
+        assert np.array_equal(level['min'], mn) and np.array_equal(level['max'], mx)
+
+    assert np.array_equal(pyramid.query(0, None, bins=5, row=2), pyramid.levels[1][2])
+
+
+def test_pyramid_exceptions(tmp_path):
+    with pytest.raises(GwydionError):
+        Sine().write('-', pyramid=True)
+    with pytest.raises(GwydionError):
+        Pyramid(str(tmp_path / 'missing.npy'))
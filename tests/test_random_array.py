@@ -0,0 +1,107 @@
+import tracemalloc
+
+import pytest
+import numpy as np
+
+from gwydion import RandomArray
+from gwydion.exceptions import GwydionError
+
+
+def test_random_array():
+    arr = RandomArray((30, 40), lims=(-1, 1), seed=1234)
+
+    assert arr.shape == (30, 40)
+    assert arr.dtype == np.float64
+    assert -1 <= arr.min() and arr.max() < 1
+    assert np.array_equal(arr, RandomArray((30, 40), lims=(-1, 1), seed=1234))
+
+
+@pytest.mark.parametrize('dtype', ['float16', 'float32', 'int8', 'uint16', 'int64'])
+def test_random_array_dtype(dtype):
+    arr = RandomArray(1000, lims=(1, 7), dtype=dtype, seed=1234)
+
+    assert arr.dtype == np.dtype(dtype)
+    assert 1 <= arr.min() and arr.max() <= 7
+
+
+def test_random_array_threads():
+    single = RandomArray(300000, seed=1234, threads=1)
+
+    assert np.array_equal(single, RandomArray(300000, seed=1234, threads=4))
+
+
+def test_random_array_out():
+    out = np.zeros((10, 10), dtype=np.float32)
+
+    assert RandomArray((10, 10), seed=1234, dtype='float32', out=out) is out
+    assert np.array_equal(out, RandomArray((10, 10), seed=1234, dtype='float32'))
+
+
+def test_random_array_global_state():
+    np.random.seed(0)
+    state = np.random.get_state()[1].copy()
+
+    RandomArray(10, seed=1234)
+
+    assert np.array_equal(np.random.get_state()[1], state)
+
+
+@pytest.mark.parametrize('kwargs', [{'shape': 'ten'}, {'shape': 10, 'lims': (10, 0)}, {'shape': 10, 'dtype': 'U8'},
+                                    {'shape': 10, 'lims': (1, 1), 'dtype': 'int8'},
+                                    {'shape': 10, 'out': np.empty(10, dtype=np.float32)},
+                                    {'shape': 10, 'out': np.empty(20)[::2]}])
+def test_random_array_exceptions(kwargs):
+    with pytest.raises(GwydionError):
+        RandomArray(**kwargs)
+
+
+def test_random_array_sparse():
+    coo = RandomArray((1000, 2000), lims=(1, 2), density=0.01, seed=1234)
+    csr = RandomArray((1000, 2000), lims=(1, 2), density=0.01, seed=1234, format='csr')
+
+    assert coo.format == 'coo' and csr.format == 'csr'
+    assert coo.nnz == csr.nnz == 20000
+    assert 1 <= coo.data.min() and coo.data.max() < 2
+    assert (coo.tocsr() != csr).nnz == 0
+
+
+def test_random_array_sparse_large():
+    csr = RandomArray((10**6, 10**6), density=1e-7, format='csr', dtype='float32', seed=1234)
+
+    assert csr.nnz == 10**5
+    assert csr.data.dtype == np.float32
+    assert csr.has_canonical_format
+
+
+@pytest.mark.parametrize('density', [0.05, 0.6])
+def test_random_array_sparse_dense_enough(density):
+    shape = (10**4, 2000)
+
+    tracemalloc.start()
+    try:
+        coo = RandomArray(shape, density=density, dtype='float32', seed=1234)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # The positions are sampled in O(nnz), without an index of every position of the dense shape.
+    nnz = int(density * shape[0] * shape[1])
+    assert coo.nnz == nnz
+    assert peak < 48 * nnz
+    assert np.all(np.diff(np.ravel_multi_index(coo.coords, shape)) > 0)
+    assert abs(coo.coords[0].mean() - shape[0] / 2) < 0.01 * shape[0]
+
+
+def test_random_array_sparse_nd():
+    coo = RandomArray((3, 4, 5), density=0.5, dtype='int16', lims=(1, 5), seed=1234)
+
+    assert coo.nnz == 30
+    assert np.count_nonzero(coo.todense()) == 30
+
+
+@pytest.mark.parametrize('kwargs', [{'density': 1.5}, {'density': 0.1, 'format': 'dok'},
+                                    {'density': 0.1, 'shape': (2, 2, 2), 'format': 'csr'},
+                                    {'density': 0.1, 'out': np.empty((10, 10))}])
+def test_random_array_sparse_exceptions(kwargs):
+    with pytest.raises(GwydionError):
+        RandomArray(**dict({'shape': (10, 10)}, **kwargs))
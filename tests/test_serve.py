@@ -0,0 +1,125 @@
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import numpy as np
+
+from gwydion import kernels, serve
+from gwydion.serve import Service, make_server
+from gwydion.spec import build
+
+
+SPEC = {'class': 'Sine', 'N': 1001, 'seed': 42, 'params': {'f': 2.0}}
+
+
+@pytest.fixture
+def server():
+    server = make_server(port=0, service=Service(batch_window=0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield 'http://127.0.0.1:{}'.format(server.server_port)
+
+    server.shutdown()
+    server.server_close()
+    server.service.close()
+
+
+def _post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), method='POST')
+    with urllib.request.urlopen(request) as response:
+        return response.read()
+
+
+def test_generate(server):
+    rec = np.load(io.BytesIO(_post(server + '/generate', SPEC)))
+
+    assert np.array_equal(rec, build(SPEC).to_records())
+
+
+def test_metrics(server):
+    _post(server + '/generate', SPEC)
+    _post(server + '/generate', SPEC)
+
+    with urllib.request.urlopen(server + '/metrics') as response:
+        metrics = json.loads(response.read())
+
+    assert metrics['requests'] == 2
+    assert metrics['cache_hits'] == 1
+    assert metrics['points'] == 1001
+    assert metrics['latency']['p99'] >= metrics['latency']['p50'] > 0
+
+
+@pytest.mark.parametrize('path, body, status', [('/generate', {'class': 'Tangent'}, 400),
+                                                ('/generate', dict(SPEC, xlim=5), 400),
+                                                ('/generate', dict(SPEC, xlim=[0, 1, 2]), 400),
+                                                ('/generate?format=csv', SPEC, 400),
+                                                ('/elsewhere', SPEC, 404)])
+def test_generate_errors(server, path, body, status):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _post(server + path, body)
+
+    assert e.value.code == status
+
+
+def test_generate_internal_error(server, monkeypatch):
+    def fail(self, spec, fmt='npy'):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(Service, 'generate', fail)
+
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _post(server + '/generate', SPEC)
+
+    assert e.value.code == 500
+
+
+def test_arrow_missing(server, monkeypatch):
+    monkeypatch.setattr(serve, 'pa', None)
+
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _post(server + '/generate?format=arrow', SPEC)
+
+    assert e.value.code == 501
+
+
+def test_coalescing():
+    service = Service(batch_window=0.05)
+
+    with ThreadPoolExecutor(8) as pool:
+        payloads = list(pool.map(lambda _: service.generate(SPEC), range(8)))
+
+    metrics = service.metrics()
+    service.close()
+
+    assert len(set(payloads)) == 1
+    assert metrics['coalesced'] + metrics['cache_hits'] == 7
+    assert metrics['points'] == 1001
+
+
+@pytest.mark.parametrize('enabled', [False, True])
+@pytest.mark.parametrize('cls, params', [('Sine', {'I': 1.0, 'f': 1.0, 'p': 0.0}),
+                                         ('Normal', {'mu': 0.0, 'sigma': 1.0}),
+                                         ('Exponential', {'I': 1.0, 'k': 0.1})])
+def test_batching(monkeypatch, enabled, cls, params):
+    monkeypatch.setattr(kernels, 'ENABLED', enabled)
+
+    service = Service(batch_window=0.2)
+    name = list(params)[-1]
+    specs = [{'class': cls, 'N': 1001, 'xlim': [-5, 5], 'seed': i,
+              'params': dict(params, **{name: params[name] + 0.1 * i})} for i in range(4)]
+
+    with ThreadPoolExecutor(4) as pool:
+        payloads = list(pool.map(service.generate, specs))
+
+    metrics = service.metrics()
+    service.close()
+
+    # Objects evaluated by a fused kernel are not batched, so that a spec always gives the same payload.
+    assert metrics['batched'] == (0 if enabled else 4)
+    for spec, payload in zip(specs, payloads):
+        assert np.array_equal(np.load(io.BytesIO(payload))['y'], build(spec).y)
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+import numpy as np
+
+from gwydion import Custom, Linear, Quadratic, Sine, config, generate_many
+from gwydion.exceptions import GwydionError
+from gwydion.spec import STATE_VERSION, build, classes, from_state, normalize, parameters, to_spec, to_state
+from gwydion.stats import Normal
+
+
+def test_build():
+    sine = build({'class': 'Sine', 'N': 11, 'seed': 42, 'dtype': 'float32', 'params': {'f': 2.0}})
+
+    assert isinstance(sine, Sine)
+    assert sine.f == 2.0
+    assert sine.y.dtype == np.float32
+    assert np.array_equal(sine.y, build({'class': 'Sine', 'N': 11, 'seed': 42, 'dtype': 'float32',
+                                         'params': {'f': 2.0}}).y)
+
+
+def test_build_custom():
+    custom = build({'class': 'Custom', 'xlim': [0, 1], 'noise': 'counter', 'params': {'expr': 'a*x', 'a': 2}})
+
+    assert isinstance(custom, Custom)
+    assert custom.xlim == (0, 1)
+    assert custom.noise == 'counter'
+
+
+def test_normalize():
+    spec = normalize({'class': 'Linear', 'N': 10.0, 'xlim': (0, 1), 'dtype': 'f4'})
+
+    assert spec == {'class': 'Linear', 'N': 10, 'xlim': [0, 1], 'dtype': 'float32', 'params': {}}
+    assert 'Composite' in classes()
+
+
+@pytest.mark.parametrize('make', [lambda: Sine(N=11, seed=1),
+                                  lambda: Quadratic(N=11, a=1, seed=2),
+                                  lambda: Custom('a*x', N=11, a=(0, 1), seed=3),
+                                  lambda: Normal(N=11, seed=4, allow_negative_y=False),
+                                  lambda: Sine(N=11, seed=1) * Linear(N=11, xlim=(-10, 10), seed=5) + 2])
+def test_to_spec(make):
+    obj = make()
+    spec = to_spec(obj)
+
+    assert json.loads(json.dumps(spec)) == spec
+    assert np.array_equal(build(spec).y, obj.y)
+
+
+def test_generate_many():
+    specs = [{'class': 'Sine', 'N': 101, 'seed': i, 'params': {'f': 1 + i / 10}} for i in range(20)]
+    sine = Sine(N=101, seed=1)
+
+    with config(dtype='float32'):
+        objs = generate_many(specs + [sine], threads=4)
+
+    assert objs[-1] is sine
+    for spec, obj in zip(specs, objs):
+        assert obj.y.dtype == np.float32
+        with config(dtype='float32'):
+            assert np.array_equal(obj.y, build(spec).y)
+
+
+def test_state():
+    sine = Sine(N=10**4, f=None, seed=None)
+    sine.f = 3.0
+    state = to_state(sine)
+
+    assert state['version'] == STATE_VERSION and state['attrs']['f'] == 3.0
+    assert np.array_equal(from_state(state).y, sine.y)
+
+    with pytest.raises(GwydionError):
+        from_state(dict(state, version=STATE_VERSION + 1))
+
+
+def test_parameters():
+    assert parameters(Sine(I=1, f=2, p=0.5)) == {'I': 1, 'f': 2, 'p': 0.5}
+    assert parameters(Quadratic(a=1, b=2, c=np.float64(3))) == {'a': [3.0, 2, 1]}
+
+
+@pytest.mark.parametrize('spec', [[], {'class': 'Tangent'}, {'class': 'Sine', 'colour': 'red'},
+                                  {'class': 'Sine', 'N': 1.5}, {'class': 'Sine', 'params': [1]},
+                                  {'class': 'Sine', 'dtype': 'float99'}, {'class': 'Sine', 'params': {'q': 1}}])
+def test_spec_exceptions(spec):
+    with pytest.raises(GwydionError):
+        build(spec)
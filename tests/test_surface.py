@@ -0,0 +1,135 @@
+import pytest
+import numpy as np
+
+import gwydion
+from gwydion import Polynomial, Sine
+from gwydion.stats import Normal
+from gwydion.exceptions import GwydionError
+from gwydion.surface import Normal2D, Polynomial2D, Sine2D, Surface
+
+
+def meshgrid(obj):
+    return np.meshgrid(obj.x, obj.y)
+
+
+def test_normal2d():
+    obj = Normal2D(shape=(60, 80), mu=(0.5, -1), sigma=(1, 2), rand=None)
+    X, Y = meshgrid(obj)
+
+    expected = Normal(mu=0.5, sigma=1, rand=None).func(X) * Normal(mu=-1, sigma=2, rand=None).func(Y)
+
+    assert obj.z.shape == (60, 80)
+    assert obj.xlim == (-4.5, 5.5) and obj.ylim == (-11, 9)
+    assert np.allclose(obj.z, expected)
+
+
+def test_sine2d():
+    obj = Sine2D(shape=(50, 70), I=2, f=(0.3, 0.7), p=0.4, rand=None)
+    X, Y = meshgrid(obj)
+
+    assert np.allclose(obj.z, 2 * np.sin(2 * np.pi * (0.3 * X + 0.7 * Y) + 0.4))
+    assert np.allclose(Sine2D(f=(1, 0), I=1, p=0, rand=None).z[0], Sine(f=1, I=1, p=0, rand=None).y)
+
+
+def test_polynomial2d():
+    a = [[1, 0, 2], [0, -1], [0.5]]
+    obj = Polynomial2D(shape=(40, 30), a=a, rand=None)
+    X, Y = meshgrid(obj)
+
+    assert len(obj.terms) == 3
+    assert np.allclose(obj.z, 1 + 2 * X**2 - X * Y + 0.5 * Y**2)
+    assert np.allclose(Polynomial2D(a=[[1, 2, 3]], rand=None).z[0], Polynomial(a=[1, 2, 3], rand=None).y)
+
+
+@pytest.mark.parametrize('cls', [Normal2D, Sine2D, Polynomial2D])
+def test_surface_seed(cls):
+    a, b = cls(seed=42), cls(seed=42)
+
+    assert np.array_equal(a.z, b.z)
+    assert not np.array_equal(a.z, cls(seed=43).z)
+
+
+def test_surface_noise():
+    obj = Sine2D(shape=(100, 100), rand=0.1, seed=42)
+    noise = obj.z - Sine2D(shape=(100, 100), I=obj.I, f=obj.f, p=obj.p, rand=None).z
+
+    assert np.abs(noise).max() <= 0.1
+    assert abs(noise.mean()) < 0.01 and noise.std() > 0.05
+
+
+@pytest.mark.parametrize('rows, cols', [(7, 100), (13, 9), (100, 1), (1, 60)])
+def test_surface_tiles(rows, cols):
+    obj = Normal2D(shape=(50, 100), seed=42)
+    z = np.empty(obj.shape)
+
+    for r, c, tile in obj.tiles(rows, cols):
+        assert tile.shape[0] <= rows and tile.shape[1] <= cols
+        z[r, c] = tile
+
+    assert np.array_equal(z, obj.z)
+
+
+def test_surface_window():
+    obj = Polynomial2D(shape=(30, 40), seed=42)
+    x, y, z = obj[5:12, 30:]
+
+    assert np.array_equal(x, obj.x[30:]) and np.array_equal(y, obj.y[5:12])
+    assert np.array_equal(z, obj.z[5:12, 30:])
+
+    with pytest.raises(GwydionError):
+        obj[::2, :]
+    with pytest.raises(GwydionError):
+        obj[3]
+
+
+def test_surface_threads():
+    obj = Sine2D(shape=(301, 200), seed=42)
+    obj.chunk_size = 1000
+    z = obj.fill(threads=4)
+
+    obj.chunk_size = 2**20
+    assert np.array_equal(z, obj.fill())
+
+
+def test_surface_dtype():
+    with gwydion.config(dtype='float32'):
+        obj = Normal2D(shape=(20, 30), seed=42)
+
+    assert obj.z.dtype == np.float32 and obj.x.dtype == np.float32
+    assert np.allclose(obj.z, Normal2D(shape=(20, 30), seed=42).z, atol=1e-5)
+
+
+def test_surface_cache():
+    obj = Normal2D(shape=20, seed=42, rand=None)
+    z = obj.z
+
+    obj.mu = (1.0, 1.0)
+    assert not np.array_equal(obj.z, z)
+
+    with pytest.raises(ValueError):
+        obj.z[0, 0] = 1
+
+
+@pytest.mark.parametrize('fmt', ['npy', 'memmap'])
+def test_surface_write(tmp_path, fmt):
+    obj = Sine2D(shape=(123, 45), seed=42)
+    path = obj.write(str(tmp_path / 'z.npy'), fmt=fmt, rows=10)
+
+    assert np.array_equal(np.load(path), obj.z)
+
+
+def test_surface_errors():
+    with pytest.raises(TypeError):
+        Surface(shape=10, xlim=(0, 1), ylim=(0, 1), rand=None, seed=42)
+    with pytest.raises(GwydionError):
+        Normal2D(shape=(10, 0))
+    with pytest.raises(GwydionError):
+        Normal2D(shape=(1, 2, 3))
+    with pytest.raises(GwydionError):
+        Normal2D(mu=(1, 2, 3))
+    with pytest.raises(GwydionError):
+        Sine2D(f='a')
+    with pytest.raises(GwydionError):
+        Polynomial2D(a=[])
+    with pytest.raises(GwydionError):
+        Polynomial2D(a=[['a']])